@@ -0,0 +1,130 @@
+"""partition orders by month and location
+
+Rebuilds orders as a table range-partitioned by month on ordered_at, each month
+list-partitioned by location (orders -> orders_p2025_07 -> orders_p2025_07_l12), so
+dashboard range queries prune to the months they read and whole-month deletes drop a
+table. Primary key and dedup constraint gain the partition keys: (id, ordered_at, location)
+and (dedup_key, ordered_at, location); dedup_key already hashes both, so deduplication is unchanged.
+Adds a (location, ordered_at) index covering the sales totals and drops ix_orders_location.
+
+Rows without ordered_at or location cannot be placed in a partition; they are kept
+in orders_unpartitioned_rows (merged back on downgrade).
+
+PostgreSQL only; other databases keep the plain table.
+
+Revision ID: a8b9c0d1e2f3
+Revises: f7a8b9c0d1e2
+Create Date: 2025-08-29 09:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8b9c0d1e2f3'
+down_revision: Union[str, None] = 'f7a8b9c0d1e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COVERED_SALES_COLUMNS = "net_sales, gross_sales, total, tax, tips"
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _create_partition(month: date, location_id: int) -> None:
+    parent = f"orders_p{month:%Y_%m}"
+    op.execute(
+        f"CREATE TABLE IF NOT EXISTS {parent} PARTITION OF orders "
+        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_next_month(month):%Y-%m-%d}') "
+        f"PARTITION BY LIST (location)"
+    )
+    op.execute(
+        f"CREATE TABLE IF NOT EXISTS {parent}_l{int(location_id)} PARTITION OF {parent} "
+        f"FOR VALUES IN ({int(location_id)})"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.execute("ALTER TABLE orders RENAME TO orders_unpartitioned")
+    op.execute("ALTER TABLE orders_unpartitioned RENAME CONSTRAINT orders_pkey TO orders_unpartitioned_pkey")
+    op.execute("CREATE TABLE orders (LIKE orders_unpartitioned INCLUDING DEFAULTS) PARTITION BY RANGE (ordered_at)")
+    op.execute("ALTER TABLE orders ALTER COLUMN ordered_at SET NOT NULL")
+    op.execute("ALTER TABLE orders ALTER COLUMN location SET NOT NULL")
+    op.execute("ALTER TABLE orders ADD PRIMARY KEY (id, ordered_at, location)")
+
+    # One partition per (month, location) with data, plus this and next month for every location
+    today = date.today().replace(day=1)
+    partitions = {
+        (row.month.date(), row.location)
+        for row in bind.execute(sa.text(
+            "SELECT DISTINCT date_trunc('month', ordered_at) AS month, location FROM orders_unpartitioned "
+            "WHERE ordered_at IS NOT NULL AND location IS NOT NULL"
+        ))
+    }
+    for (location_id,) in bind.execute(sa.text("SELECT location_id FROM locations")):
+        partitions.update({(today, location_id), (_next_month(today), location_id)})
+    for month, location_id in sorted(partitions):
+        _create_partition(month, location_id)
+
+    op.execute(
+        "INSERT INTO orders SELECT * FROM orders_unpartitioned "
+        "WHERE ordered_at IS NOT NULL AND location IS NOT NULL"
+    )
+    op.execute(
+        "CREATE TABLE orders_unpartitioned_rows AS SELECT * FROM orders_unpartitioned "
+        "WHERE ordered_at IS NULL OR location IS NULL"
+    )
+    if not bind.execute(sa.text("SELECT EXISTS (SELECT 1 FROM orders_unpartitioned_rows)")).scalar():
+        op.execute("DROP TABLE orders_unpartitioned_rows")
+
+    # Keep the id sequence: it belongs to the old table until ownership moves
+    op.execute("ALTER SEQUENCE orders_id_seq OWNED BY orders.id")
+    op.execute("DROP TABLE orders_unpartitioned")
+
+    op.create_index(op.f('ix_orders_id'), 'orders', ['id'], unique=False)
+    op.create_index(op.f('ix_orders_order_number'), 'orders', ['order_number'], unique=False)
+    op.create_index(op.f('ix_orders_dedup_key'), 'orders', ['dedup_key'], unique=False)
+    op.create_unique_constraint(
+        'uq_orders_dedup_key_ordered_at_location', 'orders', ['dedup_key', 'ordered_at', 'location']
+    )
+    op.execute(
+        f"CREATE INDEX ix_orders_location_ordered_at ON orders (location, ordered_at) "
+        f"INCLUDE ({COVERED_SALES_COLUMNS})"
+    )
+    op.execute("ANALYZE orders")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.execute("ALTER TABLE orders RENAME TO orders_partitioned")
+    op.execute("ALTER TABLE orders_partitioned RENAME CONSTRAINT orders_pkey TO orders_partitioned_pkey")
+    op.execute("CREATE TABLE orders (LIKE orders_partitioned INCLUDING DEFAULTS)")
+    op.execute("ALTER TABLE orders ALTER COLUMN ordered_at DROP NOT NULL")
+    op.execute("ALTER TABLE orders ALTER COLUMN location DROP NOT NULL")
+    op.execute("INSERT INTO orders SELECT * FROM orders_partitioned")
+    if bind.execute(sa.text("SELECT to_regclass('orders_unpartitioned_rows')")).scalar():
+        op.execute("INSERT INTO orders SELECT * FROM orders_unpartitioned_rows")
+        op.execute("DROP TABLE orders_unpartitioned_rows")
+    op.execute("ALTER SEQUENCE orders_id_seq OWNED BY orders.id")
+    op.execute("DROP TABLE orders_partitioned CASCADE")
+
+    op.execute("ALTER TABLE orders ADD PRIMARY KEY (id)")
+    op.create_index(op.f('ix_orders_id'), 'orders', ['id'], unique=False)
+    op.create_index(op.f('ix_orders_order_number'), 'orders', ['order_number'], unique=False)
+    op.create_index(op.f('ix_orders_location'), 'orders', ['location'], unique=False)
+    op.create_index(op.f('ix_orders_dedup_key'), 'orders', ['dedup_key'], unique=True)
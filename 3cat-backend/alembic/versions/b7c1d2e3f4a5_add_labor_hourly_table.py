@@ -0,0 +1,46 @@
+"""add labor_hourly table
+
+Revision ID: b7c1d2e3f4a5
+Revises: a1ea268e55d4
+Create Date: 2025-08-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c1d2e3f4a5'
+down_revision: Union[str, None] = 'a1ea268e55d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'labor_hourly',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('sevenshift_location_id', sa.Integer(), nullable=False),
+        sa.Column('local_date', sa.Date(), nullable=False),
+        sa.Column('hour', sa.Integer(), nullable=False),
+        sa.Column('scheduled_hours', sa.Float(), nullable=False),
+        sa.Column('actual_hours', sa.Float(), nullable=False),
+        sa.Column('labor_cost', sa.Float(), nullable=False),
+        sa.Column('regular_cost', sa.Float(), nullable=False),
+        sa.Column('overtime_cost', sa.Float(), nullable=False),
+        sa.Column('double_ot_cost', sa.Float(), nullable=False),
+        sa.Column('total_cost', sa.Float(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('sevenshift_location_id', 'local_date', 'hour', name='uq_labor_hourly_location_date_hour'),
+    )
+    op.create_index(op.f('ix_labor_hourly_id'), 'labor_hourly', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_labor_hourly_id'), table_name='labor_hourly')
+    op.drop_table('labor_hourly')
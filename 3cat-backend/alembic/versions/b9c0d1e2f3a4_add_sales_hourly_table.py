@@ -0,0 +1,59 @@
+"""add sales_hourly rollup table
+
+Creates the per location / local date / hour sales rollup and fills it from the
+existing orders (ordered_at is store wall-clock time).
+
+Revision ID: b9c0d1e2f3a4
+Revises: a8b9c0d1e2f3
+Create Date: 2025-08-30 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9c0d1e2f3a4'
+down_revision: Union[str, None] = 'a8b9c0d1e2f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SUM_COLUMNS = [
+    'total', 'subtotal', 'gross_sales', 'net_sales', 'tax', 'estimated_third_party_taxes', 'tips',
+    'delivery_charge', 'custom_discounts', 'refunded_amount', 'cash', 'gift_card_redemption',
+    'store_credit_redemption', 'processing_fee', 'snackpass_fee',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'sales_hourly',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('location', sa.Integer(), nullable=False),
+        sa.Column('local_date', sa.Date(), nullable=False),
+        sa.Column('hour', sa.Integer(), nullable=False),
+        sa.Column('order_count', sa.Integer(), nullable=False),
+        *[sa.Column(column, sa.Float(), nullable=False) for column in SUM_COLUMNS],
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('location', 'local_date', 'hour', name='uq_sales_hourly_location_date_hour'),
+    )
+    op.create_index(op.f('ix_sales_hourly_id'), 'sales_hourly', ['id'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        sums = ', '.join(f"coalesce(sum({column}), 0)" for column in SUM_COLUMNS)
+        op.execute(
+            f"INSERT INTO sales_hourly (location, local_date, hour, order_count, {', '.join(SUM_COLUMNS)}) "
+            f"SELECT location, ordered_at::date, extract(hour FROM ordered_at)::int, count(*), {sums} "
+            f"FROM orders WHERE location IS NOT NULL AND ordered_at IS NOT NULL "
+            f"GROUP BY location, ordered_at::date, extract(hour FROM ordered_at)::int"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_sales_hourly_id'), table_name='sales_hourly')
+    op.drop_table('sales_hourly')
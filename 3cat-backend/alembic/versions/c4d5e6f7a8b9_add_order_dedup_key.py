@@ -0,0 +1,85 @@
+"""add dedup_key to orders
+
+Adds the natural-key hash used for set-based order deduplication
+(see OrderService.compute_dedup_keys), backfills it for existing rows,
+removes exact duplicates that were already loaded (logging how many) and adds a unique index.
+
+Revision ID: c4d5e6f7a8b9
+Revises: b7c1d2e3f4a5
+Create Date: 2025-08-25 09:00:00.000000
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d5e6f7a8b9'
+down_revision: Union[str, None] = 'b7c1d2e3f4a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('orders', sa.Column('dedup_key', sa.String(length=32), nullable=True))
+
+    # Older imports read "Order #" as a float column whenever the export had a blank row and stored
+    # '12345.0'; normalize them as OrderService.normalize_order_number_series does for new uploads
+    op.execute(r"""
+        UPDATE orders SET order_number = regexp_replace(order_number, '^(\d+)\.0$', '\1')
+        WHERE order_number ~ '^\d+\.0$'
+    """)
+
+    # Same string as OrderService.compute_dedup_keys: money fields in integer cents, and a NULL
+    # order_number hashed as '' (concat_ws would drop it, separator included)
+    op.execute("""
+        UPDATE orders SET dedup_key = md5(concat_ws('|',
+            location::text,
+            coalesce(order_number, ''),
+            to_char(ordered_at, 'YYYY-MM-DD HH24:MI:SS'),
+            round(coalesce(subtotal, 0) * 100)::bigint::text,
+            round(coalesce(custom_surcharge, 0) * 100)::bigint::text,
+            round(coalesce(custom_discounts, 0) * 100)::bigint::text,
+            round(coalesce(up_charge, 0) * 100)::bigint::text,
+            round(coalesce(delivery_charge, 0) * 100)::bigint::text,
+            round(coalesce(third_party_delivery_charge, 0) * 100)::bigint::text,
+            round(coalesce(snackpass_fee, 0) * 100)::bigint::text,
+            round(coalesce(processing_fee, 0) * 100)::bigint::text,
+            round(coalesce(estimated_third_party_fees, 0) * 100)::bigint::text,
+            round(coalesce(cust_to_store_fees, 0) * 100)::bigint::text,
+            round(coalesce(tax, 0) * 100)::bigint::text,
+            round(coalesce(estimated_third_party_taxes, 0) * 100)::bigint::text,
+            round(coalesce(tips, 0) * 100)::bigint::text,
+            round(coalesce(total, 0) * 100)::bigint::text,
+            round(coalesce(net_sales, 0) * 100)::bigint::text,
+            round(coalesce(gross_sales, 0) * 100)::bigint::text,
+            round(coalesce(estimated_third_party_payout, 0) * 100)::bigint::text,
+            round(coalesce(cash, 0) * 100)::bigint::text,
+            round(coalesce(gift_card_redemption, 0) * 100)::bigint::text,
+            round(coalesce(store_credit_redemption, 0) * 100)::bigint::text,
+            round(coalesce(refunded_amount, 0) * 100)::bigint::text
+        ))
+    """)
+
+    # Exact duplicates from earlier uploads would block the unique index; keep the oldest row
+    removed = op.get_bind().execute(sa.text("""
+        DELETE FROM orders a
+        USING orders b
+        WHERE a.dedup_key = b.dedup_key
+          AND a.id > b.id
+    """)).rowcount
+    logger.info(f"Removed {removed} duplicate order rows (same dedup_key as an older row)")
+
+    op.create_index(op.f('ix_orders_dedup_key'), 'orders', ['dedup_key'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_orders_dedup_key'), table_name='orders')
+    op.drop_column('orders', 'dedup_key')
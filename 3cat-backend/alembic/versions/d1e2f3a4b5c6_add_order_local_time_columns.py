@@ -0,0 +1,61 @@
+"""add order local time columns and location timezone
+
+Stores each order's UTC instant, local date, hour and weekday (derived from the
+store wall-clock ordered_at with the location's time zone) so analytics group on
+indexed columns instead of converting ordered_at per row.
+
+Revision ID: d1e2f3a4b5c6
+Revises: c0d1e2f3a4b5
+Create Date: 2025-09-01 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1e2f3a4b5c6'
+down_revision: Union[str, None] = 'c0d1e2f3a4b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEFAULT_TIMEZONE = 'America/Los_Angeles'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('locations', sa.Column('timezone', sa.String(length=64), server_default=DEFAULT_TIMEZONE, nullable=False))
+
+    op.add_column('orders', sa.Column('ordered_at_utc', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('orders', sa.Column('local_date', sa.Date(), nullable=True))
+    op.add_column('orders', sa.Column('local_hour', sa.Integer(), nullable=True))
+    op.add_column('orders', sa.Column('local_dow', sa.Integer(), nullable=True))
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # isodow is Monday = 1, the columns use datetime.weekday() (Monday = 0)
+        op.execute(
+            f"UPDATE orders SET ordered_at_utc = ordered_at AT TIME ZONE '{DEFAULT_TIMEZONE}', "
+            f"local_date = ordered_at::date, local_hour = extract(hour FROM ordered_at)::int, "
+            f"local_dow = extract(isodow FROM ordered_at)::int - 1"
+        )
+        op.execute(
+            f"UPDATE orders o SET ordered_at_utc = o.ordered_at AT TIME ZONE l.timezone "
+            f"FROM locations l WHERE l.location_id = o.location AND l.timezone <> '{DEFAULT_TIMEZONE}'"
+        )
+
+    # Created on the partitioned parent, so every partition gets it
+    op.create_index('ix_orders_location_local_date_hour', 'orders', ['location', 'local_date', 'local_hour'], unique=False)
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("ANALYZE orders")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_orders_location_local_date_hour', table_name='orders')
+    op.drop_column('orders', 'local_dow')
+    op.drop_column('orders', 'local_hour')
+    op.drop_column('orders', 'local_date')
+    op.drop_column('orders', 'ordered_at_utc')
+    op.drop_column('locations', 'timezone')
@@ -0,0 +1,57 @@
+"""add order_import_jobs table
+
+Revision ID: d5e6f7a8b9c0
+Revises: c4d5e6f7a8b9
+Create Date: 2025-08-26 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e6f7a8b9c0'
+down_revision: Union[str, None] = 'c4d5e6f7a8b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'order_import_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('location_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('filename', sa.String(), nullable=False),
+        sa.Column('storage', sa.String(), nullable=False),
+        sa.Column('container_name', sa.String(), nullable=True),
+        sa.Column('file_path', sa.String(), nullable=False),
+        sa.Column('period_start_date', sa.String(), nullable=True),
+        sa.Column('period_end_date', sa.String(), nullable=True),
+        sa.Column('validate_dates', sa.Boolean(), nullable=False),
+        sa.Column('overwrite_existing', sa.Boolean(), nullable=False),
+        sa.Column('append_mode', sa.Boolean(), nullable=False),
+        sa.Column('rows_processed', sa.Integer(), nullable=False),
+        sa.Column('orders_created', sa.Integer(), nullable=False),
+        sa.Column('orders_skipped', sa.Integer(), nullable=False),
+        sa.Column('error_count', sa.Integer(), nullable=False),
+        sa.Column('errors', sa.JSON(), nullable=True),
+        sa.Column('message', sa.Text(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_order_import_jobs_id'), 'order_import_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_order_import_jobs_location_id'), 'order_import_jobs', ['location_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_order_import_jobs_location_id'), table_name='order_import_jobs')
+    op.drop_index(op.f('ix_order_import_jobs_id'), table_name='order_import_jobs')
+    op.drop_table('order_import_jobs')
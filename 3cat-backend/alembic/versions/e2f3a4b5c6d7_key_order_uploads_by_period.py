@@ -0,0 +1,67 @@
+"""key order_uploads by period and store the imported date span
+
+A file imported for one period only loads the rows inside it, so the manifest
+is now unique per (location, file, period) instead of (location, file), and
+csv_min_date / csv_max_date become imported_min_date / imported_max_date: the
+span the import kept rather than the whole file's. Existing rows are clamped to
+their period (the closest span the old columns allow).
+
+Revision ID: e2f3a4b5c6d7
+Revises: d1e2f3a4b5c6
+Create Date: 2025-09-03 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f3a4b5c6d7'
+down_revision: Union[str, None] = 'd1e2f3a4b5c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint('uq_order_uploads_location_sha256', 'order_uploads', type_='unique')
+    op.alter_column('order_uploads', 'csv_min_date', new_column_name='imported_min_date')
+    op.alter_column('order_uploads', 'csv_max_date', new_column_name='imported_max_date')
+
+    # Rows outside the period were never imported; an empty intersection means nothing was
+    op.execute("""
+        UPDATE order_uploads SET
+            imported_min_date = greatest(imported_min_date, period_start_date::date),
+            imported_max_date = least(imported_max_date, period_end_date::date)
+        WHERE period_start_date IS NOT NULL AND period_end_date IS NOT NULL
+    """)
+    op.execute("""
+        UPDATE order_uploads SET imported_min_date = NULL, imported_max_date = NULL
+        WHERE imported_min_date > imported_max_date
+    """)
+
+    op.create_index(
+        'uq_order_uploads_location_sha256_period', 'order_uploads',
+        ['location_id', 'content_sha256', sa.text("coalesce(period_start_date, '')"), sa.text("coalesce(period_end_date, '')")],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_order_uploads_location_sha256_period', table_name='order_uploads')
+
+    # One row per file again: keep the newest import of each
+    op.execute("""
+        DELETE FROM order_uploads a
+        USING order_uploads b
+        WHERE a.location_id = b.location_id
+          AND a.content_sha256 = b.content_sha256
+          AND a.id < b.id
+    """)
+
+    op.alter_column('order_uploads', 'imported_max_date', new_column_name='csv_max_date')
+    op.alter_column('order_uploads', 'imported_min_date', new_column_name='csv_min_date')
+    op.create_unique_constraint('uq_order_uploads_location_sha256', 'order_uploads', ['location_id', 'content_sha256'])
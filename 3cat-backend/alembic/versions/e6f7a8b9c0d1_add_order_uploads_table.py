@@ -0,0 +1,52 @@
+"""add order_uploads table
+
+Revision ID: e6f7a8b9c0d1
+Revises: d5e6f7a8b9c0
+Create Date: 2025-08-27 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f7a8b9c0d1'
+down_revision: Union[str, None] = 'd5e6f7a8b9c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'order_uploads',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('location_id', sa.Integer(), nullable=False),
+        sa.Column('content_sha256', sa.String(length=64), nullable=False),
+        sa.Column('filename', sa.String(), nullable=True),
+        sa.Column('file_size', sa.Integer(), nullable=True),
+        sa.Column('rows', sa.Integer(), nullable=False),
+        sa.Column('orders_created', sa.Integer(), nullable=False),
+        sa.Column('orders_skipped', sa.Integer(), nullable=False),
+        sa.Column('csv_min_date', sa.Date(), nullable=True),
+        sa.Column('csv_max_date', sa.Date(), nullable=True),
+        sa.Column('period_start_date', sa.String(), nullable=True),
+        sa.Column('period_end_date', sa.String(), nullable=True),
+        sa.Column('blob_container', sa.String(), nullable=True),
+        sa.Column('blob_path', sa.String(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('location_id', 'content_sha256', name='uq_order_uploads_location_sha256'),
+    )
+    op.create_index(op.f('ix_order_uploads_id'), 'order_uploads', ['id'], unique=False)
+    op.create_index('ix_order_uploads_location_dates', 'order_uploads', ['location_id', 'csv_min_date', 'csv_max_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_order_uploads_location_dates', table_name='order_uploads')
+    op.drop_index(op.f('ix_order_uploads_id'), table_name='order_uploads')
+    op.drop_table('order_uploads')
@@ -0,0 +1,49 @@
+"""add order_items table
+
+Revision ID: f7a8b9c0d1e2
+Revises: e6f7a8b9c0d1
+Create Date: 2025-08-28 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a8b9c0d1e2'
+down_revision: Union[str, None] = 'e6f7a8b9c0d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'order_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('order_dedup_key', sa.String(length=32), nullable=True),
+        sa.Column('location', sa.Integer(), nullable=False),
+        sa.Column('ordered_at', sa.DateTime(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('item_name', sa.String(length=200), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('modifiers', sa.Text(), nullable=True),
+        sa.Column('price', sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_order_items_id'), 'order_items', ['id'], unique=False)
+    op.create_index(op.f('ix_order_items_order_dedup_key'), 'order_items', ['order_dedup_key'], unique=False)
+    op.create_index('ix_order_items_location_item_ordered_at', 'order_items', ['location', 'item_name', 'ordered_at'], unique=False)
+    op.create_index('ix_order_items_location_ordered_at', 'order_items', ['location', 'ordered_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_order_items_location_ordered_at', table_name='order_items')
+    op.drop_index('ix_order_items_location_item_ordered_at', table_name='order_items')
+    op.drop_index(op.f('ix_order_items_order_dedup_key'), table_name='order_items')
+    op.drop_index(op.f('ix_order_items_id'), table_name='order_items')
+    op.drop_table('order_items')
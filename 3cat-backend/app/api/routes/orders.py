@@ -1,28 +1,222 @@
 # routes/orders.py
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, Query
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
 from sqlalchemy.orm import Session
-from typing import Optional
+from sse_starlette.sse import EventSourceResponse
+from typing import Dict, List, Literal, Optional, Tuple
+import asyncio
+import hashlib
+import json
 import os
+import shutil
+import tempfile
 
 from app.api import deps
 from app.services.order_service import OrderService
 from app.services.file_upload_service import FileUploadService
+from app.services.order_import_service import (
+    MAX_BATCH_IMPORT_FILES,
+    ORDER_IMPORT_DIR,
+    TERMINAL_STATUSES,
+    batch_import_concurrency,
+    create_import_job,
+    discard_job_upload,
+    serialize_import_job,
+)
+from app.services.order_item_service import get_item_sales, get_item_velocity
+from app.services.sales_rollup_service import get_two_week_hourly_net_sales
+from app.services.sales_forecast_service import FORECAST_DEFAULT_WEEKS, forecast_hourly_net_sales
+from app.services.order_export_service import (
+    gzip_chunks,
+    iter_csv_export,
+    iter_order_row_batches,
+    iter_parquet_export,
+    resolve_export_columns,
+)
+from app.services.order_coverage_service import count_csv_orders_by_day, get_order_coverage, plan_upload_by_day
+from app.services.order_upload_service import (
+    duplicate_upload_response,
+    find_upload,
+    list_uploads,
+    record_upload,
+)
+from app.tasks.import_tasks import import_orders_csv_task
+from app.utils.location_mapping import get_location_timezone
 from app.config import logger
+from app.database import SessionLocal, engine
+from app.models.order_import_job import OrderImportJob
 
-from datetime import datetime, timedelta
-from sqlalchemy import func, cast, DateTime
-from app.models.order import Order
+from datetime import datetime, timedelta, timezone
 
 router = APIRouter()
 
+# Bytes read from an UploadFile per iteration while spooling it to disk
+UPLOAD_SPOOL_CHUNK_BYTES = 1024 * 1024
+
+# How often the import progress stream re-reads the job row
+IMPORT_EVENTS_POLL_SECONDS = 1.0
+
 # ---- Helpers ----
 
+class OrderBatchImportEntry(BaseModel):
+    """Per-file settings of a batch import; unset flags fall back to the batch-level form values"""
+    location_id: int
+    period_start_date: Optional[str] = None
+    period_end_date: Optional[str] = None
+    validate_dates: Optional[bool] = None
+    overwrite_existing: Optional[bool] = None
+    append_mode: Optional[bool] = None
+
 def azure_enabled() -> bool:
     """Return True if Azure Storage is configured via env vars."""
     conn = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
     container = os.getenv("AZURE_STORAGE_CONTAINER")
     return bool(conn and container)
 
+async def spool_upload_to_tempfile(file: UploadFile) -> Tuple[str, str]:
+    """
+    Copy an upload to a temp .csv file in fixed-size chunks (caller removes it).
+    Returns (path, SHA-256 of the content), hashed on the way through for the upload manifest.
+    """
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    digest = hashlib.sha256()
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := await file.read(UPLOAD_SPOOL_CHUNK_BYTES):
+                digest.update(chunk)
+                out.write(chunk)
+    except Exception:
+        os.remove(path)
+        raise
+    return path, digest.hexdigest()
+
+def order_blob_filename(filename: str, period_start_date: Optional[str], period_end_date: Optional[str]) -> str:
+    """Build a friendly blob filename (used if Azure is enabled)"""
+    if period_start_date and period_end_date:
+        ext = filename.split(".")[-1] if "." in filename else "csv"
+        return f"{period_start_date}_to_{period_end_date}.{ext}"
+    return filename
+
+async def import_spooled_csv(
+    db: Session,
+    csv_path: str,
+    content_sha256: str,
+    filename: str,
+    location_id: int,
+    container_name: str,
+    period_start_date: Optional[str] = None,
+    period_end_date: Optional[str] = None,
+    validate_dates: bool = True,
+    overwrite_existing: bool = False,
+    append_mode: bool = False,
+) -> dict:
+    """
+    Import pipeline behind /upload-csv and /upload-csv-batch for a CSV already spooled to disk:
+    manifest short-circuit, date validation and existing-data check, then parse & insert concurrently
+    with the Azure archive upload, and record the file in the manifest. Returns the endpoint response (a duplicate,
+    a rejection or the processing result). Blocking DB work runs in worker threads.
+    """
+    # Identical file already imported for this location over this period: nothing to do (overwrite always re-imports)
+    if not overwrite_existing:
+        previous_upload = await asyncio.to_thread(
+            find_upload, db, location_id, content_sha256, period_start_date, period_end_date
+        )
+        if previous_upload:
+            return duplicate_upload_response(previous_upload)
+
+    # Optional date-window validation (a cheap scan of the date column), and block a period that
+    # already has data unless overwrite or append is requested; both before anything is archived or written
+    rejection = await asyncio.to_thread(
+        OrderService.preflight_csv_import,
+        csv_content=csv_path,
+        location_id=location_id,
+        db=db,
+        period_start_date=period_start_date,
+        period_end_date=period_end_date,
+        validate_dates=validate_dates,
+        overwrite_existing=overwrite_existing,
+        append_mode=append_mode,
+    )
+    if rejection:
+        return rejection
+
+    blob_filename = order_blob_filename(filename, period_start_date, period_end_date)
+
+    # === Azure upload (graceful fallback) ===
+    async def archive_upload() -> Optional[dict]:
+        if not azure_enabled():
+            logger.warning("Azure not configured; skipping blob upload and inserting directly to DB")
+            return None
+        try:
+            with open(csv_path, "rb") as blob_file:
+                return await FileUploadService.upload_file_to_blob(
+                    file_content=blob_file,
+                    filename=blob_filename,
+                    container_name=container_name,
+                    location_id=location_id,
+                    db=db,
+                    location_code=location_code,
+                )
+        except Exception as e:
+            # In prod you might want to raise; in dev we can log and continue
+            logger.error(f"Azure upload failed; continuing with DB insert only: {e}")
+            return None
+
+    # Resolved up front: `db` is busy with the import while the blob uploads
+    location_code = (
+        await asyncio.to_thread(FileUploadService.get_location_code, location_id, db)
+        if azure_enabled() else None
+    )
+
+    # === Parse CSV & insert into DB, concurrently with the archive upload ===
+    blob_result, processing_result = await asyncio.gather(
+        archive_upload(),
+        asyncio.to_thread(
+            OrderService.process_csv_and_insert_orders,
+            csv_content=csv_path,
+            location_id=location_id,
+            db=db,
+            overwrite_existing=overwrite_existing,
+            start_date=period_start_date,
+            end_date=period_end_date,
+            append_mode=append_mode,
+        ),
+    )
+
+    await asyncio.to_thread(
+        record_upload,
+        db,
+        location_id=location_id,
+        content_sha256=content_sha256,
+        processing_result=processing_result,
+        filename=filename,
+        file_size=os.path.getsize(csv_path),
+        period_start_date=period_start_date,
+        period_end_date=period_end_date,
+        blob_container=container_name if blob_result else None,
+        blob_path=blob_result.get("blob_name") if blob_result else None,
+    )
+
+    return {
+        "success": True,
+        "file_upload": blob_result,
+        "order_processing": processing_result,
+        "message": f"Processed {processing_result.get('orders_created', 0)} orders"
+                    + (" (blob uploaded)" if blob_result else " (no blob upload)"),
+    }
+
+def _parse_date_range(start_date: str, end_date: str) -> Tuple[datetime, datetime]:
+    """YYYY-MM-DD start/end (inclusive) -> [start, end + 1 day) datetimes; 400 on bad input"""
+    try:
+        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+        end_dt = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start_date and end_date must be YYYY-MM-DD")
+    if end_dt <= start_dt:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    return start_dt, end_dt
+
 def _parse_date(s: str) -> datetime:
     try:
         return datetime.strptime(s, "%Y-%m-%d")
@@ -48,88 +242,31 @@ async def upload_orders_csv(
     Upload CSV, optionally upload the raw file to Azure, then parse & insert into DB.
     - In **dev**, if Azure env vars are missing, we *gracefully skip* blob upload and only insert to DB.
     - In **prod**, if Azure is expected and misconfigured, raise a 500.
+    The upload is spooled to a temp file and parsed in chunks, so memory stays flat for large exports.
+    Dates are validated with a cheap scan of the date column before anything is archived or written;
+    the Azure archive upload then runs concurrently with parsing/inserting.
     """
+    csv_path = None
     try:
         if not file.filename.lower().endswith(".csv"):
             raise HTTPException(status_code=400, detail="File must be a CSV file")
 
-        content = await file.read()
-
-        # Optional: validate CSV dates window
-        if validate_dates and period_start_date and period_end_date:
-            date_validation = OrderService.validate_csv_dates(
-                csv_content=content,
-                expected_start_date=period_start_date,
-                expected_end_date=period_end_date,
-            )
-            if not date_validation["valid"]:
-                return {
-                    "success": False,
-                    "validation_error": True,
-                    "date_validation": date_validation,
-                    "message": "CSV dates do not match the selected date range",
-                }
-
-        # If a date range is given and neither overwrite nor append is requested,
-        # check if data already exists and block to avoid duplicates.
-        if period_start_date and period_end_date and not overwrite_existing and not append_mode:
-            existing = OrderService.check_existing_data_for_date_range(
-                location_id=location_id,
-                start_date=period_start_date,
-                end_date=period_end_date,
-                db=db,
-            )
-            if existing["has_existing_data"]:
-                return {
-                    "success": False,
-                    "existing_data_error": True,
-                    "existing_data": existing,
-                    "message": "Data already exists for the selected date range",
-                }
-
-        # Build a friendly blob filename (used if Azure is enabled)
-        if period_start_date and period_end_date:
-            ext = file.filename.split(".")[-1] if "." in file.filename else "csv"
-            blob_filename = f"{period_start_date}_to_{period_end_date}.{ext}"
-        else:
-            blob_filename = file.filename
+        csv_path, content_sha256 = await spool_upload_to_tempfile(file)
 
-        # === Azure upload (graceful fallback) ===
-        blob_result = None
-        if azure_enabled():
-            try:
-                blob_result = await FileUploadService.upload_file_to_blob(
-                    file_content=content,
-                    filename=blob_filename,
-                    container_name=container_name,
-                    location_id=location_id,
-                    db=db,
-                )
-            except Exception as e:
-                # In prod you might want to raise; in dev we can log and continue
-                logger.error(f"Azure upload failed; continuing with DB insert only: {e}")
-        else:
-            logger.warning("Azure not configured; skipping blob upload and inserting directly to DB")
-
-        # === Parse CSV & insert into DB ===
-        processing_result = OrderService.process_csv_and_insert_orders(
-            csv_content=content,
+        return await import_spooled_csv(
+            db,
+            csv_path=csv_path,
+            content_sha256=content_sha256,
+            filename=file.filename,
             location_id=location_id,
-            db=db,
+            container_name=container_name,
+            period_start_date=period_start_date,
+            period_end_date=period_end_date,
+            validate_dates=validate_dates,
             overwrite_existing=overwrite_existing,
-            start_date=period_start_date,
-            end_date=period_end_date,
             append_mode=append_mode,
         )
 
-        return {
-            "success": True,
-            "file_upload": blob_result,
-            "order_processing": processing_result,
-            "message": f"Processed {processing_result.get('orders_created', 0)} orders"
-                        + (" (blob uploaded)" if blob_result else " (no blob upload)"),
-        }
-
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except HTTPException:
@@ -137,6 +274,9 @@ async def upload_orders_csv(
     except Exception as e:
         logger.error(f"Error uploading orders CSV: {e}")
         raise HTTPException(status_code=500, detail=f"Upload failed: {e}")
+    finally:
+        if csv_path:
+            os.remove(csv_path)
 
 
 @router.post("/upload-csv-direct")
@@ -152,14 +292,20 @@ async def upload_orders_csv_direct(
     Dev-friendly endpoint: bypass Azure entirely and load CSV straight into Postgres.
     Useful when testing locally or when Azure is unavailable.
     """
+    csv_path = None
     try:
         if not file.filename.lower().endswith(".csv"):
             raise HTTPException(status_code=400, detail="Please upload a .csv file")
 
-        content = await file.read()
+        csv_path, content_sha256 = await spool_upload_to_tempfile(file)
+
+        if not overwrite_existing:
+            previous_upload = find_upload(db, location_id, content_sha256, period_start_date, period_end_date)
+            if previous_upload:
+                return duplicate_upload_response(previous_upload)
 
         processing_result = OrderService.process_csv_and_insert_orders(
-            csv_content=content,
+            csv_content=csv_path,
             location_id=location_id,
             db=db,
             overwrite_existing=overwrite_existing,
@@ -168,6 +314,17 @@ async def upload_orders_csv_direct(
 
         )
 
+        record_upload(
+            db,
+            location_id=location_id,
+            content_sha256=content_sha256,
+            processing_result=processing_result,
+            filename=file.filename,
+            file_size=os.path.getsize(csv_path),
+            period_start_date=period_start_date,
+            period_end_date=period_end_date,
+        )
+
         return {
             "success": True,
             "message": f"Inserted {processing_result.get('orders_created', 0)} orders directly",
@@ -178,39 +335,417 @@ async def upload_orders_csv_direct(
     except Exception as e:
         logger.error(f"Error uploading CSV directly: {e}")
         raise HTTPException(status_code=500, detail=f"Direct upload failed: {e}")
+    finally:
+        if csv_path:
+            os.remove(csv_path)
+
+
+@router.post("/upload-csv-batch")
+async def upload_orders_csv_batch(
+    files: List[UploadFile] = File(...),
+    imports: str = Form(...),
+    container_name: str = Form("3cat-orders"),
+    validate_dates: bool = Form(True),
+    overwrite_existing: bool = Form(False),
+    append_mode: bool = Form(False),
+):
+    """
+    Import several Snackpass CSVs (e.g. month-end for every store) in one request.
+    `imports` is a JSON list with one entry per file, in the same order:
+    {"location_id": 12, "period_start_date": "2025-07-01", "period_end_date": "2025-07-31"}
+    plus optional validate_dates / overwrite_existing / append_mode overrides.
+    Each file goes through the /upload-csv pipeline in its own session and transaction, so a bad
+    file only fails itself. Locations are imported concurrently, bounded by the connection pool
+    (batch_import_concurrency); files for the same location run one after another, in order.
+    """
+    if not files:
+        raise HTTPException(status_code=400, detail="No files uploaded")
+    if len(files) > MAX_BATCH_IMPORT_FILES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IMPORT_FILES} files per batch")
+    for file in files:
+        if not file.filename.lower().endswith(".csv"):
+            raise HTTPException(status_code=400, detail=f"{file.filename} is not a CSV file")
+
+    try:
+        raw_entries = json.loads(imports)
+        if not isinstance(raw_entries, list):
+            raise ValueError("imports must be a JSON list")
+        entries = [OrderBatchImportEntry(**entry) for entry in raw_entries]
+    except (ValueError, TypeError, ValidationError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid imports: {e}")
+    if len(entries) != len(files):
+        raise HTTPException(
+            status_code=400,
+            detail=f"imports has {len(entries)} entries for {len(files)} files (one per file, in order)",
+        )
+
+    spooled: List[Tuple[str, str]] = []
+    try:
+        for file in files:
+            spooled.append(await spool_upload_to_tempfile(file))
+
+        semaphore = asyncio.Semaphore(batch_import_concurrency(engine))
+        results: List[Optional[dict]] = [None] * len(files)
+
+        async def import_file(index: int) -> None:
+            entry = entries[index]
+            csv_path, content_sha256 = spooled[index]
+            overwrite = entry.overwrite_existing if entry.overwrite_existing is not None else overwrite_existing
+            outcome = {
+                "index": index,
+                "filename": files[index].filename,
+                "location_id": entry.location_id,
+                "period_start_date": entry.period_start_date,
+                "period_end_date": entry.period_end_date,
+            }
+            async with semaphore:
+                db = SessionLocal()
+                try:
+                    response = await import_spooled_csv(
+                        db,
+                        csv_path=csv_path,
+                        content_sha256=content_sha256,
+                        filename=files[index].filename,
+                        location_id=entry.location_id,
+                        container_name=container_name,
+                        period_start_date=entry.period_start_date,
+                        period_end_date=entry.period_end_date,
+                        validate_dates=entry.validate_dates if entry.validate_dates is not None else validate_dates,
+                        overwrite_existing=overwrite,
+                        append_mode=entry.append_mode if entry.append_mode is not None else append_mode,
+                    )
+                    if response.get("duplicate_upload"):
+                        status = "duplicate"
+                    elif response.get("success"):
+                        status = "succeeded"
+                    else:
+                        status = "rejected"
+                    results[index] = {**outcome, "status": status, **response}
+                except Exception as e:
+                    logger.error(f"Batch import of {files[index].filename} for location {entry.location_id} failed: {e}")
+                    results[index] = {**outcome, "status": "failed", "success": False, "message": str(e)}
+                finally:
+                    db.close()
+
+        async def import_location(indexes: List[int]) -> None:
+            for index in indexes:
+                await import_file(index)
+
+        by_location: Dict[int, List[int]] = {}
+        for index, entry in enumerate(entries):
+            by_location.setdefault(entry.location_id, []).append(index)
+        await asyncio.gather(*(import_location(indexes) for indexes in by_location.values()))
+
+        summary = {
+            "files": len(results),
+            "locations": len(by_location),
+            "succeeded": 0,
+            "duplicate": 0,
+            "rejected": 0,
+            "failed": 0,
+            "rows_processed": 0,
+            "orders_created": 0,
+            "orders_skipped": 0,
+        }
+        for result in results:
+            summary[result["status"]] += 1
+            if result["status"] == "succeeded":
+                processing = result["order_processing"]
+                summary["rows_processed"] += processing.get("total_rows_processed", 0)
+                summary["orders_created"] += processing.get("orders_created", 0)
+                summary["orders_skipped"] += processing.get("orders_skipped", 0)
+
+        return {
+            "success": summary["rejected"] == 0 and summary["failed"] == 0,
+            "summary": summary,
+            "results": results,
+            "message": f"Imported {summary['succeeded']} of {summary['files']} files "
+                       f"({summary['orders_created']} orders; {summary['duplicate']} duplicate, "
+                       f"{summary['rejected']} rejected, {summary['failed']} failed)",
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error running batch orders import: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch upload failed: {e}")
+    finally:
+        for csv_path, _ in spooled:
+            if os.path.exists(csv_path):
+                os.remove(csv_path)
+
+
+@router.post("/import-jobs")
+async def create_order_import_job(
+    file: UploadFile = File(...),
+    location_id: int = Form(...),
+    container_name: str = Form("3cat-orders"),
+    period_start_date: Optional[str] = Form(None),
+    period_end_date: Optional[str] = Form(None),
+    validate_dates: bool = Form(True),
+    overwrite_existing: bool = Form(False),
+    append_mode: bool = Form(False),
+    db: Session = Depends(deps.get_db),
+):
+    """
+    Background version of /upload-csv: store the file, enqueue a Celery import job and
+    return its id right away. Date validation, the existing-data check and the import run
+    in the worker; follow them with GET /import-jobs/{job_id} or /import-jobs/{job_id}/events.
+    The file goes to Azure when configured (the worker downloads it), else to ORDER_IMPORT_DIR.
+    """
+    csv_path = None
+    try:
+        if not file.filename.lower().endswith(".csv"):
+            raise HTTPException(status_code=400, detail="File must be a CSV file")
+
+        csv_path, content_sha256 = await spool_upload_to_tempfile(file)
+
+        # Identical file already imported for this period: answer from the manifest without queueing a job
+        if not overwrite_existing:
+            previous_upload = find_upload(db, location_id, content_sha256, period_start_date, period_end_date)
+            if previous_upload:
+                return {**duplicate_upload_response(previous_upload), "job_id": None}
+
+        blob_result = None
+        if azure_enabled():
+            try:
+                with open(csv_path, "rb") as blob_file:
+                    blob_result = await FileUploadService.upload_file_to_blob(
+                        file_content=blob_file,
+                        filename=order_blob_filename(file.filename, period_start_date, period_end_date),
+                        container_name=container_name,
+                        location_id=location_id,
+                        db=db,
+                    )
+            except Exception as e:
+                logger.error(f"Azure upload failed; keeping import file locally: {e}")
+
+        if blob_result:
+            storage, stored_path = "azure", blob_result["blob_name"]
+        else:
+            os.makedirs(ORDER_IMPORT_DIR, exist_ok=True)
+            stored_path = shutil.move(csv_path, os.path.join(ORDER_IMPORT_DIR, os.path.basename(csv_path)))
+            csv_path = None
+            storage = "local"
+
+        job = create_import_job(
+            db,
+            location_id=location_id,
+            filename=file.filename,
+            storage=storage,
+            file_path=stored_path,
+            container_name=container_name if storage == "azure" else None,
+            period_start_date=period_start_date,
+            period_end_date=period_end_date,
+            validate_dates=validate_dates,
+            overwrite_existing=overwrite_existing,
+            append_mode=append_mode,
+        )
+
+        try:
+            import_orders_csv_task.delay(job.id)
+        except Exception as e:
+            # No worker will ever pick the job up: drop its stored file and close it out
+            discard_job_upload(job)
+            job.status = "failed"
+            job.message = f"Could not enqueue import: {e}"
+            job.finished_at = datetime.now(timezone.utc)
+            db.commit()
+            raise
+
+        return {
+            "success": True,
+            "job_id": job.id,
+            "job": serialize_import_job(job),
+            "message": f"Import job {job.id} queued",
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating order import job: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to queue import: {e}")
+    finally:
+        if csv_path:
+            os.remove(csv_path)
+
+
+@router.get("/uploads")
+async def get_order_uploads(
+    location_id: int = Query(...),
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    db: Session = Depends(deps.get_db),
+):
+    """Upload manifest for a location: which imported file covers which dates (optionally overlapping a range), by the span each import kept."""
+    try:
+        start = datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else None
+        end = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start_date and end_date must be YYYY-MM-DD")
+
+    try:
+        uploads = list_uploads(db, location_id, start_date=start, end_date=end)
+        return {"success": True, "uploads": uploads, "count": len(uploads)}
+    except Exception as e:
+        logger.error(f"Error listing order uploads: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to list uploads: {e}")
+
+
+@router.get("/import-jobs/{job_id}")
+async def get_order_import_job(job_id: int, db: Session = Depends(deps.get_db)):
+    """Current status and counters of an import job."""
+    job = db.get(OrderImportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Import job {job_id} not found")
+    return {"success": True, "job": serialize_import_job(job)}
+
+
+@router.get("/import-jobs/{job_id}/events")
+async def stream_order_import_job(job_id: int, request: Request):
+    """
+    Server-Sent Events stream of an import job: a `progress` event whenever the job row
+    changes, then a final `done` event once it succeeds, is rejected or fails.
+    """
+    def load_job() -> Optional[dict]:
+        # Fresh session per poll so each read sees the worker's latest commit
+        with SessionLocal() as db:
+            job = db.get(OrderImportJob, job_id)
+            return serialize_import_job(job) if job else None
+
+    if not await asyncio.to_thread(load_job):
+        raise HTTPException(status_code=404, detail=f"Import job {job_id} not found")
+
+    async def event_generator():
+        last_payload = None
+        while not await request.is_disconnected():
+            job = await asyncio.to_thread(load_job)
+            if job is None:
+                break
+            payload = json.dumps(job)
+            if job["status"] in TERMINAL_STATUSES:
+                yield {"event": "done", "data": payload}
+                break
+            if payload != last_payload:
+                yield {"event": "progress", "data": payload}
+                last_payload = payload
+            await asyncio.sleep(IMPORT_EVENTS_POLL_SECONDS)
+
+    return EventSourceResponse(event_generator())
+
+
+def _serialize_order(o) -> dict:
+    return {
+        "id": o.id,
+        "order_number": o.order_number,
+        "ordered_at": o.ordered_at.isoformat() if o.ordered_at else None,
+        "status": o.status,
+        "customer": o.customer,
+        "fulfillment": o.fulfillment,
+        "items": o.items,
+        "total": o.total,
+        "payment_method": o.payment_method,
+        "location": o.location,
+        "created_at": o.created_at.isoformat() if o.created_at else None,
+    }
 
 
 @router.get("")
 async def get_orders(
     location_id: int = Query(..., description="3Cat location ID"),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    start_date: Optional[str] = Query(None, description="YYYY-MM-DD"),
+    end_date: Optional[str] = Query(None, description="YYYY-MM-DD (inclusive)"),
+    status: Optional[str] = Query(None, description="Exact order status, e.g. Completed"),
+    sort: Literal["desc", "asc"] = Query("desc", description="By ordered_at, then id"),
+    format: Literal["json", "ndjson"] = Query("json", description="ndjson streams every matching order"),
     db: Session = Depends(deps.get_db),
 ):
-    """Get recent orders for a location."""
+    """
+    Orders for a location, newest first by default, keyset-paginated on (ordered_at, id):
+    pass a page's next_cursor to get the next one (null on the last page).
+    format=ndjson ignores limit and streams every matching order after the cursor, one JSON object per line.
+    """
     try:
-        orders = OrderService.get_orders_by_location(location_id, db, limit)
-        payload = [
-            {
-                "id": o.id,
-                "order_number": o.order_number,
-                "ordered_at": o.ordered_at.isoformat() if o.ordered_at else None,
-                "status": o.status,
-                "customer": o.customer,
-                "fulfillment": o.fulfillment,
-                "items": o.items,
-                "total": o.total,
-                "payment_method": o.payment_method,
-                "location": o.location,
-                "created_at": o.created_at.isoformat() if o.created_at else None,
-            }
-            for o in orders
-        ]
-        return {"success": True, "orders": payload, "count": len(payload)}
+        start_dt = datetime.strptime(start_date, "%Y-%m-%d") if start_date else None
+        end_dt = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1) if end_date else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start_date and end_date must be YYYY-MM-DD")
+    if cursor:
+        try:
+            OrderService.decode_order_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    filters = {"start_datetime": start_dt, "end_datetime": end_dt, "status": status}
+
+    if format == "ndjson":
+        def stream_orders():
+            # Own session: the request's session is closed before a streamed body is sent
+            with SessionLocal() as stream_db:
+                for batch in OrderService.iter_order_batches(
+                    location_id, stream_db, cursor=cursor, descending=sort == "desc", **filters
+                ):
+                    yield "".join(json.dumps(_serialize_order(o)) + "\n" for o in batch)
+
+        return StreamingResponse(stream_orders(), media_type="application/x-ndjson")
+
+    try:
+        page = OrderService.get_orders_page(
+            location_id, db, limit=limit, cursor=cursor, descending=sort == "desc", **filters
+        )
+        payload = [_serialize_order(o) for o in page["orders"]]
+        return {"success": True, "orders": payload, "count": len(payload), "next_cursor": page["next_cursor"]}
     except Exception as e:
         logger.error(f"Error getting orders: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get orders: {e}")
 
 
+@router.get("/export")
+def export_orders(
+    location_id: List[int] = Query(..., description="3Cat location ID; repeat for several stores"),
+    start_date: str = Query(..., description="YYYY-MM-DD"),
+    end_date: str = Query(..., description="YYYY-MM-DD (inclusive)"),
+    format: Literal["csv", "parquet"] = Query("csv"),
+    columns: Optional[str] = Query(None, description="Comma-separated Order columns (default: all)"),
+    gzip: bool = Query(False, description="csv: gzip the file; parquet: gzip-compress the column data"),
+):
+    """
+    Download raw orders for one or more locations and any date range as CSV or Parquet.
+    Rows are read through a server-side cursor and encoded batch by batch (one Parquet row group per
+    batch), so the download starts right away and server memory does not grow with the range.
+    """
+    start_dt, end_dt = _parse_date_range(start_date, end_date)
+    try:
+        export_columns = resolve_export_columns([c.strip() for c in columns.split(",") if c.strip()] if columns else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def stream_export():
+        # Own session: the request's session is closed before a streamed body is sent
+        with SessionLocal() as export_db:
+            batches = iter_order_row_batches(export_db, location_id, start_dt, end_dt, export_columns)
+            if format == "parquet":
+                yield from iter_parquet_export(batches, export_columns, compression="gzip" if gzip else "snappy")
+            elif gzip:
+                yield from gzip_chunks(iter_csv_export(batches, export_columns))
+            else:
+                yield from iter_csv_export(batches, export_columns)
+
+    filename = f"orders_{'-'.join(map(str, location_id))}_{start_date}_to_{end_date}"
+    if format == "parquet":
+        filename, media_type = f"{filename}.parquet", "application/vnd.apache.parquet"
+    elif gzip:
+        filename, media_type = f"{filename}.csv.gz", "application/gzip"
+    else:
+        filename, media_type = f"{filename}.csv", "text/csv"
+    return StreamingResponse(
+        stream_export(),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
 @router.get("/check-existing-data")
 async def check_existing_data(
     location_id: int = Query(...),
@@ -232,6 +767,63 @@ async def check_existing_data(
         raise HTTPException(status_code=500, detail=f"Failed to check existing data: {e}")
 
 
+@router.post("/upload-preflight")
+async def preflight_orders_csv(
+    file: UploadFile = File(...),
+    location_id: int = Form(...),
+    period_start_date: Optional[str] = Form(None),
+    period_end_date: Optional[str] = Form(None),
+    db: Session = Depends(deps.get_db),
+):
+    """
+    Before uploading: compare the CSV's orders per day with what is already stored for the location
+    (over the period, or the CSV's own dates) and propose append / overwrite / skip per day.
+    Nothing is written.
+    """
+    csv_path = None
+    try:
+        if not file.filename.lower().endswith(".csv"):
+            raise HTTPException(status_code=400, detail="File must be a CSV file")
+        try:
+            start = datetime.strptime(period_start_date, "%Y-%m-%d").date() if period_start_date else None
+            end = datetime.strptime(period_end_date, "%Y-%m-%d").date() if period_end_date else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="period_start_date and period_end_date must be YYYY-MM-DD")
+
+        csv_path, _ = await spool_upload_to_tempfile(file)
+        location_timezone = await asyncio.to_thread(get_location_timezone, location_id, db)
+        csv_counts = await asyncio.to_thread(count_csv_orders_by_day, csv_path, location_id, location_timezone)
+
+        days = [datetime.strptime(day, "%Y-%m-%d").date() for day in csv_counts]
+        coverage_start = start or (min(days) if days else None)
+        coverage_end = end or (max(days) if days else None)
+        coverage = {}
+        if coverage_start and coverage_end:
+            coverage = await asyncio.to_thread(get_order_coverage, db, location_id, coverage_start, coverage_end)
+
+        plan = plan_upload_by_day(coverage, csv_counts, coverage_start, coverage_end)
+        return {
+            "success": True,
+            "location_id": location_id,
+            "start_date": coverage_start.isoformat() if coverage_start else None,
+            "end_date": coverage_end.isoformat() if coverage_end else None,
+            "coverage": coverage,
+            "csv_counts": csv_counts,
+            **plan,
+        }
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error running upload preflight: {e}")
+        raise HTTPException(status_code=500, detail=f"Preflight failed: {e}")
+    finally:
+        if csv_path:
+            os.remove(csv_path)
+
+
 @router.get("/summary")
 async def get_orders_summary(
     location_id: int = Query(...),
@@ -282,80 +874,43 @@ def get_hourly_and_weekly_sales(
     location_id: int,
     start_date: str,
     end_date: str,
-    tz: str = "America/Los_Angeles",
+    tz: Optional[str] = Query(
+        None,
+        deprecated=True,
+        description="Ignored: hours are the store's local wall-clock time (the location's timezone)"
+    ),
     db: Session = Depends(deps.get_db)
 ):
-    start_dt = datetime.fromisoformat(start_date)
-    end_dt = datetime.fromisoformat(end_date) + timedelta(days=1)  # include end date fully
-
-    # Truncate/group by the local (store) hour
-    tz_ordered_at = func.timezone(tz, cast(Order.ordered_at, DateTime))
-    hour_expr = func.date_trunc("hour", tz_ordered_at)
-
-    # --- Current week: hourly + daily ---
-    hourly_sales_rows = (
-        db.query(
-            hour_expr.label("hour"),
-            func.sum(Order.net_sales).label("net_sales")
-        )
-        .filter(Order.location == location_id)
-        .filter(Order.ordered_at >= start_dt)
-        .filter(Order.ordered_at < end_dt)
-        .group_by(hour_expr)
-        .order_by(hour_expr)
-        .all()
-    )
+    """
+    Hourly and daily net sales for a week (plus the previous week), read from the sales_hourly rollup
+    in a single query over both weeks.
+    Hours are store wall-clock time as exported by Snackpass. `tz` is deprecated and ignored: the old
+    grouping passed the wall-clock ordered_at through timezone(tz, ...), which shifted hours into the
+    database session's timezone (UTC in production) rather than the store's.
+    """
+    if tz is not None:
+        logger.warning(f"/sales/hourly-weekly: ignoring deprecated tz={tz!r}; hours are store local time")
+    start_day = datetime.fromisoformat(start_date).date()
+    end_day = datetime.fromisoformat(end_date).date() + timedelta(days=1)  # include end date fully
 
     hourly_sales: dict[str, dict[int, float]] = {}
     daily_sales_current: dict[str, float] = {}
     daily_sales_source: dict[str, str] = {}
-
-    for row in hourly_sales_rows:
-        day_name = row.hour.strftime("%A")
-        hour_int = row.hour.hour
-        amount = float(row.net_sales or 0)
-        hourly_sales.setdefault(day_name, {})[hour_int] = amount
-        daily_sales_current[day_name] = daily_sales_current.get(day_name, 0.0) + amount
-        daily_sales_source[day_name] = "current"
-
-    # --- Previous week window ---
-    prev_start_dt = start_dt - timedelta(days=7)
-    prev_end_dt = end_dt - timedelta(days=7)
-
-    # Previous week: hourly (same grouping expr)
-    prev_hourly_rows = (
-        db.query(
-            hour_expr.label("hour"),
-            func.sum(Order.net_sales).label("net_sales")
-        )
-        .filter(Order.location == location_id)
-        .filter(Order.ordered_at >= prev_start_dt)
-        .filter(Order.ordered_at < prev_end_dt)
-        .group_by(hour_expr)
-        .order_by(hour_expr)
-        .all()
-    )
-
     prev_week_hourly_sales: dict[str, dict[int, float]] = {}
-    for row in prev_hourly_rows:
-        day_name = row.hour.strftime("%A")
-        hour_int = row.hour.hour
-        amount = float(row.net_sales or 0)
-        prev_week_hourly_sales.setdefault(day_name, {})[hour_int] = amount
-
-    # Previous week: daily totals (timezone-aware to keep labels consistent)
-    daily_sales_prev_rows = (
-        db.query(
-            func.to_char(tz_ordered_at, 'Day').label('day'),
-            func.sum(Order.net_sales).label('sales')
-        )
-        .filter(Order.location == location_id)
-        .filter(Order.ordered_at >= prev_start_dt)
-        .filter(Order.ordered_at < prev_end_dt)
-        .group_by(func.to_char(tz_ordered_at, 'Day'))
-        .all()
-    )
-    daily_sales_prev = {row.day.strip(): float(row.sales or 0) for row in daily_sales_prev_rows}
+    daily_sales_prev: dict[str, float] = {}
+
+    # One pass over the current and previous week: hourly cells, with daily totals rolled up from them
+    for row in get_two_week_hourly_net_sales(db, location_id, start_day, end_day):
+        day_name = row.local_date.strftime("%A")
+        if row.current_net_sales is not None:
+            amount = float(row.current_net_sales)
+            hourly_sales.setdefault(day_name, {})[row.hour] = amount
+            daily_sales_current[day_name] = daily_sales_current.get(day_name, 0.0) + amount
+            daily_sales_source[day_name] = "current"
+        if row.prev_week_net_sales is not None:
+            amount = float(row.prev_week_net_sales)
+            prev_week_hourly_sales.setdefault(day_name, {})[row.hour] = amount
+            daily_sales_prev[day_name] = daily_sales_prev.get(day_name, 0.0) + amount
 
     # Fill missing current-week days with previous week daily total, and mark source
     for day, prev_sales in daily_sales_prev.items():
@@ -371,3 +926,60 @@ def get_hourly_and_weekly_sales(
         "prev_week_hourly_sales": prev_week_hourly_sales,  # ← NEW
     }
 
+
+@router.get("/sales/forecast")
+def get_sales_forecast(
+    location_id: int = Query(...),
+    week_start: str = Query(..., description="YYYY-MM-DD, first day of the week to forecast"),
+    weeks: int = Query(FORECAST_DEFAULT_WEEKS, ge=2, le=26, description="Trailing weeks of history"),
+    db: Session = Depends(deps.get_db),
+):
+    """
+    Hourly net sales forecast for the week from week_start: weighted same weekday/hour average of the
+    trailing weeks with a trend adjustment and confidence bands, per hour and per day.
+    """
+    week_start_date = _parse_date(week_start).date()
+    try:
+        forecast = forecast_hourly_net_sales(db, location_id, week_start_date, weeks=weeks)
+        return {"success": True, "data": forecast}
+    except Exception as e:
+        logger.error(f"Error forecasting sales: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to forecast sales: {e}")
+
+
+@router.get("/items/sales")
+def get_order_item_sales(
+    location_id: int = Query(...),
+    start_date: str = Query(..., description="YYYY-MM-DD"),
+    end_date: str = Query(..., description="YYYY-MM-DD (inclusive)"),
+    kind: Literal["item", "promotion"] = Query("item"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(deps.get_db),
+):
+    """Item-level sales for a location and date range: quantity, orders and revenue per item, best sellers first."""
+    start_dt, end_dt = _parse_date_range(start_date, end_date)
+    try:
+        items = get_item_sales(db, location_id, start_dt, end_dt, kind=kind, limit=limit)
+        return {"success": True, "data": {"items": items, "start_date": start_date, "end_date": end_date, "kind": kind}}
+    except Exception as e:
+        logger.error(f"Error getting item sales: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to get item sales: {e}")
+
+
+@router.get("/items/velocity")
+def get_order_item_velocity(
+    location_id: int = Query(...),
+    item_name: str = Query(..., description="Exact item name as parsed from Items"),
+    start_date: str = Query(..., description="YYYY-MM-DD"),
+    end_date: str = Query(..., description="YYYY-MM-DD (inclusive)"),
+    bucket: Literal["hour", "day"] = Query("hour"),
+    db: Session = Depends(deps.get_db),
+):
+    """How fast one item sells: quantity per hour/day, hour-of-day profile, peak hour and average per day."""
+    start_dt, end_dt = _parse_date_range(start_date, end_date)
+    try:
+        velocity = get_item_velocity(db, location_id, item_name, start_dt, end_dt, bucket=bucket)
+        return {"success": True, "data": velocity}
+    except Exception as e:
+        logger.error(f"Error getting item velocity: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to get item velocity: {e}")
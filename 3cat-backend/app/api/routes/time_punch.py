@@ -1,13 +1,17 @@
 # routes/time_punch.py
 from fastapi import APIRouter, Depends, HTTPException
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Literal
+import asyncio
 import csv
 from io import StringIO
 from fastapi.responses import StreamingResponse
-from datetime import datetime
+from datetime import datetime, timedelta
 import pytz
 from fastapi import Query
+from sqlalchemy.orm import Session
 
+from app.api import deps
+from app.database import SessionLocal
 
 from app.schemas.time_punch import TimePunchFilter, TimePunchResponse, ShiftDisplayResponse
 from app.config import settings, logger
@@ -16,13 +20,25 @@ from app.services.time_punch_service import (
     annotate_per_shift_overtime, 
     get_user_details,
     get_labor_data_for_week,
-    get_hourly_labor_data_for_week,
-    get_hourly_labor_data_with_overtime_for_week,
-    get_shifts_for_week
+    get_labor_summary_for_week,
+    get_labor_heatmap_for_week,
+    get_labor_summaries_for_weeks,
+    get_week_starts_for_range,
+    get_shifts_for_week,
+    HEATMAP_BIN_MINUTES
+)
+from app.services.labor_cube_service import get_labor_cube_weeks
+from app.services.labor_sales_service import (
+    get_sevenshift_location_id_for_location,
+    get_week_hourly_net_sales,
+    join_labor_and_sales
 )
 
 router = APIRouter()
 
+# "live" aggregates 7shifts shifts on request; "cube" reads the labor_hourly table
+LaborSource = Literal["live", "cube"]
+
 def format_break_time_to_pacific(iso_time_str: str) -> str:
     """Convert ISO time string to Pacific time format"""
     try:
@@ -69,6 +85,46 @@ def extract_break_periods(punch_data: Dict[str, Any]) -> List[Dict[str, Any]]:
     
     return break_periods
 
+def summarize_overtime_costs(hourly_labor_data: Dict[str, Dict[int, Dict[str, float]]]) -> tuple:
+    """Sum an hourly overtime grid into (daily_totals, weekly_totals), rounded for display"""
+    daily_totals = {}
+    weekly_totals = {
+        "regular_cost": 0.0,
+        "overtime_cost": 0.0,
+        "double_ot_cost": 0.0,
+        "total_cost": 0.0
+    }
+    
+    for day, hours in hourly_labor_data.items():
+        daily_totals[day] = {
+            "regular_cost": 0.0,
+            "overtime_cost": 0.0,
+            "double_ot_cost": 0.0,
+            "total_cost": 0.0
+        }
+        
+        for hour, costs in hours.items():
+            for cost_type in costs:
+                daily_totals[day][cost_type] += costs[cost_type]
+                weekly_totals[cost_type] += costs[cost_type]
+        
+        # Round daily totals
+        for cost_type in daily_totals[day]:
+            daily_totals[day][cost_type] = round(daily_totals[day][cost_type], 2)
+    
+    # Round weekly totals
+    for cost_type in weekly_totals:
+        weekly_totals[cost_type] = round(weekly_totals[cost_type], 2)
+    
+    return daily_totals, weekly_totals
+
+async def load_week_labor(week_start_date: datetime, location_id: Optional[int], source: str, db: Session) -> Dict:
+    """Aggregated labor for a week (daily / hourly / hourly_overtime), live from 7shifts or from the labor cube"""
+    if source == "cube":
+        # Synchronous queries: run them in a worker thread so the event loop is not blocked
+        return (await asyncio.to_thread(get_labor_cube_weeks, db, [week_start_date.date()], location_id))[0]
+    return await get_labor_summary_for_week(week_start_date, location_id)
+
 @router.post("/", response_model=List[TimePunchResponse])
 async def fetch_time_punches(filter_params: TimePunchFilter):
     """
@@ -212,7 +268,9 @@ async def get_shifts_for_display(filter_params: TimePunchFilter):
 @router.get("/labor/shifts/week")
 async def get_week_labor_data(
     week_start: str = Query(..., description="Week start date in YYYY-MM-DD format"),
-    location_id: Optional[int] = Query(None, description="Location ID (optional)")
+    location_id: Optional[int] = Query(None, description="Location ID (optional)"),
+    source: LaborSource = Query("live", description="live (7shifts) or cube (labor_hourly table)"),
+    db: Session = Depends(deps.get_db)
 ):
     """
     Get labor data for a specific week from 7shifts scheduled shifts
@@ -221,8 +279,8 @@ async def get_week_labor_data(
         # Parse the week start date
         week_start_date = datetime.strptime(week_start, "%Y-%m-%d")
         
-        # Fetch labor data from 7shifts
-        labor_data = await get_labor_data_for_week(week_start_date, location_id)
+        # Fetch labor data from 7shifts (or the labor cube)
+        labor_data = (await load_week_labor(week_start_date, location_id, source, db))["daily"]
         
         return {
             "success": True,
@@ -245,7 +303,9 @@ async def get_week_analysis(
     week_start: str = Query(..., description="Week start date in YYYY-MM-DD format"),
     target_labor_percent: float = Query(25.0, description="Target labor percentage"),
     include_payroll_tax: bool = Query(True, description="Include payroll taxes in calculation"),
-    location_id: Optional[int] = Query(None, description="Location ID (optional)")
+    location_id: Optional[int] = Query(None, description="Location ID (optional)"),
+    source: LaborSource = Query("live", description="live (7shifts) or cube (labor_hourly table)"),
+    db: Session = Depends(deps.get_db)
 ):
     """
     Get labor analysis for a week
@@ -254,8 +314,8 @@ async def get_week_analysis(
         # Parse the week start date
         week_start_date = datetime.strptime(week_start, "%Y-%m-%d")
         
-        # Fetch labor data from 7shifts
-        labor_data = await get_labor_data_for_week(week_start_date, location_id)
+        # Fetch labor data from 7shifts (or the labor cube)
+        labor_data = (await load_week_labor(week_start_date, location_id, source, db))["daily"]
         
         # Calculate payroll tax multiplier
         payroll_tax_multiplier = 1.12 if include_payroll_tax else 1.0
@@ -296,6 +356,65 @@ async def get_week_analysis(
         logger.error(f"Error getting week analysis: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/labor/vs-sales/week")
+async def get_week_labor_vs_sales(
+    week_start: str = Query(..., description="Week start date in YYYY-MM-DD format"),
+    location_id: int = Query(..., description="3Cat location ID (labor is read for its 7shifts location)"),
+    target_labor_percent: float = Query(25.0, description="Target labor percentage"),
+    include_payroll_tax: bool = Query(True, description="Include payroll taxes in calculation"),
+    source: LaborSource = Query("live", description="live (7shifts) or cube (labor_hourly table)"),
+    db: Session = Depends(deps.get_db)
+):
+    """
+    Labor vs net sales for a week, joined on (day, hour) server-side
+    The labor grid and the sales grid are fetched concurrently; returns labor %, sales per labor hour
+    and variance to the target labor cost per hour, per day and for the week
+    """
+    try:
+        # Parse the week start date
+        week_start_date = datetime.strptime(week_start, "%Y-%m-%d")
+        
+        sevenshift_location_id = get_sevenshift_location_id_for_location(db, location_id)
+        if sevenshift_location_id is None:
+            raise HTTPException(status_code=400, detail=f"Location {location_id} has no 7shifts location")
+        
+        def load_sales():
+            # Own session: runs in a worker thread alongside the labor fetch
+            with SessionLocal() as sales_db:
+                return get_week_hourly_net_sales(sales_db, location_id, week_start_date.date())
+        
+        labor, sales = await asyncio.gather(
+            load_week_labor(week_start_date, sevenshift_location_id, source, db),
+            asyncio.to_thread(load_sales)
+        )
+        
+        joined = join_labor_and_sales(
+            labor,
+            sales,
+            week_start_date.date(),
+            target_labor_percent=target_labor_percent,
+            payroll_tax_multiplier=1.12 if include_payroll_tax else 1.0
+        )
+        
+        return {
+            "success": True,
+            "data": {
+                "week_start": week_start,
+                "location_id": location_id,
+                "sevenshift_location_id": sevenshift_location_id,
+                "source": source,
+                **joined
+            }
+        }
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error joining labor and sales: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/labor/shifts/raw")
 async def get_raw_shifts_for_week(
     week_start: str = Query(..., description="Week start date in YYYY-MM-DD format"),
@@ -334,7 +453,9 @@ async def get_raw_shifts_for_week(
 @router.get("/labor/shifts/week/hourly")
 async def get_week_hourly_labor_data(
     week_start: str = Query(..., description="Week start date in YYYY-MM-DD format"),
-    location_id: Optional[int] = Query(None, description="Location ID (optional)")
+    location_id: Optional[int] = Query(None, description="Location ID (optional)"),
+    source: LaborSource = Query("live", description="live (7shifts) or cube (labor_hourly table)"),
+    db: Session = Depends(deps.get_db)
 ):
     """
     Get hourly labor data for a specific week from 7shifts scheduled shifts
@@ -344,8 +465,8 @@ async def get_week_hourly_labor_data(
         # Parse the week start date
         week_start_date = datetime.strptime(week_start, "%Y-%m-%d")
         
-        # Fetch hourly labor data from 7shifts
-        hourly_labor_data = await get_hourly_labor_data_for_week(week_start_date, location_id)
+        # Fetch hourly labor data from 7shifts (or the labor cube)
+        hourly_labor_data = (await load_week_labor(week_start_date, location_id, source, db))["hourly"]
         
         # Calculate daily totals for summary
         daily_totals = {}
@@ -375,7 +496,9 @@ async def get_week_hourly_labor_data(
 @router.get("/labor/shifts/week/hourly/overtime")
 async def get_week_hourly_labor_data_with_overtime(
     week_start: str = Query(..., description="Week start date in YYYY-MM-DD format"),
-    location_id: Optional[int] = Query(None, description="Location ID (optional)")
+    location_id: Optional[int] = Query(None, description="Location ID (optional)"),
+    source: LaborSource = Query("live", description="live (7shifts) or cube (labor_hourly table)"),
+    db: Session = Depends(deps.get_db)
 ):
     """
     Get hourly labor data with overtime calculations for a specific week
@@ -386,38 +509,11 @@ async def get_week_hourly_labor_data_with_overtime(
         # Parse the week start date
         week_start_date = datetime.strptime(week_start, "%Y-%m-%d")
         
-        # Fetch hourly labor data with overtime from 7shifts
-        hourly_labor_data = await get_hourly_labor_data_with_overtime_for_week(week_start_date, location_id)
+        # Fetch hourly labor data with overtime from 7shifts (or the labor cube)
+        hourly_labor_data = (await load_week_labor(week_start_date, location_id, source, db))["hourly_overtime"]
         
         # Calculate daily and weekly totals
-        daily_totals = {}
-        weekly_totals = {
-            "regular_cost": 0.0,
-            "overtime_cost": 0.0,
-            "double_ot_cost": 0.0,
-            "total_cost": 0.0
-        }
-        
-        for day, hours in hourly_labor_data.items():
-            daily_totals[day] = {
-                "regular_cost": 0.0,
-                "overtime_cost": 0.0,
-                "double_ot_cost": 0.0,
-                "total_cost": 0.0
-            }
-            
-            for hour, costs in hours.items():
-                for cost_type in costs:
-                    daily_totals[day][cost_type] += costs[cost_type]
-                    weekly_totals[cost_type] += costs[cost_type]
-            
-            # Round daily totals
-            for cost_type in daily_totals[day]:
-                daily_totals[day][cost_type] = round(daily_totals[day][cost_type], 2)
-        
-        # Round weekly totals
-        for cost_type in weekly_totals:
-            weekly_totals[cost_type] = round(weekly_totals[cost_type], 2)
+        daily_totals, weekly_totals = summarize_overtime_costs(hourly_labor_data)
         
         return {
             "success": True,
@@ -435,6 +531,162 @@ async def get_week_hourly_labor_data_with_overtime(
         logger.error(f"Error fetching hourly labor data with overtime: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/labor/shifts/week/summary")
+async def get_week_labor_summary(
+    week_start: str = Query(..., description="Week start date in YYYY-MM-DD format"),
+    location_id: Optional[int] = Query(None, description="Location ID (optional)"),
+    source: LaborSource = Query("live", description="live (7shifts) or cube (labor_hourly table)"),
+    db: Session = Depends(deps.get_db)
+):
+    """
+    Get daily, hourly and hourly-with-overtime labor data for a week in one response
+    Uses a single 7shifts fetch and a single aggregation pass, so the dashboard week view
+    doesn't need to call /labor/shifts/week, /hourly and /hourly/overtime separately
+    """
+    try:
+        # Parse the week start date
+        week_start_date = datetime.strptime(week_start, "%Y-%m-%d")
+        
+        labor_summary = await load_week_labor(week_start_date, location_id, source, db)
+        
+        hourly_totals = {
+            day: round(sum(hours.values()), 2)
+            for day, hours in labor_summary["hourly"].items()
+        }
+        overtime_daily_totals, overtime_weekly_totals = summarize_overtime_costs(labor_summary["hourly_overtime"])
+        
+        return {
+            "success": True,
+            "data": {
+                "week_start": week_start,
+                "labor": labor_summary["daily"],
+                "hourly_labor": labor_summary["hourly"],
+                "hourly_daily_totals": hourly_totals,
+                "total_week_cost": round(sum(hourly_totals.values()), 2),
+                "hourly_overtime_labor": labor_summary["hourly_overtime"],
+                "overtime_daily_totals": overtime_daily_totals,
+                "overtime_weekly_totals": overtime_weekly_totals
+            }
+        }
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error fetching week labor summary: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/labor/heatmap/week")
+async def get_week_labor_heatmap(
+    week_start: str = Query(..., description="Week start date in YYYY-MM-DD format"),
+    bin_minutes: int = Query(15, description="Bin size in minutes (15, 30 or 60)"),
+    business_hour_start: int = Query(7, ge=0, le=23, description="First business hour (0-23)"),
+    business_hour_end: int = Query(24, ge=1, le=24, description="Business hours end (1-24, exclusive)"),
+    location_id: Optional[int] = Query(None, description="Location ID (optional)")
+):
+    """
+    Get a labor heatmap for a week from 7shifts scheduled shifts
+    Returns average/peak headcount, labor hours and labor cost per time bin for each day
+    """
+    if bin_minutes not in HEATMAP_BIN_MINUTES:
+        raise HTTPException(status_code=400, detail=f"bin_minutes must be one of {list(HEATMAP_BIN_MINUTES)}")
+    if business_hour_start >= business_hour_end:
+        raise HTTPException(status_code=400, detail="business_hour_start must be before business_hour_end")
+    
+    try:
+        # Parse the week start date
+        week_start_date = datetime.strptime(week_start, "%Y-%m-%d")
+        
+        heatmap = await get_labor_heatmap_for_week(
+            week_start_date,
+            location_id,
+            bin_minutes=bin_minutes,
+            business_hour_start=business_hour_start,
+            business_hour_end=business_hour_end
+        )
+        
+        return {
+            "success": True,
+            "data": {
+                "week_start": week_start,
+                "location_id": location_id,
+                **heatmap
+            }
+        }
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error building labor heatmap: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/labor/range")
+async def get_labor_range(
+    start_date: Optional[str] = Query(None, description="Range start date in YYYY-MM-DD format"),
+    end_date: Optional[str] = Query(None, description="Range end date in YYYY-MM-DD format (default: today)"),
+    weeks: Optional[int] = Query(None, ge=1, description="Number of weeks ending with end_date's week (used when start_date is omitted)"),
+    location_id: Optional[int] = Query(None, description="Location ID (optional)"),
+    source: LaborSource = Query("live", description="live (7shifts) or cube (labor_hourly table)"),
+    db: Session = Depends(deps.get_db)
+):
+    """
+    Get labor data for several weeks in one request (for trend views)
+    Completed weeks are reused from cache and the rest are fetched from 7shifts concurrently.
+    Returns per-week arrays stacked in week order:
+    - daily_cost / daily_hours: [week][day]
+    - hourly_cost: [week][day][hour]
+    """
+    if start_date is None and weeks is None:
+        raise HTTPException(status_code=400, detail="Provide start_date/end_date or weeks")
+    
+    try:
+        range_start = datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else None
+        range_end = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else None
+        
+        week_starts = get_week_starts_for_range(range_start, range_end, weeks)
+        if source == "cube":
+            summaries = await asyncio.to_thread(get_labor_cube_weeks, db, week_starts, location_id)
+            result = {"summaries": summaries, "cached_weeks": 0}
+        else:
+            result = await get_labor_summaries_for_weeks(week_starts, location_id)
+        summaries = result["summaries"]
+        
+        days = list(summaries[0]["daily"].keys())
+        hours = list(summaries[0]["hourly"][days[0]].keys())
+        
+        daily_cost = [[summary["daily"][day]["cost"] for day in days] for summary in summaries]
+        daily_hours = [[summary["daily"][day]["hours"] for day in days] for summary in summaries]
+        hourly_cost = [
+            [[summary["hourly"][day][hour] for hour in hours] for day in days]
+            for summary in summaries
+        ]
+        overtime_cost = []
+        for summary in summaries:
+            _, weekly_totals = summarize_overtime_costs(summary["hourly_overtime"])
+            overtime_cost.append(weekly_totals)
+        
+        return {
+            "success": True,
+            "data": {
+                "location_id": location_id,
+                "weeks": [week_start.isoformat() for week_start in week_starts],
+                "days": days,
+                "hours": hours,
+                "daily_cost": daily_cost,
+                "daily_hours": daily_hours,
+                "hourly_cost": hourly_cost,
+                "weekly_cost": [round(sum(week), 2) for week in daily_cost],
+                "weekly_hours": [round(sum(week), 1) for week in daily_hours],
+                "weekly_overtime_totals": overtime_cost,
+                "cached_weeks": result["cached_weeks"]
+            }
+        }
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid range: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error fetching labor range: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/labor/test/sevenshifts")
 async def test_sevenshifts_connection():
     """
@@ -28,6 +28,13 @@ class Settings(BaseSettings):
     SEVEN_SHIFTS_LOCATION_ID: str = os.getenv("SEVEN_SHIFTS_LOCATION_ID", "")
     SEVEN_SHIFTS_COMPANY_ID: str = os.getenv("SEVEN_SHIFTS_COMPANY_ID", "")
 
+    # Connection pool of the app engine (SQLAlchemy's defaults)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
+    # Files a batch order import loads at once; 0 = derive from the connection pool
+    ORDER_BATCH_IMPORT_CONCURRENCY: int = int(os.getenv("ORDER_BATCH_IMPORT_CONCURRENCY", "0"))
+
 
     model_config = {
         "env_file": ".env"
@@ -10,7 +10,11 @@ database_url = settings.DATABASE_URL
 if database_url.startswith("postgres://"):
     database_url = database_url.replace("postgres://", "postgresql://", 1)
 
-engine = create_engine(database_url)
+# SQLite (local dev) keeps its default pool
+if database_url.startswith("sqlite"):
+    engine = create_engine(database_url)
+else:
+    engine = create_engine(database_url, pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -11,4 +11,9 @@ from app.models.location import Location
 from app.models.pending_compensation_change import PendingCompensationChange
 from app.models.department import Department
 from app.models.pay_period import  PayPeriodCreate, PayPeriodUpdate, PayPeriodResponse, PayPeriodListResponse, PayPeriodSingleResponse, ErrorResponse, StatusType
-from app.models.order import Order
\ No newline at end of file
+from app.models.order import Order, OrderItem
+from app.models.labor_hourly import LaborHourly
+from app.models.order_import_job import OrderImportJob
+from app.models.order_upload import OrderUpload
+from app.models.sales_hourly import SalesHourly
+from app.models.order_data_version import OrderDataVersion
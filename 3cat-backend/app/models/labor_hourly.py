@@ -0,0 +1,34 @@
+# models/labor_hourly.py
+from sqlalchemy import Column, Integer, Float, Date, DateTime, UniqueConstraint, func
+
+from app.database import Base
+
+class LaborHourly(Base):
+    """
+    Materialized labor cube: one row per 7shifts location, local (Pacific) date and hour.
+    Populated from 7shifts by the refresh_labor_cube Celery task.
+    """
+    __tablename__ = "labor_hourly"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    sevenshift_location_id = Column(Integer, nullable=False)
+    local_date = Column(Date, nullable=False)
+    hour = Column(Integer, nullable=False)  # 0-23, Pacific wall clock
+    
+    # Hours
+    scheduled_hours = Column(Float, nullable=False, default=0.0)
+    actual_hours = Column(Float, nullable=False, default=0.0)
+    
+    # Scheduled labor cost
+    labor_cost = Column(Float, nullable=False, default=0.0)  # straight time, no OT premium
+    regular_cost = Column(Float, nullable=False, default=0.0)
+    overtime_cost = Column(Float, nullable=False, default=0.0)
+    double_ot_cost = Column(Float, nullable=False, default=0.0)
+    total_cost = Column(Float, nullable=False, default=0.0)
+    
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # Also serves (location, date range) reads
+        UniqueConstraint("sevenshift_location_id", "local_date", "hour", name="uq_labor_hourly_location_date_hour"),
+    )
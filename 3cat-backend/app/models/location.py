@@ -8,6 +8,9 @@ class RateTypeEnum(str, enum.Enum):
     mid = "mid"
     max = "max"
 
+# Stores' wall-clock time zone unless a location sets its own (Snackpass exports local times)
+DEFAULT_LOCATION_TIMEZONE = "America/Los_Angeles"
+
 class Location(Base):
     __tablename__ = "locations"
     
@@ -17,5 +20,6 @@ class Location(Base):
     rate_type = Column(Enum(RateTypeEnum), nullable=False, default="min") 
     sevenshift_location_id = Column(String, nullable=True)
     sevenshift_store_id = Column(String, nullable=True)
+    timezone = Column(String(64), nullable=False, default=DEFAULT_LOCATION_TIMEZONE, server_default=DEFAULT_LOCATION_TIMEZONE)
    
     # Add other columns if you need them
\ No newline at end of file
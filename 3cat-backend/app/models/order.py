@@ -1,18 +1,29 @@
 # models/order.py
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Text, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
 Base = declarative_base()
 
 class Order(Base):
+    """
+    Migrated PostgreSQL databases partition this table by month on ordered_at and then by location
+    (see order_partition_service), so the primary key and the dedup constraint include ordered_at and location.
+    """
     __tablename__ = "orders"
     
     id = Column(Integer, primary_key=True, index=True)
     
     # CSV columns (excluding "Details" as requested)
     order_number = Column(String(50), index=True)
-    ordered_at = Column(DateTime)
+    ordered_at = Column(DateTime, nullable=False)  # partition key
+    
+    # Derived from ordered_at (store wall-clock time) at ingest with the location's time zone, so
+    # analytics group on stored, indexed values instead of converting every row
+    ordered_at_utc = Column(DateTime(timezone=True))
+    local_date = Column(Date)
+    local_hour = Column(Integer)
+    local_dow = Column(Integer)  # Monday = 0, as datetime.weekday()
     status = Column(String(50))
     customer = Column(String(100))
     fulfillment = Column(String(50))
@@ -53,8 +64,46 @@ class Order(Base):
     employee = Column(String(100))
     
     # Additional column for location
-    location = Column(Integer, index=True)
+    location = Column(Integer, nullable=False)  # partition key
+    
+    # md5 of location, order number, ordered_at and money fields (OrderService.compute_dedup_keys);
+    # unique together with the partition keys, which the hash already covers, so it is enforced per partition
+    dedup_key = Column(String(32), index=True)
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow) 
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        UniqueConstraint("dedup_key", "ordered_at", "location", name="uq_orders_dedup_key_ordered_at_location"),
+        # Every dashboard query is a location + ordered_at range; sales totals come from the index alone
+        Index(
+            "ix_orders_location_ordered_at", "location", "ordered_at",
+            postgresql_include=["net_sales", "gross_sales", "total", "tax", "tips"],
+        ),
+        Index("ix_orders_location_local_date_hour", "location", "local_date", "local_hour"),
+    )
+
+class OrderItem(Base):
+    """
+    One line of an order's Items (or Promotions) text, parsed at ingestion (see order_item_service).
+    Location and ordered_at are copied from the order so item analytics are index range scans.
+    """
+    __tablename__ = "order_items"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    order_dedup_key = Column(String(32), index=True)  # Order.dedup_key
+    location = Column(Integer, nullable=False)
+    ordered_at = Column(DateTime, nullable=False)
+    
+    kind = Column(String(20), nullable=False, default="item")  # 'item' | 'promotion'
+    position = Column(Integer, nullable=False, default=0)  # line index within the order's text
+    item_name = Column(String(200), nullable=False)
+    quantity = Column(Integer, nullable=False, default=1)
+    modifiers = Column(Text)
+    price = Column(Float)  # line price as exported, if present
+    
+    __table_args__ = (
+        Index("ix_order_items_location_item_ordered_at", "location", "item_name", "ordered_at"),
+        Index("ix_order_items_location_ordered_at", "location", "ordered_at"),
+    )
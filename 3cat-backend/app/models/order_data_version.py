@@ -0,0 +1,15 @@
+# models/order_data_version.py
+from sqlalchemy import Column, Integer, DateTime, func
+
+from app.database import Base
+
+class OrderDataVersion(Base):
+    """
+    Per-location counter bumped whenever a location's orders change (import, overwrite, delete), in the
+    same transaction. Cached order aggregates remember the version they were computed at.
+    """
+    __tablename__ = "order_data_versions"
+    
+    location = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,43 @@
+# models/order_import_job.py
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON, func
+
+from app.database import Base
+
+class OrderImportJob(Base):
+    """
+    One background Snackpass CSV import (see import_orders_csv_task).
+    The upload endpoint stores the file and creates the row as 'queued'; the Celery worker
+    moves it to 'running' and updates the counters after every chunk, then 'succeeded',
+    'rejected' (failed preflight checks) or 'failed'.
+    """
+    __tablename__ = "order_import_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    location_id = Column(Integer, nullable=False, index=True)
+    status = Column(String, nullable=False, default="queued")
+
+    # Uploaded file: an Azure blob when Azure is configured, otherwise a path under ORDER_IMPORT_DIR
+    filename = Column(String, nullable=False)
+    storage = Column(String, nullable=False)  # 'azure' | 'local'
+    container_name = Column(String, nullable=True)
+    file_path = Column(String, nullable=False)  # blob name or local path
+
+    # Upload options
+    period_start_date = Column(String, nullable=True)
+    period_end_date = Column(String, nullable=True)
+    validate_dates = Column(Boolean, nullable=False, default=True)
+    overwrite_existing = Column(Boolean, nullable=False, default=False)
+    append_mode = Column(Boolean, nullable=False, default=False)
+
+    # Progress
+    rows_processed = Column(Integer, nullable=False, default=0)
+    orders_created = Column(Integer, nullable=False, default=0)
+    orders_skipped = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, nullable=True)  # first row-level errors, capped
+    message = Column(Text, nullable=True)
+    result = Column(JSON, nullable=True)  # final payload, same shape as /orders/upload-csv
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
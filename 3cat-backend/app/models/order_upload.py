@@ -0,0 +1,45 @@
+# models/order_upload.py
+from sqlalchemy import Column, Integer, String, Date, DateTime, JSON, Index, func
+
+from app.database import Base
+
+class OrderUpload(Base):
+    """
+    Manifest of imported Snackpass CSVs, keyed by location, the SHA-256 of the file content and the
+    period the file was imported for (none = the whole file). Re-uploading an identical file for a
+    period an earlier import covered short-circuits on this table instead of re-importing; rows are
+    removed when orders in their imported date span are deleted, so a cleared period can be re-imported.
+    """
+    __tablename__ = "order_uploads"
+
+    id = Column(Integer, primary_key=True, index=True)
+    location_id = Column(Integer, nullable=False)
+    content_sha256 = Column(String(64), nullable=False)
+
+    filename = Column(String, nullable=True)
+    file_size = Column(Integer, nullable=True)
+
+    # What the file contained and what the import did
+    rows = Column(Integer, nullable=False, default=0)
+    orders_created = Column(Integer, nullable=False, default=0)
+    orders_skipped = Column(Integer, nullable=False, default=0)
+    # Local dates of the first and last order the import kept (rows outside the period are not imported)
+    imported_min_date = Column(Date, nullable=True)
+    imported_max_date = Column(Date, nullable=True)
+    period_start_date = Column(String, nullable=True)
+    period_end_date = Column(String, nullable=True)
+
+    # Azure archive copy, when one was made
+    blob_container = Column(String, nullable=True)
+    blob_path = Column(String, nullable=True)
+
+    result = Column(JSON, nullable=True)  # processing result (errors capped)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            "uq_order_uploads_location_sha256_period", "location_id", "content_sha256",
+            func.coalesce(period_start_date, ""), func.coalesce(period_end_date, ""), unique=True
+        ),
+        Index("ix_order_uploads_location_dates", "location_id", "imported_min_date", "imported_max_date"),
+    )
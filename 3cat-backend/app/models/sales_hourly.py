@@ -0,0 +1,43 @@
+# models/sales_hourly.py
+from sqlalchemy import Column, Integer, Float, Date, DateTime, UniqueConstraint, func
+
+from app.database import Base
+
+class SalesHourly(Base):
+    """
+    Sales rollup: one row per location, local date and hour with the order count and money sums.
+    Snackpass ordered_at is store wall-clock time, so local_date / hour are its date and hour.
+    Kept in step with orders by the import and delete paths (see sales_rollup_service).
+    """
+    __tablename__ = "sales_hourly"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    location = Column(Integer, nullable=False)
+    local_date = Column(Date, nullable=False)
+    hour = Column(Integer, nullable=False)  # 0-23, store wall clock
+    
+    order_count = Column(Integer, nullable=False, default=0)
+    
+    # Sums of the Order columns of the same name
+    total = Column(Float, nullable=False, default=0.0)
+    subtotal = Column(Float, nullable=False, default=0.0)
+    gross_sales = Column(Float, nullable=False, default=0.0)
+    net_sales = Column(Float, nullable=False, default=0.0)
+    tax = Column(Float, nullable=False, default=0.0)
+    estimated_third_party_taxes = Column(Float, nullable=False, default=0.0)
+    tips = Column(Float, nullable=False, default=0.0)
+    delivery_charge = Column(Float, nullable=False, default=0.0)
+    custom_discounts = Column(Float, nullable=False, default=0.0)
+    refunded_amount = Column(Float, nullable=False, default=0.0)
+    cash = Column(Float, nullable=False, default=0.0)
+    gift_card_redemption = Column(Float, nullable=False, default=0.0)
+    store_credit_redemption = Column(Float, nullable=False, default=0.0)
+    processing_fee = Column(Float, nullable=False, default=0.0)
+    snackpass_fee = Column(Float, nullable=False, default=0.0)
+    
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # Also serves (location, date range) reads
+        UniqueConstraint("location", "local_date", "hour", name="uq_sales_hourly_location_date_hour"),
+    )
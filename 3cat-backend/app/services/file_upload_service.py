@@ -1,5 +1,7 @@
 # services/file_upload_service.py
+import asyncio
 import os
+from typing import Union, BinaryIO
 import azure.storage.blob as azure_blob
 from datetime import datetime
 from app.config import logger
@@ -19,14 +21,18 @@ class FileUploadService:
     
     @staticmethod
     async def upload_file_to_blob(
-        file_content: bytes,
+        file_content: Union[bytes, BinaryIO],
         filename: str,
         container_name: str,
         location_id: int,
-        db: Session
+        db: Session,
+        location_code: str = None
     ) -> dict:
         """
         Upload a file to Azure blob storage
+        file_content may be bytes or an open binary file, which the SDK streams in blocks
+        The blocking SDK calls run in a worker thread, so other coroutines (e.g. CSV parsing) can overlap
+        Pass location_code to skip the location lookup (and leave `db` free for concurrent use)
         """
         try:
             # Azure Blob Storage configuration
@@ -35,29 +41,37 @@ class FileUploadService:
                 logger.error("Azure Storage connection string not configured")
                 raise HTTPException(status_code=500, detail="Azure Storage not configured")
             
-            # Create blob service client
-            blob_service_client = azure_blob.BlobServiceClient.from_connection_string(connection_string)
-            
-            # Get container client
-            container_client = blob_service_client.get_container_client(container_name)
-            
-            # Create container if it doesn't exist
-            try:
-                container_client.get_container_properties()
-            except Exception:
-                container_client.create_container()
-                logger.info(f"Created container: {container_name}")
-            
             # Create location-based folder structure using location code
-            location_code = FileUploadService.get_location_code(location_id, db)
+            if location_code is None:
+                location_code = FileUploadService.get_location_code(location_id, db)
             location_folder = f"{location_code}/"
             full_blob_name = f"{location_folder}{filename}"
             
-            # Get blob client
-            blob_client = container_client.get_blob_client(full_blob_name)
+            if isinstance(file_content, bytes):
+                file_size = len(file_content)
+            else:
+                file_size = os.fstat(file_content.fileno()).st_size
+                file_content.seek(0)
             
-            # Upload file to blob storage
-            blob_client.upload_blob(file_content, overwrite=True)
+            def upload() -> None:
+                # Create blob service client
+                blob_service_client = azure_blob.BlobServiceClient.from_connection_string(connection_string)
+                
+                # Get container client
+                container_client = blob_service_client.get_container_client(container_name)
+                
+                # Create container if it doesn't exist
+                try:
+                    container_client.get_container_properties()
+                except Exception:
+                    container_client.create_container()
+                    logger.info(f"Created container: {container_name}")
+                
+                # Upload file to blob storage
+                blob_client = container_client.get_blob_client(full_blob_name)
+                blob_client.upload_blob(file_content, overwrite=True)
+            
+            await asyncio.to_thread(upload)
             
             logger.info(f"Successfully uploaded {filename} to {container_name}/{full_blob_name}")
             
@@ -67,10 +81,40 @@ class FileUploadService:
                 "container": container_name,
                 "blob_name": full_blob_name,
                 "location_id": location_id,
-                "file_size": len(file_content),
+                "file_size": file_size,
                 "upload_time": datetime.utcnow().isoformat()
             }
             
         except Exception as e:
             logger.error(f"Error uploading file to Azure: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}") 
\ No newline at end of file
+            raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}") 
+    
+    @staticmethod
+    def download_blob_to_file(container_name: str, blob_name: str, file_path: str) -> None:
+        """
+        Stream a blob from Azure blob storage into a local file (used by background jobs)
+        """
+        connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
+        if not connection_string:
+            raise ValueError("Azure Storage not configured")
+        
+        blob_service_client = azure_blob.BlobServiceClient.from_connection_string(connection_string)
+        blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+        with open(file_path, "wb") as out:
+            blob_client.download_blob().readinto(out)
+        
+        logger.info(f"Downloaded {container_name}/{blob_name} to {file_path}")
+    
+    @staticmethod
+    def delete_blob(container_name: str, blob_name: str) -> None:
+        """
+        Delete a blob from Azure blob storage (e.g. a stored import file that will never be processed)
+        """
+        connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
+        if not connection_string:
+            raise ValueError("Azure Storage not configured")
+        
+        blob_service_client = azure_blob.BlobServiceClient.from_connection_string(connection_string)
+        blob_service_client.get_blob_client(container=container_name, blob=blob_name).delete_blob()
+        
+        logger.info(f"Deleted {container_name}/{blob_name}")
@@ -0,0 +1,212 @@
+# services/labor_cube_service.py
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.config import settings, logger
+from app.models.labor_hourly import LaborHourly
+from app.models.location import Location
+from app.services.time_punch_service import (
+    DAYS_MAP,
+    PACIFIC_TZ,
+    aggregate_shifts_labor,
+    build_labor_heatmap,
+    get_all_time_punches,
+    get_shifts_for_week,
+)
+
+# Weeks rebuilt by each scheduled refresh: the current week and the one before it
+CUBE_REFRESH_WEEKS = 2
+
+COST_FIELDS = ("regular_cost", "overtime_cost", "double_ot_cost", "total_cost")
+
+
+def build_labor_cube_rows(
+    shifts: List[Dict],
+    punches: List[Dict],
+    week_start: date,
+    sevenshift_location_id: int
+) -> List[Dict[str, Any]]:
+    """
+    Turn a week of 7shifts shifts (scheduled) and time punches (actual) into labor_hourly rows.
+    Costs come from the scheduled shifts over the full day (hours 0-23); empty hours are skipped.
+    """
+    week_start_dt = datetime.combine(week_start, datetime.min.time())
+
+    summary = aggregate_shifts_labor(shifts, business_hour_start=0, business_hour_end=23, hourly_start=0, hourly_end=23)
+    scheduled = build_labor_heatmap(shifts, week_start_dt, bin_minutes=60, business_hour_start=0, business_hour_end=24)
+
+    punch_intervals = [
+        {"id": p.get("id"), "start": p["clocked_in"], "end": p["clocked_out"]}
+        for p in punches
+        if p.get("clocked_in") and p.get("clocked_out")
+    ]
+    actual = build_labor_heatmap(punch_intervals, week_start_dt, bin_minutes=60, business_hour_start=0, business_hour_end=24)
+
+    rows = []
+    for day_offset in range(7):
+        local_date = week_start + timedelta(days=day_offset)
+        day_name = DAYS_MAP[local_date.weekday()]
+        for hour in range(24):
+            costs = summary["hourly_overtime"][day_name][hour]
+            row = {
+                "sevenshift_location_id": sevenshift_location_id,
+                "local_date": local_date,
+                "hour": hour,
+                "scheduled_hours": scheduled["days"][day_name]["labor_hours"][hour],
+                "actual_hours": actual["days"][day_name]["labor_hours"][hour],
+                "labor_cost": summary["hourly"][day_name][hour],
+                **{field: costs[field] for field in COST_FIELDS},
+            }
+            if row["scheduled_hours"] or row["actual_hours"] or row["labor_cost"] or row["total_cost"]:
+                rows.append(row)
+
+    return rows
+
+
+async def refresh_labor_cube_week(week_start: date, sevenshift_location_id: int, db: Session) -> int:
+    """
+    Rebuild labor_hourly for one location and week (week_start .. week_start + 6 days).
+    Shifts and time punches are fetched concurrently; the old rows are replaced in one transaction.
+    Returns the number of rows written.
+    """
+    week_end = week_start + timedelta(days=6)
+
+    shifts, punches = await asyncio.gather(
+        get_shifts_for_week(datetime.combine(week_start, datetime.min.time()), sevenshift_location_id),
+        asyncio.to_thread(
+            get_all_time_punches,
+            week_start.isoformat(),
+            week_end.isoformat(),
+            sevenshift_location_id
+        ),
+    )
+
+    rows = build_labor_cube_rows(shifts, punches, week_start, sevenshift_location_id)
+
+    try:
+        db.query(LaborHourly).filter(
+            LaborHourly.sevenshift_location_id == sevenshift_location_id,
+            LaborHourly.local_date >= week_start,
+            LaborHourly.local_date <= week_end
+        ).delete(synchronize_session=False)
+        if rows:
+            db.execute(insert(LaborHourly), rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    logger.info(f"Refreshed labor cube for 7shifts location {sevenshift_location_id}, week of {week_start}: {len(rows)} rows")
+    return len(rows)
+
+
+async def refresh_labor_cube(db: Session, weeks: int = CUBE_REFRESH_WEEKS) -> Dict[str, Any]:
+    """
+    Incrementally refresh the labor cube for every location mapped to 7shifts:
+    the current week and the (weeks - 1) weeks before it. Use a larger `weeks` to backfill.
+    """
+    today = datetime.now(PACIFIC_TZ).date()
+    current_week_start = today - timedelta(days=today.weekday())
+    week_starts = [current_week_start - timedelta(weeks=offset) for offset in range(weeks)]
+
+    locations = db.query(Location).filter(Location.sevenshift_location_id.isnot(None)).all()
+
+    refreshed = 0
+    errors = []
+    for location in locations:
+        try:
+            sevenshift_location_id = int(location.sevenshift_location_id)
+        except (TypeError, ValueError):
+            logger.warning(f"Skipping location {location.location_id}: invalid 7shifts location id {location.sevenshift_location_id!r}")
+            continue
+
+        for week_start in week_starts:
+            try:
+                await refresh_labor_cube_week(week_start, sevenshift_location_id, db)
+                refreshed += 1
+            except Exception as e:
+                error_msg = f"Error refreshing labor cube for 7shifts location {sevenshift_location_id}, week of {week_start}: {str(e)}"
+                logger.error(error_msg)
+                errors.append(error_msg)
+
+    return {
+        "weeks_refreshed": refreshed,
+        "week_starts": [week_start.isoformat() for week_start in week_starts],
+        "errors": errors
+    }
+
+
+def get_labor_cube_weeks(
+    db: Session,
+    week_starts: List[date],
+    location_id: Optional[int] = None,
+    business_hour_start: int = 7,
+    business_hour_end: int = 24,
+    hourly_start: int = 7,
+    hourly_end: int = 21,
+) -> List[Dict]:
+    """
+    Read aggregated labor for several weeks from the labor_hourly cube with a single query.
+    Each week has the same shape (and default hour windows) as aggregate_shifts_labor():
+    {"daily": ..., "hourly": ..., "hourly_overtime": ..., "hourly_hours": ...}
+    Daily hours are the hours worked on each calendar date, so overnight shifts are split
+    across days (the live path attributes a whole shift to its start day).
+    """
+    if location_id is None:
+        if not settings.SEVEN_SHIFTS_LOCATION_ID:
+            raise ValueError("location_id is required when reading from the labor cube")
+        location_id = int(settings.SEVEN_SHIFTS_LOCATION_ID)
+
+    rows = db.query(LaborHourly).filter(
+        LaborHourly.sevenshift_location_id == location_id,
+        LaborHourly.local_date >= min(week_starts),
+        LaborHourly.local_date <= max(week_starts) + timedelta(days=6)
+    ).all()
+    rows_by_date = {}
+    for row in rows:
+        rows_by_date.setdefault(row.local_date, []).append(row)
+
+    summaries = []
+    for week_start in week_starts:
+        hourly_labor_data = {}
+        hourly_overtime_data = {}
+        hourly_hours_data = {}
+        daily_hours = {}
+        for day in DAYS_MAP.values():
+            hourly_labor_data[day] = {hour: 0.0 for hour in range(hourly_start, hourly_end + 1)}
+            hourly_overtime_data[day] = {
+                hour: {field: 0.0 for field in COST_FIELDS}
+                for hour in range(business_hour_start, business_hour_end + 1)
+            }
+            hourly_hours_data[day] = {hour: 0.0 for hour in range(business_hour_start, business_hour_end + 1)}
+            daily_hours[day] = 0.0
+
+        for day_offset in range(7):
+            local_date = week_start + timedelta(days=day_offset)
+            day_name = DAYS_MAP[local_date.weekday()]
+            for row in rows_by_date.get(local_date, []):
+                daily_hours[day_name] += row.scheduled_hours or 0.0
+                if hourly_start <= row.hour <= hourly_end:
+                    hourly_labor_data[day_name][row.hour] = row.labor_cost or 0.0
+                if business_hour_start <= row.hour <= business_hour_end:
+                    for field in COST_FIELDS:
+                        hourly_overtime_data[day_name][row.hour][field] = getattr(row, field) or 0.0
+                    hourly_hours_data[day_name][row.hour] = row.scheduled_hours or 0.0
+
+        summaries.append({
+            "daily": {
+                day: {
+                    "cost": round(sum(hourly_labor_data[day].values()), 2),
+                    "hours": round(daily_hours[day], 1)
+                }
+                for day in DAYS_MAP.values()
+            },
+            "hourly": hourly_labor_data,
+            "hourly_overtime": hourly_overtime_data,
+            "hourly_hours": hourly_hours_data,
+        })
+
+    return summaries
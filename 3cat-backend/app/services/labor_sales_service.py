@@ -0,0 +1,95 @@
+# services/labor_sales_service.py
+from datetime import date, timedelta
+from typing import Dict, Any, Optional
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.location import Location
+from app.services.sales_forecast_service import get_hourly_net_sales_matrix
+from app.services.time_punch_service import DAYS_MAP
+
+
+def get_sevenshift_location_id_for_location(db: Session, location_id: int) -> Optional[int]:
+    """7shifts location ID of a 3Cat location (labor is keyed by it, sales by the 3Cat ID), None if unmapped"""
+    sevenshift_location_id = db.query(Location.sevenshift_location_id).filter(
+        Location.location_id == location_id
+    ).scalar()
+    return int(sevenshift_location_id) if sevenshift_location_id else None
+
+
+def get_week_hourly_net_sales(db: Session, location_id: int, week_start: date) -> np.ndarray:
+    """(day, hour) net sales for the 7 days from week_start, from the sales_hourly rollup"""
+    return get_hourly_net_sales_matrix(db, location_id, week_start, 1)[0]
+
+
+def labor_metrics(net_sales: float, labor_cost: float, labor_hours: float, target_labor_percent: float) -> Dict[str, Any]:
+    """Labor %, sales per labor hour and variance to the target labor cost for one cell, day or week"""
+    target_cost = net_sales * target_labor_percent / 100
+    labor_percent = labor_cost / net_sales * 100 if net_sales > 0 else None
+    return {
+        "net_sales": round(net_sales, 2),
+        "labor_cost": round(labor_cost, 2),
+        "labor_hours": round(labor_hours, 2),
+        "labor_percent": round(labor_percent, 2) if labor_percent is not None else None,
+        "sales_per_labor_hour": round(net_sales / labor_hours, 2) if labor_hours > 0 else None,
+        "target_labor_cost": round(target_cost, 2),
+        "variance_to_target": round(labor_cost - target_cost, 2),
+        "variance_percent": round(labor_percent - target_labor_percent, 2) if labor_percent is not None else None,
+    }
+
+
+def join_labor_and_sales(
+    labor: Dict[str, Any],
+    sales: np.ndarray,
+    week_start: date,
+    target_labor_percent: float = 25.0,
+    payroll_tax_multiplier: float = 1.0,
+) -> Dict[str, Any]:
+    """
+    Align a week of labor (aggregate_shifts_labor / get_labor_cube_weeks shape: "hourly_overtime" costs
+    and "hourly_hours", keyed by day name and hour) with a (day, hour) net sales array starting at
+    week_start, and compute labor_metrics per (day, hour) cell, per day and for the week.
+    Labor cost is the total including OT premiums, times payroll_tax_multiplier.
+    Only hours with sales or labor are listed.
+    """
+    labor_cost = np.zeros((7, 24))
+    labor_hours = np.zeros((7, 24))
+    day_names = [DAYS_MAP[(week_start + timedelta(days=day)).weekday()] for day in range(7)]
+    for day, day_name in enumerate(day_names):
+        for hour, costs in labor["hourly_overtime"].get(day_name, {}).items():
+            if hour < 24:
+                labor_cost[day, hour] = costs["total_cost"]
+        for hour, hours in labor["hourly_hours"].get(day_name, {}).items():
+            if hour < 24:
+                labor_hours[day, hour] = hours
+    labor_cost *= payroll_tax_multiplier
+
+    active = (sales != 0) | (labor_cost != 0) | (labor_hours != 0)
+    days = []
+    for day, day_name in enumerate(day_names):
+        days.append({
+            "date": (week_start + timedelta(days=day)).isoformat(),
+            "day": day_name,
+            **labor_metrics(
+                float(sales[day].sum()), float(labor_cost[day].sum()), float(labor_hours[day].sum()), target_labor_percent
+            ),
+            "hours": [
+                {
+                    "hour": hour,
+                    **labor_metrics(
+                        float(sales[day, hour]), float(labor_cost[day, hour]), float(labor_hours[day, hour]),
+                        target_labor_percent
+                    ),
+                }
+                for hour in np.flatnonzero(active[day]).tolist()
+            ],
+        })
+
+    return {
+        "target_labor_percent": target_labor_percent,
+        "payroll_tax_multiplier": payroll_tax_multiplier,
+        "days": days,
+        "week": labor_metrics(
+            float(sales.sum()), float(labor_cost.sum()), float(labor_hours.sum()), target_labor_percent
+        ),
+    }
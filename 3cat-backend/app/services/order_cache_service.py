@@ -0,0 +1,72 @@
+# services/order_cache_service.py
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, Dict, Any, Optional
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.order_data_version import OrderDataVersion
+
+# (location, start_date, end_date) summaries kept per process, least recently used evicted first
+ORDER_SUMMARY_CACHE_SIZE = 1024
+
+_order_summary_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_order_summary_cache_lock = threading.Lock()
+
+
+def bump_order_data_version(db: Session, location_id: int) -> None:
+    """Mark a location's orders as changed, in the caller's transaction (so the bump commits with the change)"""
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    statement = insert(OrderDataVersion).values(location=location_id, version=1)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[OrderDataVersion.location],
+        set_={"version": OrderDataVersion.version + 1, "updated_at": func.now()},
+    ))
+
+
+def lock_order_data_version(db: Session, location_id: int) -> None:
+    """
+    Row-lock a location's order_data_versions row (creating it if missing) until the caller's transaction
+    ends, serializing writers that rebuild the location's derived data (e.g. the sales_hourly rollup)
+    """
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    db.execute(insert(OrderDataVersion).values(location=location_id, version=0).on_conflict_do_nothing(
+        index_elements=[OrderDataVersion.location]
+    ))
+    db.query(OrderDataVersion.location).filter(OrderDataVersion.location == location_id).with_for_update().one()
+
+
+def get_order_data_version(db: Session, location_id: int) -> int:
+    version = db.query(OrderDataVersion.version).filter(OrderDataVersion.location == location_id).scalar()
+    return version or 0
+
+
+def cached_order_summary(
+    db: Session,
+    location_id: int,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    compute: Callable[[], Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Summary for (location, start, end) from the in-process cache while the location's data version is
+    unchanged, else compute() and cache it. The version is read before computing, so a summary that
+    races an import is cached under the older version and recomputed on the next call.
+    """
+    key = (location_id, start_date, end_date)
+    version = get_order_data_version(db, location_id)
+    with _order_summary_cache_lock:
+        cached = _order_summary_cache.get(key)
+        if cached and cached[0] == version:
+            _order_summary_cache.move_to_end(key)
+            return dict(cached[1])
+
+    summary = compute()
+    with _order_summary_cache_lock:
+        _order_summary_cache[key] = (version, summary)
+        _order_summary_cache.move_to_end(key)
+        while len(_order_summary_cache) > ORDER_SUMMARY_CACHE_SIZE:
+            _order_summary_cache.popitem(last=False)
+    return dict(summary)
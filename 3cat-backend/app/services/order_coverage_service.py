@@ -0,0 +1,101 @@
+# services/order_coverage_service.py
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.order import Order
+
+# Per-day upload proposals:
+#   append    - no orders stored for the day yet; load the file's rows
+#   overwrite - the file has more orders than stored (stored day is partial); replace the day
+#   skip      - already loaded (same count), the file has no rows for the day, or the file has fewer
+#               orders than stored (the file looks partial; keep what is stored)
+COVERAGE_ACTIONS = ("append", "overwrite", "skip")
+
+
+def get_order_coverage(db: Session, location_id: int, start_date: date, end_date: date) -> Dict[str, int]:
+    """
+    {"YYYY-MM-DD": order count} for a location's local dates [start_date, end_date] (inclusive) that have
+    orders, from one grouped COUNT on local_date (the ordered_at bounds prune partitions)
+    """
+    rows = (
+        db.query(Order.local_date, func.count())
+        .filter(Order.location == location_id)
+        .filter(Order.ordered_at >= datetime.combine(start_date, datetime.min.time()))
+        .filter(Order.ordered_at < datetime.combine(end_date + timedelta(days=1), datetime.min.time()))
+        .group_by(Order.local_date)
+        .order_by(Order.local_date)
+        .all()
+    )
+    return {local_date.isoformat(): count for local_date, count in rows if local_date is not None}
+
+
+def count_csv_orders_by_day(csv_content, location_id: int, timezone: str) -> Dict[str, int]:
+    """
+    {"YYYY-MM-DD": orders} in a Snackpass CSV as the import would store them for the location: rows go
+    through the import's transform (local_date in `timezone`) and are counted once per distinct dedup key,
+    so duplicate rows, which the import skips, are not counted. Read chunk by chunk.
+    """
+    # Import here to avoid circular imports (order_service uses this module)
+    from app.services.order_service import OrderService
+
+    counts: Counter = Counter()
+    seen_keys = set()
+    for df in OrderService.iter_csv_chunks(csv_content):
+        if 'Ordered At' not in df.columns or 'Order #' not in df.columns:
+            raise ValueError("CSV file does not contain 'Order #' and 'Ordered At' columns")
+        orders = OrderService.transform_orders_frame(df, location_id, timezone=timezone)["orders"]
+        if orders.empty:
+            continue
+        orders = orders.assign(dedup_key=OrderService.compute_dedup_keys(orders)).drop_duplicates('dedup_key')
+        orders = orders[~orders['dedup_key'].isin(seen_keys)]
+        seen_keys.update(orders['dedup_key'])
+        counts.update(orders['local_date'].map(date.isoformat).value_counts().to_dict())
+    return dict(sorted(counts.items()))
+
+
+def propose_day_action(existing: int, incoming: int) -> str:
+    """COVERAGE_ACTIONS entry for a day with `existing` stored and `incoming` CSV orders"""
+    if incoming == 0:
+        return "skip"
+    if existing == 0:
+        return "append"
+    if incoming > existing:
+        return "overwrite"
+    return "skip"
+
+
+def plan_upload_by_day(
+    coverage: Dict[str, int],
+    csv_counts: Dict[str, int],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Dict[str, Any]:
+    """
+    Compare stored coverage with a CSV's per-day counts over every day of [start_date, end_date]
+    (CSV days outside it are not imported, so not planned), or the days either side has without a
+    range, and propose an action per day.
+    Returns {"days": [{"date", "existing", "incoming", "action"}], "summary": {action: days}}
+    """
+    if start_date and end_date:
+        days = {(start_date + timedelta(days=offset)).isoformat() for offset in range((end_date - start_date).days + 1)}
+    else:
+        days = set(coverage) | set(csv_counts)
+
+    plan = []
+    for day in sorted(days):
+        existing = coverage.get(day, 0)
+        incoming = csv_counts.get(day, 0)
+        plan.append({
+            "date": day,
+            "existing": existing,
+            "incoming": incoming,
+            "action": propose_day_action(existing, incoming),
+        })
+
+    summary = {action: 0 for action in COVERAGE_ACTIONS}
+    for day in plan:
+        summary[day["action"]] += 1
+    return {"days": plan, "summary": summary}
@@ -0,0 +1,140 @@
+# services/order_export_service.py
+import csv
+import io
+import zlib
+from datetime import datetime
+from typing import Iterator, List, Optional, Sequence
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Date, DateTime, Float, Integer, select
+from sqlalchemy.orm import Session
+
+from app.models.order import Order
+
+# Order columns that can be exported, in table order; dedup_key is an internal hash
+EXPORT_COLUMNS = [column.name for column in Order.__table__.columns if column.name != "dedup_key"]
+
+# Rows fetched per server-side cursor batch; each batch is one Parquet row group
+EXPORT_BATCH_SIZE = 10000
+
+def resolve_export_columns(columns: Optional[Sequence[str]]) -> List[str]:
+    """Requested columns in the given order (all EXPORT_COLUMNS if none); ValueError on unknown names"""
+    if not columns:
+        return list(EXPORT_COLUMNS)
+    unknown = [column for column in columns if column not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown export columns: {unknown}")
+    return list(dict.fromkeys(columns))
+
+
+def iter_order_row_batches(
+    db: Session,
+    location_ids: Sequence[int],
+    start_datetime: datetime,
+    end_datetime: datetime,
+    columns: Sequence[str],
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[List[tuple]]:
+    """
+    Row tuples of `columns` for the locations' orders in [start_datetime, end_datetime), ordered by
+    location, ordered_at and id, batch_size rows at a time through a server-side cursor (yield_per)
+    """
+    query = (
+        select(*[Order.__table__.c[column] for column in columns])
+        .where(Order.location.in_(location_ids))
+        .where(Order.ordered_at >= start_datetime, Order.ordered_at < end_datetime)
+        .order_by(Order.location, Order.ordered_at, Order.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for batch in db.execute(query).partitions():
+        yield [tuple(row) for row in batch]
+
+
+def gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Gzip a byte stream incrementally (one compressor, output flushed as it is produced)"""
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def iter_csv_export(batches: Iterator[List[tuple]], columns: Sequence[str]) -> Iterator[bytes]:
+    """Header, then one encoded CSV chunk per row batch"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue().encode()
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back to the caller instead of keeping them"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def parquet_schema(columns: Sequence[str]):
+    """pyarrow schema for Order columns"""
+    fields = []
+    for column in columns:
+        column_type = Order.__table__.c[column].type
+        if isinstance(column_type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column_type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(column_type, DateTime):
+            arrow_type = pa.timestamp("us", tz="UTC") if column_type.timezone else pa.timestamp("us")
+        elif isinstance(column_type, Date):
+            arrow_type = pa.date32()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column, arrow_type))
+    return pa.schema(fields)
+
+
+def iter_parquet_export(
+    batches: Iterator[List[tuple]],
+    columns: Sequence[str],
+    compression: str = "snappy",
+) -> Iterator[bytes]:
+    """
+    Parquet file written one row group per row batch; bytes are yielded as each row group is
+    written, so only one batch is held in memory. `compression` is the Parquet column codec.
+    """
+    schema = parquet_schema(columns)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression=compression)
+    try:
+        for batch in batches:
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(zip(*batch), schema)],
+                schema=schema
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
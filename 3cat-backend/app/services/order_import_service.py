@@ -0,0 +1,209 @@
+# services/order_import_service.py
+import os
+import tempfile
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import Session
+
+from app.config import logger, settings
+from app.models.order_import_job import OrderImportJob
+from app.services.order_service import OrderService
+from app.services.file_upload_service import FileUploadService
+from app.services.order_upload_service import file_sha256, record_upload
+
+# Where uploads are kept for the worker when Azure is not configured (dev: web and worker share a disk)
+ORDER_IMPORT_DIR = os.getenv("ORDER_IMPORT_DIR", os.path.join(tempfile.gettempdir(), "order_imports"))
+
+# Row-level errors stored on the job row; error_count keeps the full total
+MAX_STORED_ERRORS = 100
+
+TERMINAL_STATUSES = ("succeeded", "rejected", "failed")
+
+# Pooled connections one import can hold: its session plus the pinned staging connection of an overwrite
+CONNECTIONS_PER_IMPORT = 2
+
+# Files accepted by one POST /orders/upload-csv-batch request
+MAX_BATCH_IMPORT_FILES = 50
+
+
+def serialize_import_job(job: OrderImportJob) -> Dict[str, Any]:
+    """JSON-friendly view of an import job for the status and progress endpoints"""
+    return {
+        "job_id": job.id,
+        "location_id": job.location_id,
+        "status": job.status,
+        "filename": job.filename,
+        "period_start_date": job.period_start_date,
+        "period_end_date": job.period_end_date,
+        "overwrite_existing": job.overwrite_existing,
+        "append_mode": job.append_mode,
+        "rows_processed": job.rows_processed or 0,
+        "orders_created": job.orders_created or 0,
+        "orders_skipped": job.orders_skipped or 0,
+        "error_count": job.error_count or 0,
+        "errors": job.errors or [],
+        "message": job.message,
+        "result": job.result,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def create_import_job(
+    db: Session,
+    location_id: int,
+    filename: str,
+    storage: str,
+    file_path: str,
+    container_name: Optional[str] = None,
+    period_start_date: Optional[str] = None,
+    period_end_date: Optional[str] = None,
+    validate_dates: bool = True,
+    overwrite_existing: bool = False,
+    append_mode: bool = False,
+) -> OrderImportJob:
+    """Record a stored upload as a queued import job (committed, so the worker can pick it up)"""
+    job = OrderImportJob(
+        location_id=location_id,
+        status="queued",
+        filename=filename,
+        storage=storage,
+        container_name=container_name,
+        file_path=file_path,
+        period_start_date=period_start_date,
+        period_end_date=period_end_date,
+        validate_dates=validate_dates,
+        overwrite_existing=overwrite_existing,
+        append_mode=append_mode,
+        rows_processed=0,
+        orders_created=0,
+        orders_skipped=0,
+        error_count=0,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def discard_job_upload(job: OrderImportJob) -> None:
+    """Delete a job's stored upload (Azure blob or ORDER_IMPORT_DIR file); failures are logged, not raised"""
+    try:
+        if job.storage == "azure":
+            FileUploadService.delete_blob(job.container_name, job.file_path)
+        elif os.path.exists(job.file_path):
+            os.remove(job.file_path)
+    except Exception as e:
+        logger.warning(f"Could not delete stored upload {job.file_path} of import job {job.id}: {e}")
+
+
+def run_import_job(job_id: int, db: Session, status_db: Session) -> Dict[str, Any]:
+    """
+    Run a queued import job.
+    `db` carries the import itself (one transaction, committed at the end); `status_db` is a
+    separate session so job progress is committed after every chunk and visible to the
+    progress stream while the import transaction is still open.
+    """
+    job = status_db.get(OrderImportJob, job_id)
+    if not job:
+        raise ValueError(f"Import job {job_id} not found")
+
+    job.status = "running"
+    job.started_at = datetime.now(timezone.utc)
+    status_db.commit()
+
+    csv_path = job.file_path
+    downloaded = False
+    try:
+        if job.storage == "azure":
+            fd, csv_path = tempfile.mkstemp(suffix=".csv")
+            os.close(fd)
+            downloaded = True
+            FileUploadService.download_blob_to_file(job.container_name, job.file_path, csv_path)
+
+        rejection = OrderService.preflight_csv_import(
+            csv_content=csv_path,
+            location_id=job.location_id,
+            db=db,
+            period_start_date=job.period_start_date,
+            period_end_date=job.period_end_date,
+            validate_dates=job.validate_dates,
+            overwrite_existing=job.overwrite_existing,
+            append_mode=job.append_mode,
+        )
+        if not rejection:
+            def report_progress(progress: Dict[str, Any]) -> None:
+                job.rows_processed = progress["rows_processed"]
+                job.orders_created = progress["orders_created"]
+                job.orders_skipped = progress["orders_skipped"]
+                job.error_count = progress["error_count"]
+                status_db.commit()
+
+            processing_result = OrderService.process_csv_and_insert_orders(
+                csv_content=csv_path,
+                location_id=job.location_id,
+                db=db,
+                overwrite_existing=job.overwrite_existing,
+                start_date=job.period_start_date,
+                end_date=job.period_end_date,
+                append_mode=job.append_mode,
+                progress_callback=report_progress,
+            )
+
+        if rejection:
+            job.status = "rejected"
+            job.message = rejection["message"]
+            job.result = rejection
+        else:
+            job.status = "succeeded"
+            job.rows_processed = processing_result["total_rows_processed"]
+            job.orders_created = processing_result["orders_created"]
+            job.orders_skipped = processing_result["orders_skipped"]
+            job.error_count = len(processing_result["errors"])
+            job.errors = processing_result["errors"][:MAX_STORED_ERRORS]
+            job.message = f"Processed {processing_result['orders_created']} orders"
+            job.result = {**processing_result, "errors": job.errors}
+
+            record_upload(
+                db,
+                location_id=job.location_id,
+                content_sha256=file_sha256(csv_path),
+                processing_result=processing_result,
+                filename=job.filename,
+                file_size=os.path.getsize(csv_path),
+                period_start_date=job.period_start_date,
+                period_end_date=job.period_end_date,
+                blob_container=job.container_name if job.storage == "azure" else None,
+                blob_path=job.file_path if job.storage == "azure" else None,
+            )
+
+    except Exception as e:
+        logger.error(f"Order import job {job_id} failed: {str(e)}")
+        job.status = "failed"
+        job.message = str(e)
+
+    finally:
+        job.finished_at = datetime.now(timezone.utc)
+        status_db.commit()
+        if downloaded or job.storage == "local":
+            if os.path.exists(csv_path):
+                os.remove(csv_path)
+
+    logger.info(f"Order import job {job_id} {job.status}: {job.message}")
+    return serialize_import_job(job)
+
+
+def batch_import_concurrency(engine: Engine) -> int:
+    """
+    How many files a batch import may load at once: settings.ORDER_BATCH_IMPORT_CONCURRENCY if set, else
+    what the engine's connection pool can hold (pool size plus settings.DB_MAX_OVERFLOW) at
+    CONNECTIONS_PER_IMPORT each, keeping one connection back for other requests
+    """
+    if settings.ORDER_BATCH_IMPORT_CONCURRENCY > 0:
+        return settings.ORDER_BATCH_IMPORT_CONCURRENCY
+    pool = engine.pool
+    capacity = pool.size() + settings.DB_MAX_OVERFLOW if isinstance(pool, QueuePool) else 1
+    return max(1, (capacity - 1) // CONNECTIONS_PER_IMPORT)
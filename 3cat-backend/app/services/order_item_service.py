@@ -0,0 +1,293 @@
+# services/order_item_service.py
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+import pandas as pd
+from sqlalchemy import func, insert, exists
+from sqlalchemy.orm import Session
+
+from app.config import logger
+from app.models.order import Order, OrderItem
+
+# Columns of the order_items rows built from a prepared orders frame
+ITEM_LOAD_COLUMNS = [
+    'order_dedup_key', 'location', 'ordered_at', 'kind', 'position',
+    'item_name', 'quantity', 'modifiers', 'price'
+]
+
+# Distinct Items/Promotions strings memoized by parse_item_text (exports repeat the same orders a lot)
+ITEM_PARSE_CACHE_SIZE = 50000
+
+ITEM_NAME_MAX_LENGTH = 200
+
+VELOCITY_BUCKETS = ("hour", "day")
+
+_PRICE_RE = re.compile(r'\s*@?\s*(-)?\$\s*(-?[\d,]*\.?\d+)\s*$')
+_LEADING_QTY_RE = re.compile(r'^\s*(\d+)\s*[xX×]\s+')
+_TRAILING_QTY_RE = re.compile(r'\s+[xX×]\s*(\d+)\s*$')
+_CLOSING = {')': '(', ']': '['}
+
+
+def split_item_text(text: str) -> List[str]:
+    """
+    Split an Items/Promotions cell on commas, semicolons and newlines outside parentheses/brackets
+    (a comma between digits is a thousands separator, as in "$1,013.00")
+    """
+    segments = []
+    depth = 0
+    current = []
+    for index, char in enumerate(text):
+        if char in '([':
+            depth += 1
+        elif char in ')]' and depth:
+            depth -= 1
+        thousands = (
+            char == ',' and 0 < index < len(text) - 1
+            and text[index - 1].isdigit() and text[index + 1].isdigit()
+        )
+        if char in ',;\n' and depth == 0 and not thousands:
+            segments.append(''.join(current))
+            current = []
+        else:
+            current.append(char)
+    segments.append(''.join(current))
+    return [segment.strip() for segment in segments if segment.strip()]
+
+
+def _strip_trailing_group(segment: str) -> Tuple[str, Optional[str]]:
+    """Split "Name (Large, Less Ice)" into ("Name", "Large, Less Ice"); brackets may nest"""
+    if not segment or segment[-1] not in _CLOSING:
+        return segment, None
+    depth = 0
+    for index in range(len(segment) - 1, -1, -1):
+        char = segment[index]
+        if char in _CLOSING:
+            depth += 1
+        elif char in '([':
+            depth -= 1
+            if depth == 0:
+                if index == 0:
+                    return segment, None
+                return segment[:index].rstrip(), segment[index + 1:-1].strip()
+    return segment, None
+
+
+@lru_cache(maxsize=ITEM_PARSE_CACHE_SIZE)
+def parse_item_text(text: str) -> Tuple[Tuple[str, int, Optional[str], Optional[float]], ...]:
+    """
+    Parse a Snackpass Items/Promotions cell into (name, quantity, modifiers, price) lines.
+    Lines are separated by top-level commas/semicolons; each line may carry a quantity as
+    "2x Name" or "Name x2", modifiers in a trailing "(...)" and a trailing "$price", e.g.
+    "2x Brown Sugar Boba (Large, Less Ice) $13.00, Thai Tea".
+    """
+    lines = []
+    for segment in split_item_text(text):
+        rest = segment
+
+        price = None
+        match = _PRICE_RE.search(rest)
+        if match and match.start() > 0:
+            try:
+                price = float(match.group(2).replace(',', ''))
+                if match.group(1):
+                    price = -price
+                rest = rest[:match.start()]
+            except ValueError:
+                price = None
+
+        quantity = 1
+        match = _LEADING_QTY_RE.match(rest)
+        if match:
+            quantity = int(match.group(1))
+            rest = rest[match.end():]
+        match = _TRAILING_QTY_RE.search(rest)
+        if match:
+            quantity = int(match.group(1))
+            rest = rest[:match.start()]
+
+        rest, modifiers = _strip_trailing_group(rest.strip())
+        if modifiers is not None:
+            # "Name x2 (Large)"
+            match = _TRAILING_QTY_RE.search(rest)
+            if match:
+                quantity = int(match.group(1))
+                rest = rest[:match.start()]
+
+        name = rest.strip(" -:")[:ITEM_NAME_MAX_LENGTH]
+        if name:
+            lines.append((name, quantity, modifiers or None, price))
+    return tuple(lines)
+
+
+def build_order_items_frame(orders: pd.DataFrame) -> pd.DataFrame:
+    """
+    order_items rows (ITEM_LOAD_COLUMNS) for a prepared orders frame, i.e. one that already has
+    dedup_key (OrderService.prepare_orders_for_load). Items come first, then promotions.
+    """
+    records = []
+    for key, location, ordered_at, items, promotions in zip(
+        orders['dedup_key'], orders['location'], orders['ordered_at'], orders['items'], orders['promotions']
+    ):
+        position = 0
+        for kind, text in (("item", items), ("promotion", promotions)):
+            if not text:
+                continue
+            for name, quantity, modifiers, price in parse_item_text(text):
+                records.append((key, location, ordered_at, kind, position, name, quantity, modifiers, price))
+                position += 1
+
+    frame = pd.DataFrame.from_records(records, columns=ITEM_LOAD_COLUMNS)
+    frame['price'] = frame['price'].astype(float)
+    return frame
+
+
+def delete_order_items_in_range(db: Session, location_id: int, start_datetime: datetime, end_datetime: datetime) -> int:
+    """Delete a location's order_items in [start_datetime, end_datetime) alongside its orders (caller commits)"""
+    return db.query(OrderItem).filter(
+        OrderItem.location == location_id,
+        OrderItem.ordered_at >= start_datetime,
+        OrderItem.ordered_at < end_datetime
+    ).delete(synchronize_session=False)
+
+
+def get_item_sales(
+    db: Session,
+    location_id: int,
+    start_datetime: datetime,
+    end_datetime: datetime,
+    kind: str = "item",
+    limit: int = 50,
+) -> List[Dict[str, Any]]:
+    """Per-item totals for a location and range, best sellers first (one grouped query)"""
+    quantity = func.sum(OrderItem.quantity).label("quantity")
+    rows = (
+        db.query(
+            OrderItem.item_name,
+            quantity,
+            func.count(func.distinct(OrderItem.order_dedup_key)).label("orders"),
+            func.sum(OrderItem.price).label("revenue"),
+            func.min(OrderItem.ordered_at).label("first_sold_at"),
+            func.max(OrderItem.ordered_at).label("last_sold_at"),
+        )
+        .filter(OrderItem.location == location_id)
+        .filter(OrderItem.kind == kind)
+        .filter(OrderItem.ordered_at >= start_datetime)
+        .filter(OrderItem.ordered_at < end_datetime)
+        .group_by(OrderItem.item_name)
+        .order_by(quantity.desc(), OrderItem.item_name)
+        .limit(limit)
+        .all()
+    )
+    return [
+        {
+            "item_name": row.item_name,
+            "quantity": int(row.quantity or 0),
+            "orders": int(row.orders or 0),
+            "revenue": round(float(row.revenue or 0.0), 2),
+            "first_sold_at": row.first_sold_at.isoformat() if row.first_sold_at else None,
+            "last_sold_at": row.last_sold_at.isoformat() if row.last_sold_at else None,
+        }
+        for row in rows
+    ]
+
+
+def get_item_velocity(
+    db: Session,
+    location_id: int,
+    item_name: str,
+    start_datetime: datetime,
+    end_datetime: datetime,
+    bucket: str = "hour",
+) -> Dict[str, Any]:
+    """
+    Sales rate of one item: quantity per hour or day bucket, an hour-of-day profile and the
+    average per day. One grouped query over the (location, item_name, ordered_at) index;
+    the daily series and hour-of-day profile are rolled up from the hourly rows.
+    """
+    if bucket not in VELOCITY_BUCKETS:
+        raise ValueError(f"bucket must be one of {VELOCITY_BUCKETS}")
+
+    if db.get_bind().dialect.name == "postgresql":
+        hour_expr = func.date_trunc("hour", OrderItem.ordered_at)
+    else:
+        # SQLite (local dev) has no date_trunc; the hour comes back as text
+        hour_expr = func.strftime("%Y-%m-%d %H:00:00", OrderItem.ordered_at)
+    rows = (
+        db.query(
+            hour_expr.label("hour"),
+            func.sum(OrderItem.quantity).label("quantity"),
+            func.sum(OrderItem.price).label("revenue"),
+        )
+        .filter(OrderItem.location == location_id)
+        .filter(OrderItem.item_name == item_name)
+        .filter(OrderItem.ordered_at >= start_datetime)
+        .filter(OrderItem.ordered_at < end_datetime)
+        .group_by(hour_expr)
+        .order_by(hour_expr)
+        .all()
+    )
+
+    series: Dict[datetime, Dict[str, float]] = {}
+    hour_of_day: Dict[int, int] = defaultdict(int)
+    total_quantity = 0
+    for row in rows:
+        quantity = int(row.quantity or 0)
+        hour = row.hour if isinstance(row.hour, datetime) else datetime.fromisoformat(row.hour)
+        key = hour if bucket == "hour" else hour.replace(hour=0)
+        point = series.setdefault(key, {"quantity": 0, "revenue": 0.0})
+        point["quantity"] += quantity
+        point["revenue"] += float(row.revenue or 0.0)
+        hour_of_day[hour.hour] += quantity
+        total_quantity += quantity
+
+    days = max((end_datetime - start_datetime) / timedelta(days=1), 1e-9)
+    return {
+        "item_name": item_name,
+        "bucket": bucket,
+        "series": [
+            {"bucket": key.isoformat(), "quantity": point["quantity"], "revenue": round(point["revenue"], 2)}
+            for key, point in series.items()
+        ],
+        "hour_of_day": dict(sorted(hour_of_day.items())),
+        "peak_hour": max(hour_of_day, key=hour_of_day.get) if hour_of_day else None,
+        "total_quantity": total_quantity,
+        "days": round(days, 2),
+        "per_day": round(total_quantity / days, 2),
+    }
+
+
+def backfill_order_items(db: Session, batch_size: int = 5000) -> Dict[str, int]:
+    """
+    Parse order_items for orders loaded before item parsing existed (orders with no item rows).
+    Walks orders by id in batches, committing each batch.
+    """
+    orders_done = 0
+    items_created = 0
+    last_id = 0
+    while True:
+        rows = (
+            db.query(Order.id, Order.dedup_key, Order.location, Order.ordered_at, Order.items, Order.promotions)
+            .filter(Order.id > last_id)
+            .filter(Order.dedup_key.isnot(None), Order.ordered_at.isnot(None), Order.location.isnot(None))
+            .filter(~exists().where(OrderItem.order_dedup_key == Order.dedup_key))
+            .order_by(Order.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        frame = pd.DataFrame(rows, columns=['id', 'dedup_key', 'location', 'ordered_at', 'items', 'promotions'])
+        items = build_order_items_frame(frame)
+        if not items.empty:
+            records = items.astype(object).where(items.notna(), None).to_dict('records')
+            db.execute(insert(OrderItem), records)
+            items_created += len(records)
+        db.commit()
+        orders_done += len(rows)
+        logger.info(f"Backfilled order items through order id {last_id} ({items_created} items so far)")
+
+    return {"orders_processed": orders_done, "items_created": items_created}
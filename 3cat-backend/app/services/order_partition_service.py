@@ -0,0 +1,153 @@
+# services/order_partition_service.py
+from datetime import datetime
+from typing import Iterable, List, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import logger
+from app.models.order import Order
+
+# On PostgreSQL the orders table is range-partitioned by month on ordered_at, and each month is
+# list-partitioned by location (migration a8b9c0d1e2f3): orders -> orders_p2025_07 -> orders_p2025_07_l12.
+# Every (location, month) is its own table, so a whole-month delete can truncate one table instead of
+# deleting rows. Tables created by Base.metadata.create_all are not partitioned; everything here then
+# falls back to plain row deletes.
+
+
+def orders_partitioned(db: Session) -> bool:
+    """True if the orders table is a partitioned table (PostgreSQL after the partitioning migration)"""
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(db.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.oid = to_regclass(:table))"
+    ), {"table": Order.__tablename__}).scalar())
+
+
+def month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1)
+
+
+def next_month(month: datetime) -> datetime:
+    return datetime(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def months_in_range(start_datetime: datetime, end_datetime: datetime) -> List[datetime]:
+    """First days of the months overlapping [start_datetime, end_datetime)"""
+    months = []
+    month = month_start(start_datetime)
+    while month < end_datetime:
+        months.append(month)
+        month = next_month(month)
+    return months
+
+
+def month_partition_name(month: datetime) -> str:
+    return f"{Order.__tablename__}_p{month:%Y_%m}"
+
+
+def location_partition_name(month: datetime, location_id: int) -> str:
+    return f"{month_partition_name(month)}_l{location_id}"
+
+
+def _existing_tables(db: Session, names: Iterable[str]) -> set:
+    names = list(names)
+    if not names:
+        return set()
+    rows = db.execute(
+        text("SELECT relname FROM pg_class WHERE relname = ANY(:names) AND pg_table_is_visible(oid)"),
+        {"names": names}
+    )
+    return {row[0] for row in rows}
+
+
+def ensure_order_partitions(db: Session, location_id: int, start_datetime: datetime, end_datetime: datetime) -> int:
+    """
+    Create the month and (month, location) partitions that rows of a location in
+    [start_datetime, end_datetime) need. Runs in the caller's transaction; creating a partition locks
+    its parent until commit, so callers create partitions up front and commit when they can.
+    No-op unless orders is partitioned. Returns the number of tables created.
+    """
+    if not orders_partitioned(db):
+        return 0
+
+    months = months_in_range(start_datetime, end_datetime)
+    existing = _existing_tables(
+        db,
+        [month_partition_name(m) for m in months] + [location_partition_name(m, location_id) for m in months]
+    )
+    created = 0
+    for month in months:
+        parent = month_partition_name(month)
+        if parent not in existing:
+            db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {parent} PARTITION OF {Order.__tablename__} "
+                f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{next_month(month):%Y-%m-%d}') "
+                f"PARTITION BY LIST (location)"
+            ))
+            created += 1
+        leaf = location_partition_name(month, location_id)
+        if leaf not in existing:
+            db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {leaf} PARTITION OF {parent} FOR VALUES IN ({int(location_id)})"
+            ))
+            created += 1
+    if created:
+        logger.info(f"Created {created} order partitions for location {location_id}")
+    return created
+
+
+def split_whole_months(start_datetime: datetime, end_datetime: datetime) -> Tuple[List[datetime], List[Tuple[datetime, datetime]]]:
+    """
+    Split [start_datetime, end_datetime) into the months it covers completely and the leftover
+    partial ranges at either end
+    """
+    whole = [m for m in months_in_range(start_datetime, end_datetime)
+             if m >= start_datetime and next_month(m) <= end_datetime]
+    if not whole:
+        return [], [(start_datetime, end_datetime)]
+    partial = []
+    if start_datetime < whole[0]:
+        partial.append((start_datetime, whole[0]))
+    if next_month(whole[-1]) < end_datetime:
+        partial.append((next_month(whole[-1]), end_datetime))
+    return whole, partial
+
+
+def delete_orders_in_range(
+    db: Session,
+    location_id: int,
+    start_datetime: datetime,
+    end_datetime: datetime,
+    truncate_partitions: bool = True,
+) -> int:
+    """
+    Delete a location's orders in [start_datetime, end_datetime) in the caller's transaction.
+    With truncate_partitions, on a partitioned orders table, months covered completely are emptied a table
+    at a time by truncating their (month, location) partition. The partition is kept: dropping it would
+    take ACCESS EXCLUSIVE on orders itself until commit, stalling every location. TRUNCATE locks only that
+    partition (one location's month, which is being deleted anyway). Everything else (partial months, or
+    every month without truncate_partitions) is deleted row by row: row locks only, and MVCC-safe, so
+    concurrent readers keep seeing the rows until commit (an overwrite relies on this).
+    Returns the number of orders removed.
+    """
+    whole_months, partial_ranges = ([], [(start_datetime, end_datetime)])
+    if truncate_partitions and orders_partitioned(db):
+        whole_months, partial_ranges = split_whole_months(start_datetime, end_datetime)
+
+    deleted = 0
+    existing = _existing_tables(db, [location_partition_name(m, location_id) for m in whole_months])
+    for month in whole_months:
+        leaf = location_partition_name(month, location_id)
+        if leaf not in existing:
+            continue
+        deleted += db.execute(text(f"SELECT count(*) FROM {leaf}")).scalar()
+        db.execute(text(f"TRUNCATE {leaf}"))
+
+    for range_start, range_end in partial_ranges:
+        deleted += db.query(Order).filter(
+            Order.location == location_id,
+            Order.ordered_at >= range_start,
+            Order.ordered_at < range_end
+        ).delete(synchronize_session=False)
+    return deleted
@@ -1,13 +1,106 @@
 # services/order_service.py
 import pandas as pd
+import numpy as np
 import io
-from datetime import datetime
-from typing import List, Dict, Any
+import csv
+import hashlib
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Iterator, Union, BinaryIO, Callable, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models.order import Order
+from sqlalchemy import func, select, text, tuple_
+from app.models.order import Order, OrderItem
+from app.services.order_upload_service import forget_uploads_in_range
+from app.services.order_cache_service import bump_order_data_version, cached_order_summary
+from app.services.order_coverage_service import get_order_coverage
+from app.services.order_partition_service import delete_orders_in_range, ensure_order_partitions, orders_partitioned
+from app.services.sales_rollup_service import get_sales_summary, refresh_sales_hourly_for_datetimes
+from app.services.order_item_service import ITEM_LOAD_COLUMNS, build_order_items_frame, delete_order_items_in_range
+from app.models.location import DEFAULT_LOCATION_TIMEZONE
+from app.utils.location_mapping import get_location_timezone
 from app.config import logger
 
+# Snackpass export format for "Ordered At", e.g. "9:40 PM 7/22/2025"
+SNACKPASS_DATETIME_FORMAT = "%I:%M %p %m/%d/%Y"
+
+# Snackpass CSV column -> Order column
+TEXT_COLUMNS = {
+    'Order #': 'order_number',
+    'Status': 'status',
+    'Customer': 'customer',
+    'Fulfillment': 'fulfillment',
+    'Items': 'items',
+    'Promotions': 'promotions',
+    'Completion Time': 'completion_time',
+    'Notes': 'notes',
+    'Scheduled': 'scheduled',
+    'Channel': 'channel',
+    'Provider': 'provider',
+    'Payment Method': 'payment_method',
+    'Refunded By': 'refunded_by',
+    'Up-Charged By': 'up_charged_by',
+    'Cash Accepted By': 'cash_accepted_by',
+    'Created By': 'created_by',
+    'Employee': 'employee',
+}
+
+MONEY_COLUMNS = {
+    'Subtotal': 'subtotal',
+    'Custom Surcharge': 'custom_surcharge',
+    'Custom Discounts': 'custom_discounts',
+    'Up Charge': 'up_charge',
+    'Delivery Charge': 'delivery_charge',
+    '3P Delivery Charge': 'third_party_delivery_charge',
+    'Snackpass Fee': 'snackpass_fee',
+    'Processing Fee': 'processing_fee',
+    'Estimated Third Party Fees': 'estimated_third_party_fees',
+    'Cust. To Store Fees': 'cust_to_store_fees',
+    'Tax': 'tax',
+    'Estimated Third-Party Taxes': 'estimated_third_party_taxes',
+    'Tips': 'tips',
+    'Total': 'total',
+    'Net Sales': 'net_sales',
+    'Gross Sales': 'gross_sales',
+    'Estimated Third-Party Payout': 'estimated_third_party_payout',
+    'Cash': 'cash',
+    'Gift Card Redemp.': 'gift_card_redemption',
+    'Store Credit Redemp.': 'store_credit_redemption',
+    'Refunded Amount': 'refunded_amount',
+}
+
+REQUIRED_COLUMNS = ['Order #', 'Ordered At', 'Status', 'Customer']
+
+# Natural key hashed into Order.dedup_key: location, order number, ordered_at and the money fields (in cents)
+DEDUP_MONEY_COLUMNS = list(MONEY_COLUMNS.values())
+
+# Bulk loading: rows per COPY batch, and max bound parameters per INSERT ... VALUES statement
+BULK_INSERT_BATCH_SIZE = 5000
+INSERT_MAX_PARAMS = 30000
+
+# Columns written by the bulk loaders (order of prepare_orders_for_load output)
+LOCAL_TIME_COLUMNS = ['ordered_at_utc', 'local_date', 'local_hour', 'local_dow']
+LOAD_COLUMNS = list(TEXT_COLUMNS.values()) + ['ordered_at'] + LOCAL_TIME_COLUMNS + list(MONEY_COLUMNS.values()) + \
+    ['location', 'dedup_key', 'created_at', 'updated_at']
+
+# Session-local load tables for COPY batches (dropped at commit)
+ORDERS_LOAD_TABLE = "orders_load"
+ORDER_ITEMS_LOAD_TABLE = "order_items_load"
+
+# Session-local staging tables for overwrite imports (temp tables are never WAL-logged); kept across
+# the per-chunk commits and dropped once the staged rows are swapped into orders
+ORDERS_STAGING_TABLE = "orders_staging"
+ORDER_ITEMS_STAGING_TABLE = "order_items_staging"
+
+# Rows per pd.read_csv chunk; bounds peak memory independently of the file size
+CSV_CHUNK_SIZE = 20000
+
+# Orders listing: rows per ORM batch when streaming a whole range through a server-side cursor
+ORDER_STREAM_BATCH_SIZE = 1000
+
+# A CSV given as raw bytes, a path on disk (e.g. a spooled upload) or an open binary file
+CsvSource = Union[bytes, str, BinaryIO]
+
 class OrderService:
     
     @staticmethod
@@ -35,76 +128,175 @@ class OrderService:
             return None
     
     @staticmethod
-    def validate_csv_dates(csv_content: bytes, expected_start_date: str, expected_end_date: str) -> Dict[str, Any]:
+    def parse_money_series(values: pd.Series) -> pd.Series:
+        """Vectorized parse_money_string: '$1,027.80' -> 1027.8, blanks/unparseable -> 0.0"""
+        if pd.api.types.is_numeric_dtype(values):
+            return values.fillna(0.0).astype(float)
+        cleaned = values.astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False)
+        return pd.to_numeric(cleaned, errors='coerce').fillna(0.0).astype(float)
+    
+    @staticmethod
+    def parse_datetime_series(values: pd.Series) -> pd.Series:
+        """Vectorized parse_datetime: one to_datetime call with the Snackpass format, unparseable -> NaT"""
+        return pd.to_datetime(values, format=SNACKPASS_DATETIME_FORMAT, errors='coerce')
+    
+    @staticmethod
+    def parse_text_series(values: pd.Series) -> pd.Series:
+        """Vectorized str() for text columns, NaN -> ''"""
+        return values.where(values.notna(), '').astype(str)
+    
+    @staticmethod
+    def normalize_order_number_series(values: pd.Series) -> pd.Series:
         """
-        Validate that CSV dates match the expected date range
-        Returns validation result with min/max dates found and whether they match
+        Order numbers as text, NaN -> '', with the trailing '.0' a float-typed "Order #" column leaves
+        ('12345.0' -> '12345'; older imports stored such values). The add_order_dedup_key migration
+        rewrites stored order numbers the same way.
         """
-        try:
-            from datetime import datetime, timedelta
-            
-            # Read CSV content
-            df = pd.read_csv(io.BytesIO(csv_content))
-            
+        return OrderService.parse_text_series(values).str.replace(r'^(\d+)\.0$', r'\1', regex=True)
+    
+    @staticmethod
+    def iter_csv_chunks(
+        source: CsvSource,
+        chunksize: int = CSV_CHUNK_SIZE,
+        usecols: Optional[List[str]] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Read a Snackpass CSV in chunks of `chunksize` rows.
+        Text columns are read as str so every chunk gets the same dtypes regardless of its contents.
+        Chunk indexes continue across chunks, so row numbers in errors stay file-wide.
+        With usecols, only those of the listed columns the file has are parsed (cheap scans).
+        """
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        elif hasattr(source, 'seek'):
+            source.seek(0)
+        dtype = {column: str for column in list(TEXT_COLUMNS) + ['Ordered At']}
+        columns = (lambda column: column in usecols) if usecols else None
+        with pd.read_csv(source, chunksize=chunksize, dtype=dtype, usecols=columns) as reader:
+            for chunk in reader:
+                yield chunk
+    
+    @staticmethod
+    def transform_orders_frame(
+        df: pd.DataFrame,
+        location_id: int,
+        start_date: str = None,
+        end_date: str = None,
+        timezone: str = DEFAULT_LOCATION_TIMEZONE
+    ) -> Dict[str, Any]:
+        """
+        Turn a raw Snackpass CSV frame into a clean, typed frame whose columns match Order.
+        Every column is converted in one vectorized pass; skipped rows and row-level errors
+        come from boolean masks instead of per-row checks.
+        "Ordered At" is store wall-clock time in `timezone`; see local_time_columns.
+        Returns {"orders": DataFrame, "orders_skipped": int, "errors": [str], "total_rows": int,
+                 "ordered_at_min": Timestamp, "ordered_at_max": Timestamp, "dated_rows": int}
+        The ordered_at span covers every parseable row before date-range filtering.
+        """
+        from datetime import datetime, timedelta
+        
+        # Remove rows where all values are NaN and any repeated header rows
+        df = df.dropna(how='all')
+        df = df[df['Order #'].astype(str) != 'Order #']
+        total_rows = len(df)
+        
+        ordered_at = OrderService.parse_datetime_series(df['Ordered At'])
+        parsed_dates = ordered_at.dropna()
+        
+        # Rows without essential data
+        missing_number = df['Order #'].isna() | (df['Order #'].astype(str).str.strip() == '')
+        blank_date = df['Ordered At'].isna() | (df['Ordered At'].astype(str).str.strip() == '')
+        invalid_date = ~missing_number & ~blank_date & ordered_at.isna()
+        keep = ~missing_number & ordered_at.notna()
+        
+        errors = [
+            f"Error processing row {index + 1}: could not parse Ordered At '{value}'"
+            for index, value in df.loc[invalid_date, 'Ordered At'].items()
+        ]
+        
+        # Filter by date range if provided
+        if start_date and end_date:
+            start_datetime = datetime.strptime(start_date, "%Y-%m-%d")
+            end_datetime = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)
+            keep &= (ordered_at >= start_datetime) & (ordered_at < end_datetime)
+        
+        df = df[keep]
+        
+        orders = pd.DataFrame(index=df.index)
+        for csv_column, column in TEXT_COLUMNS.items():
+            orders[column] = OrderService.parse_text_series(df[csv_column]) if csv_column in df.columns else ''
+        orders['order_number'] = OrderService.normalize_order_number_series(orders['order_number'])
+        orders['ordered_at'] = ordered_at[keep]
+        orders = orders.assign(**OrderService.local_time_columns(orders['ordered_at'], timezone))
+        for csv_column, column in MONEY_COLUMNS.items():
+            orders[column] = OrderService.parse_money_series(df[csv_column]) if csv_column in df.columns else 0.0
+        orders['location'] = location_id
+        
+        if errors:
+            logger.warning(f"{len(errors)} rows with unparseable dates")
+        
+        return {
+            "orders": orders,
+            "orders_skipped": total_rows - len(orders),
+            "errors": errors,
+            "total_rows": total_rows,
+            "ordered_at_min": parsed_dates.min() if len(parsed_dates) else None,
+            "ordered_at_max": parsed_dates.max() if len(parsed_dates) else None,
+            "dated_rows": len(parsed_dates)
+        }
+    
+    @staticmethod
+    def scan_csv_date_span(csv_content: CsvSource) -> Tuple[Optional[datetime], Optional[datetime], int]:
+        """
+        (min, max, count) of the parseable "Ordered At" values in a CSV, (None, None, 0) if there are none
+        The CSV is scanned chunk by chunk, parsing only the order number and date columns and keeping
+        only a running min/max and count, so it is cheap enough to run before anything is written
+        """
+        min_csv_date = None
+        max_csv_date = None
+        total_orders = 0
+        
+        for df in OrderService.iter_csv_chunks(csv_content, usecols=['Order #', 'Ordered At']):
             # Check if required columns exist
             if 'Ordered At' not in df.columns:
-                return {
-                    "valid": False,
-                    "error": "CSV file does not contain 'Ordered At' column"
-                }
+                raise ValueError("CSV file does not contain 'Ordered At' column")
             
-            # Remove rows where all values are NaN
+            # Remove rows where all values are NaN and any repeated header rows
             df = df.dropna(how='all')
+            if 'Order #' in df.columns:
+                df = df[df['Order #'].astype(str) != 'Order #']
             
-            # Skip the first row if it's just column headers
-            if df.iloc[0]['Order #'] == 'Order #':
-                df = df.iloc[1:]
+            # Parse dates from this chunk
+            csv_dates = OrderService.parse_datetime_series(df['Ordered At']).dropna()
+            if csv_dates.empty:
+                continue
             
-            # Parse dates from CSV
-            csv_dates = []
-            for index, row in df.iterrows():
-                if not pd.isna(row['Ordered At']) and row['Ordered At'] != '':
-                    parsed_date = OrderService.parse_datetime(row['Ordered At'])
-                    if parsed_date:
-                        csv_dates.append(parsed_date)
-            
-            if not csv_dates:
-                return {
-                    "valid": False,
-                    "error": "No valid dates found in CSV file"
-                }
-            
-            # Find min and max dates in CSV
-            min_csv_date = min(csv_dates)
-            max_csv_date = max(csv_dates)
-            
-            # Convert to date only (remove time)
-            min_csv_date_only = min_csv_date.date()
-            max_csv_date_only = max_csv_date.date()
-            
-            # Parse expected dates (handle timezone issues by using local timezone)
-            expected_start = datetime.strptime(expected_start_date, "%Y-%m-%d").replace(tzinfo=None).date()
-            expected_end = datetime.strptime(expected_end_date, "%Y-%m-%d").replace(tzinfo=None).date()
-            
-            # Check if start and end dates are the same (single date selection)
-            if expected_start == expected_end:
-                # For single date, just check if the CSV contains data for that date
-                csv_contains_target_date = (min_csv_date_only <= expected_start and max_csv_date_only >= expected_start)
-                csv_exactly_matches = csv_contains_target_date
-            else:
-                # For date range, check if CSV dates exactly match the expected range
-                csv_exactly_matches = (min_csv_date_only == expected_start and max_csv_date_only == expected_end)
+            chunk_min = csv_dates.min().to_pydatetime()
+            chunk_max = csv_dates.max().to_pydatetime()
+            min_csv_date = chunk_min if min_csv_date is None else min(min_csv_date, chunk_min)
+            max_csv_date = chunk_max if max_csv_date is None else max(max_csv_date, chunk_max)
+            total_orders += len(csv_dates)
+        
+        return min_csv_date, max_csv_date, total_orders
+    
+    @staticmethod
+    def validate_csv_dates(csv_content: CsvSource, expected_start_date: str, expected_end_date: str) -> Dict[str, Any]:
+        """
+        Validate that CSV dates match the expected date range
+        Returns validation result with min/max dates found and whether they match
+        Only the date span is read (scan_csv_date_span), so this can run before anything is written
+        """
+        try:
+            min_csv_date, max_csv_date, total_orders = OrderService.scan_csv_date_span(csv_content)
+            return OrderService.date_validation_result(
+                min_csv_date, max_csv_date, total_orders, expected_start_date, expected_end_date
+            )
             
+        except ValueError as e:
             return {
-                "valid": csv_exactly_matches,
-                "csv_min_date": min_csv_date_only.isoformat(),
-                "csv_max_date": max_csv_date_only.isoformat(),
-                "expected_start_date": expected_start.isoformat(),
-                "expected_end_date": expected_end.isoformat(),
-                "csv_exactly_matches": csv_exactly_matches,
-                "total_orders": len(csv_dates)
+                "valid": False,
+                "error": str(e)
             }
-            
         except Exception as e:
             logger.error(f"Error validating CSV dates: {str(e)}")
             return {
@@ -112,6 +304,121 @@ class OrderService:
                 "error": f"Error validating dates: {str(e)}"
             }
     
+    @staticmethod
+    def date_validation_result(
+        min_csv_date: datetime,
+        max_csv_date: datetime,
+        total_orders: int,
+        expected_start_date: str,
+        expected_end_date: str
+    ) -> Dict[str, Any]:
+        """
+        Compare the date span found in a CSV with the expected period
+        A single-day period only needs to be covered; a range must match exactly
+        """
+        if not total_orders:
+            return {
+                "valid": False,
+                "error": "No valid dates found in CSV file"
+            }
+        
+        # Convert to date only (remove time)
+        min_csv_date_only = min_csv_date.date()
+        max_csv_date_only = max_csv_date.date()
+        
+        # Parse expected dates (handle timezone issues by using local timezone)
+        expected_start = datetime.strptime(expected_start_date, "%Y-%m-%d").replace(tzinfo=None).date()
+        expected_end = datetime.strptime(expected_end_date, "%Y-%m-%d").replace(tzinfo=None).date()
+        
+        # Check if start and end dates are the same (single date selection)
+        if expected_start == expected_end:
+            # For single date, just check if the CSV contains data for that date
+            csv_contains_target_date = (min_csv_date_only <= expected_start and max_csv_date_only >= expected_start)
+            csv_exactly_matches = csv_contains_target_date
+        else:
+            # For date range, check if CSV dates exactly match the expected range
+            csv_exactly_matches = (min_csv_date_only == expected_start and max_csv_date_only == expected_end)
+        
+        return {
+            "valid": csv_exactly_matches,
+            "csv_min_date": min_csv_date_only.isoformat(),
+            "csv_max_date": max_csv_date_only.isoformat(),
+            "expected_start_date": expected_start.isoformat(),
+            "expected_end_date": expected_end.isoformat(),
+            "csv_exactly_matches": csv_exactly_matches,
+            "total_orders": total_orders
+        }
+    
+    @staticmethod
+    def preflight_csv_import(
+        csv_content: CsvSource,
+        location_id: int,
+        db: Session,
+        period_start_date: str = None,
+        period_end_date: str = None,
+        validate_dates: bool = True,
+        overwrite_existing: bool = False,
+        append_mode: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Checks run before an upload is archived or imported: CSV dates must match the selected period
+        (a cheap scan of the date column), and the period must be empty unless overwrite or append is requested.
+        Returns None if the import can go ahead, otherwise the rejection payload for the client.
+        """
+        if validate_dates and period_start_date and period_end_date:
+            date_validation = OrderService.validate_csv_dates(
+                csv_content=csv_content,
+                expected_start_date=period_start_date,
+                expected_end_date=period_end_date
+            )
+            if not date_validation["valid"]:
+                return {
+                    "success": False,
+                    "validation_error": True,
+                    "date_validation": date_validation,
+                    "message": "CSV dates do not match the selected date range"
+                }
+        
+        return OrderService.check_period_conflict(
+            location_id=location_id,
+            db=db,
+            period_start_date=period_start_date,
+            period_end_date=period_end_date,
+            overwrite_existing=overwrite_existing,
+            append_mode=append_mode
+        )
+    
+    @staticmethod
+    def check_period_conflict(
+        location_id: int,
+        db: Session,
+        period_start_date: str = None,
+        period_end_date: str = None,
+        overwrite_existing: bool = False,
+        append_mode: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Block an upload into a period that already has orders unless overwrite or append is requested
+        Returns None if the upload can go ahead, otherwise the rejection payload for the client
+        Only queries the database (the second half of preflight_csv_import)
+        """
+        if period_start_date and period_end_date and not overwrite_existing and not append_mode:
+            existing = OrderService.check_existing_data_for_date_range(
+                location_id=location_id,
+                start_date=period_start_date,
+                end_date=period_end_date,
+                db=db
+            )
+            if existing["has_existing_data"]:
+                return {
+                    "success": False,
+                    "existing_data_error": True,
+                    "existing_data": existing,
+                    "message": "Data already exists for the selected date range"
+                }
+        
+        return None
+    
     @staticmethod
     def check_existing_data_for_date_range(
         location_id: int, 
@@ -121,7 +428,8 @@ class OrderService:
     ) -> Dict[str, Any]:
         """
         Check if there are existing orders in the database for the given date range
-        Returns information about existing data including dates and counts
+        Returns information about existing data including dates and counts, and the per-day
+        coverage map {"YYYY-MM-DD": count} (order_coverage_service)
         """
         try:
             from datetime import datetime, timedelta
@@ -130,29 +438,17 @@ class OrderService:
             start_datetime = datetime.strptime(start_date, "%Y-%m-%d")
             end_datetime = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)
             
-            # Query for existing orders in the date range
-            existing_orders = db.query(Order).filter(
-                Order.location == location_id,
-                Order.ordered_at >= start_datetime,
-                Order.ordered_at < end_datetime
-            ).all()
+            # One grouped COUNT per local date instead of loading the orders
+            coverage = get_order_coverage(db, location_id, start_datetime.date(), end_datetime.date() - timedelta(days=1))
             
-            if not existing_orders:
+            if not coverage:
                 return {
                     "has_existing_data": False,
                     "existing_dates": [],
-                    "total_existing_orders": 0
+                    "total_existing_orders": 0,
+                    "coverage": {}
                 }
             
-            # Group orders by date and count them
-            from collections import defaultdict
-            date_counts = defaultdict(int)
-            
-            for order in existing_orders:
-                if order.ordered_at:
-                    date_key = order.ordered_at.date().isoformat()
-                    date_counts[date_key] += 1
-            
             # Convert to list of dates with counts
             existing_dates = [
                 {
@@ -160,13 +456,14 @@ class OrderService:
                     "count": count,
                     "formatted_date": datetime.strptime(date, "%Y-%m-%d").strftime("%m/%d/%Y")
                 }
-                for date, count in sorted(date_counts.items())
+                for date, count in coverage.items()
             ]
             
             return {
                 "has_existing_data": True,
                 "existing_dates": existing_dates,
-                "total_existing_orders": len(existing_orders)
+                "total_existing_orders": sum(coverage.values()),
+                "coverage": coverage
             }
             
         except Exception as e:
@@ -175,145 +472,381 @@ class OrderService:
                 "has_existing_data": False,
                 "existing_dates": [],
                 "total_existing_orders": 0,
+                "coverage": {},
                 "error": str(e)
             }
     
     @staticmethod
-    def process_csv_and_insert_orders(csv_content: bytes, location_id: int, db: Session, overwrite_existing: bool = False, start_date: str = None, end_date: str = None) -> Dict[str, Any]:
+    def local_time_columns(ordered_at: pd.Series, timezone: str) -> Dict[str, pd.Series]:
+        """
+        Order.ordered_at_utc, local_date, local_hour and local_dow for wall-clock ordered_at values in `timezone`.
+        Times skipped by a DST change move forward; the repeated hour after one is read as standard time.
+        """
+        utc = ordered_at.dt.tz_localize(
+            timezone, ambiguous=np.zeros(len(ordered_at), dtype=bool), nonexistent='shift_forward'
+        ).dt.tz_convert('UTC')
+        return {
+            'ordered_at_utc': utc,
+            'local_date': ordered_at.dt.date,
+            'local_hour': ordered_at.dt.hour,
+            'local_dow': ordered_at.dt.weekday,
+        }
+    
+    @staticmethod
+    def compute_dedup_keys(orders: pd.DataFrame) -> pd.Series:
+        """
+        Natural-key hash for each transformed order row:
+        md5("location|order_number|YYYY-MM-DD HH:MM:SS|cents|cents|...") over DEDUP_MONEY_COLUMNS.
+        The add_order_dedup_key migration computes the same string in SQL for existing rows
+        (order_number normalized as in normalize_order_number_series, NULL hashed as '').
+        """
+        parts = [
+            OrderService.normalize_order_number_series(orders['order_number']),
+            orders['ordered_at'].dt.strftime('%Y-%m-%d %H:%M:%S'),
+        ] + [
+            (orders[column] * 100).round().astype('int64').astype(str)
+            for column in DEDUP_MONEY_COLUMNS
+        ]
+        natural_key = orders['location'].astype(str).str.cat(parts, sep='|')
+        return pd.Series(
+            [hashlib.md5(key.encode()).hexdigest() for key in natural_key],
+            index=orders.index,
+            dtype=object
+        )
+    
+    @staticmethod
+    def prepare_orders_for_load(orders: pd.DataFrame) -> pd.DataFrame:
+        """Add the dedup_key and timestamp columns a transformed frame needs before it is written to orders"""
+        now = datetime.utcnow()
+        return orders.assign(
+            dedup_key=OrderService.compute_dedup_keys(orders),
+            created_at=now,
+            updated_at=now
+        )
+    
+    @staticmethod
+    def create_load_table_sql(
+        table: str,
+        on_commit: str = "PRESERVE ROWS",
+        source_table: str = Order.__tablename__,
+        columns: List[str] = LOAD_COLUMNS
+    ):
+        """Temp table with just the loaded columns of source_table: no constraints or defaults (so no sequence values are used)"""
+        return text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {table} ON COMMIT {on_commit} AS "
+            f"SELECT {', '.join(columns)} FROM {source_table} WITH NO DATA"
+        )
+    
+    @staticmethod
+    def copy_frame(cursor, table: str, frame: pd.DataFrame, force_null: List[str] = ()) -> None:
+        """
+        Stream a prepared frame into `table` with COPY FROM STDIN (psycopg2 copy_expert)
+        force_null columns turn empty values into NULL (missing prices, modifiers)
+        """
+        buffer = io.StringIO()
+        # Quote text so '' stays an empty string (unquoted empty is NULL in COPY csv)
+        frame.to_csv(
+            buffer,
+            header=False,
+            index=False,
+            quoting=csv.QUOTE_NONNUMERIC,
+            date_format="%Y-%m-%d %H:%M:%S%z"
+        )
+        buffer.seek(0)
+        options = "FORMAT csv" + (f", FORCE_NULL ({', '.join(force_null)})" if force_null else "")
+        cursor.copy_expert(f"COPY {table} ({', '.join(frame.columns)}) FROM STDIN WITH ({options})", buffer)
+    
+    @staticmethod
+    def copy_orders_with_items(cursor, orders_table: str, items_table: str, orders: pd.DataFrame) -> None:
+        """COPY a prepared orders frame and its parsed order_items into a pair of load/staging tables"""
+        OrderService.copy_frame(cursor, orders_table, orders)
+        items = build_order_items_frame(orders)
+        if not items.empty:
+            OrderService.copy_frame(cursor, items_table, items, force_null=['modifiers', 'price'])
+    
+    @staticmethod
+    def insert_orders_from_table_sql(table: str, items_table: str, columns: List[str] = LOAD_COLUMNS):
+        """
+        One statement moving a load/staging table pair into orders and order_items: orders skip existing
+        dedup keys, and items are inserted only for the orders that were (once per order line).
+        Selects the number of orders inserted.
+        """
+        column_list = ', '.join(columns)
+        item_column_list = ', '.join(ITEM_LOAD_COLUMNS)
+        return text(
+            f"WITH inserted AS ("
+            f"INSERT INTO {Order.__tablename__} ({column_list}) "
+            f"SELECT {column_list} FROM {table} "
+            f"ON CONFLICT (dedup_key, ordered_at, location) DO NOTHING RETURNING dedup_key"
+            f"), inserted_items AS ("
+            f"INSERT INTO {OrderItem.__tablename__} ({item_column_list}) "
+            f"SELECT DISTINCT ON (order_dedup_key, position) {item_column_list} FROM {items_table} "
+            f"WHERE order_dedup_key IN (SELECT dedup_key FROM inserted)"
+            f") SELECT count(*) FROM inserted"
+        )
+    
+    @staticmethod
+    def bulk_insert_orders(orders: pd.DataFrame, db: Session, batch_size: int = BULK_INSERT_BATCH_SIZE) -> int:
+        """
+        Bulk load a transformed orders frame, with its parsed order_items, in the session's transaction
+        (caller commits). The order partitions the rows need must already exist: creating them here would
+        hold the parent's ACCESS EXCLUSIVE lock for the rest of the load (see process_csv_and_insert_orders).
+        Rows whose dedup_key already exists (in the table or earlier in the frame) are skipped,
+        and so are their items; one insert statement per batch.
+        PostgreSQL: each batch is streamed with COPY FROM STDIN (psycopg2 copy_expert) into
+        temp load tables, then moved with INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING.
+        Other databases (SQLite in local dev): per batch, a SELECT of the dedup keys already stored and a
+        plain INSERT of the rest (standard SQL only; not safe against a concurrent import of the same rows).
+        Returns the number of rows actually inserted.
+        """
+        if orders.empty:
+            return 0
+        
+        orders = OrderService.prepare_orders_for_load(orders)
+        columns = list(orders.columns)
+        inserted = 0
+        
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(OrderService.create_load_table_sql(ORDERS_LOAD_TABLE, on_commit="DROP"))
+            db.execute(OrderService.create_load_table_sql(
+                ORDER_ITEMS_LOAD_TABLE, on_commit="DROP",
+                source_table=OrderItem.__tablename__, columns=ITEM_LOAD_COLUMNS
+            ))
+            insert_sql = OrderService.insert_orders_from_table_sql(ORDERS_LOAD_TABLE, ORDER_ITEMS_LOAD_TABLE, columns)
+            cursor = db.connection().connection.cursor()
+            try:
+                for start in range(0, len(orders), batch_size):
+                    cursor.execute(f"TRUNCATE {ORDERS_LOAD_TABLE}, {ORDER_ITEMS_LOAD_TABLE}")
+                    OrderService.copy_orders_with_items(
+                        cursor, ORDERS_LOAD_TABLE, ORDER_ITEMS_LOAD_TABLE, orders.iloc[start:start + batch_size]
+                    )
+                    inserted += db.execute(insert_sql).scalar()
+            finally:
+                cursor.close()
+        else:
+            # Portable path (no ON CONFLICT): one SELECT finds which dedup keys of a batch are already
+            # stored (earlier batches included), then the new rows go in with a plain INSERT
+            rows_per_statement = max(1, min(batch_size, INSERT_MAX_PARAMS // len(columns)))
+            for start in range(0, len(orders), rows_per_statement):
+                batch = orders.iloc[start:start + rows_per_statement].drop_duplicates('dedup_key')
+                existing_keys = set(db.execute(
+                    select(Order.dedup_key).where(Order.dedup_key.in_(batch['dedup_key'].tolist()))
+                ).scalars())
+                batch = batch[~batch['dedup_key'].isin(existing_keys)]
+                if batch.empty:
+                    continue
+                db.execute(Order.__table__.insert(), batch.to_dict('records'))
+                inserted += len(batch)
+                
+                items = build_order_items_frame(batch).drop_duplicates(['order_dedup_key', 'position'])
+                if not items.empty:
+                    records = items.astype(object).where(items.notna(), None).to_dict('records')
+                    db.execute(OrderItem.__table__.insert(), records)
+        
+        return inserted
+    
+    @staticmethod
+    def create_orders_staging(db: Session) -> None:
+        """Create (or empty) this session's orders and order_items staging tables; PostgreSQL only"""
+        db.execute(OrderService.create_load_table_sql(ORDERS_STAGING_TABLE))
+        db.execute(OrderService.create_load_table_sql(
+            ORDER_ITEMS_STAGING_TABLE, source_table=OrderItem.__tablename__, columns=ITEM_LOAD_COLUMNS
+        ))
+        db.execute(text(f"TRUNCATE {ORDERS_STAGING_TABLE}, {ORDER_ITEMS_STAGING_TABLE}"))
+    
+    @staticmethod
+    def stage_orders(orders: pd.DataFrame, db: Session) -> int:
+        """COPY a transformed orders frame and its items into the staging tables (caller commits); returns rows staged"""
+        if orders.empty:
+            return 0
+        orders = OrderService.prepare_orders_for_load(orders)
+        cursor = db.connection().connection.cursor()
+        try:
+            OrderService.copy_orders_with_items(cursor, ORDERS_STAGING_TABLE, ORDER_ITEMS_STAGING_TABLE, orders)
+        finally:
+            cursor.close()
+        return len(orders)
+    
+    @staticmethod
+    def drop_orders_staging(db: Session) -> None:
+        """Drop this session's staging tables (after a rollback if the transaction failed)"""
+        db.rollback()
+        db.execute(text(f"DROP TABLE IF EXISTS {ORDERS_STAGING_TABLE}, {ORDER_ITEMS_STAGING_TABLE}"))
+        db.commit()
+    
+    @staticmethod
+    def swap_in_staged_orders(location_id: int, start_datetime: datetime, end_datetime: datetime, db: Session) -> Dict[str, int]:
+        """
+        One transaction: delete the location's orders (and order_items) in [start_datetime, end_datetime)
+        and INSERT ... SELECT the staged rows (skipping duplicate dedup keys within the file).
+        The sales_hourly rollup for the range is rebuilt, and the location's data version bumped
+        (invalidating cached summaries), in the same transaction.
+        The range is deleted row by row, whole months included (no TRUNCATE, which would take ACCESS
+        EXCLUSIVE on the partition until commit): the swap holds row locks only, so readers keep seeing
+        the old orders without blocking until this commits, and only writers of the same rows
+        (or a concurrent rollup rebuild for the location) wait for it.
+        Returns {"deleted": int, "inserted": int}
+        """
+        from datetime import timedelta
+        
+        ensure_order_partitions(db, location_id, start_datetime, end_datetime)
+        deleted = delete_orders_in_range(db, location_id, start_datetime, end_datetime, truncate_partitions=False)
+        delete_order_items_in_range(db, location_id, start_datetime, end_datetime)
+        forget_uploads_in_range(db, location_id, start_datetime.date(), end_datetime.date() - timedelta(days=1))
+        inserted = db.execute(
+            OrderService.insert_orders_from_table_sql(ORDERS_STAGING_TABLE, ORDER_ITEMS_STAGING_TABLE)
+        ).scalar()
+        refresh_sales_hourly_for_datetimes(db, location_id, start_datetime, end_datetime)
+        bump_order_data_version(db, location_id)
+        db.commit()
+        return {"deleted": deleted, "inserted": inserted}
+    
+    @staticmethod
+    def process_csv_and_insert_orders(
+        csv_content: CsvSource,
+        location_id: int,
+        db: Session,
+        overwrite_existing: bool = False,
+        start_date: str = None,
+        end_date: str = None,
+        append_mode: bool = False,
+        progress_callback: Callable[[Dict[str, Any]], None] = None
+    ) -> Dict[str, Any]:
         """
         Process CSV content and insert all orders into the database
+        The CSV is read, transformed and bulk-loaded CSV_CHUNK_SIZE rows at a time in one transaction,
+        so memory stays flat for large exports
+        Each chunk is parsed once: the typed frame feeds both the insert and the running ordered_at min/max.
+        Date validation and the existing-data check are not done here: run preflight_csv_import first
+        Rows that already exist (same dedup_key) are always skipped, so append_mode needs no extra handling here
+        progress_callback, if given, receives the running totals after each chunk (before the final commit)
+        The result has the file's date span (csv_min_date / csv_max_date) and the span of the rows kept
+        for import (imported_min_date / imported_max_date; rows outside the period are not imported)
+        Overwrite on PostgreSQL goes through a staging table instead: chunks are COPYed into it and committed
+        one by one, then a single short transaction deletes the range and inserts from staging, so readers
+        never see a half-loaded period and no transaction spans the whole load
         """
+        from datetime import datetime, timedelta
+        
+        use_staging = bool(
+            overwrite_existing and start_date and end_date
+            and db.get_bind().dialect.name == "postgresql"
+        )
+        staging_db = None
+        timezone = get_location_timezone(location_id, db)
         try:
-            # Delete existing data if overwriting
-            if overwrite_existing and start_date and end_date:
-                from datetime import datetime, timedelta
+            # Create any missing partitions up front in their own short transaction, so the ACCESS EXCLUSIVE
+            # locks partition DDL takes are not held for the whole load. With a period only its rows are
+            # imported; without one, a date-only pre-pass over the file finds the months it spans
+            if start_date and end_date:
+                ensure_order_partitions(
+                    db, location_id,
+                    datetime.strptime(start_date, "%Y-%m-%d"),
+                    datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)
+                )
+                db.commit()
+            elif orders_partitioned(db):
+                span_start, span_end, _ = OrderService.scan_csv_date_span(csv_content)
+                if span_start is not None:
+                    ensure_order_partitions(db, location_id, span_start, span_end + timedelta(seconds=1))
+                db.commit()
+            
+            if use_staging:
+                # The temp staging table lives on one connection, so pin one for the whole load
+                # (a Session hands its connection back to the pool on every commit)
+                staging_db = Session(bind=db.get_bind().connect())
+                OrderService.create_orders_staging(staging_db)
+            
+            # Delete existing data if overwriting (staged imports delete at swap time)
+            elif overwrite_existing and start_date and end_date:
                 start_datetime = datetime.strptime(start_date, "%Y-%m-%d")
                 end_datetime = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)
                 
                 # Delete existing orders in the date range
-                deleted_count = db.query(Order).filter(
-                    Order.location == location_id,
-                    Order.ordered_at >= start_datetime,
-                    Order.ordered_at < end_datetime
-                ).delete()
+                deleted_count = delete_orders_in_range(
+                    db, location_id, start_datetime, end_datetime, truncate_partitions=False
+                )
+                delete_order_items_in_range(db, location_id, start_datetime, end_datetime)
+                forget_uploads_in_range(db, location_id, start_datetime.date(), end_datetime.date() - timedelta(days=1))
                 
                 logger.info(f"Deleted {deleted_count} existing orders for overwrite")
             
-            # Read CSV content
-            df = pd.read_csv(io.BytesIO(csv_content))
-            
-            # Check if required columns exist
-            required_columns = ['Order #', 'Ordered At', 'Status', 'Customer']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            if missing_columns:
-                raise ValueError(f"Missing required columns: {missing_columns}")
-            
-            # Remove rows where all values are NaN
-            df = df.dropna(how='all')
-            
-            # Skip the first row if it's just column headers
-            if df.iloc[0]['Order #'] == 'Order #':
-                df = df.iloc[1:]
-            
             orders_created = 0
             orders_skipped = 0
+            total_rows = 0
             errors = []
+            min_csv_date = None
+            max_csv_date = None
+            min_imported_date = None
+            max_imported_date = None
+            staged_rows = 0
             
-            for index, row in df.iterrows():
-                try:
-                    # Skip rows that don't have essential data
-                    if pd.isna(row['Order #']) or row['Order #'] == '':
-                        orders_skipped += 1
-                        logger.info("skipping row %s because it doesn't have an order number", index)
-                        continue
-                    
-                    # Parse the order date
-                    order_datetime = OrderService.parse_datetime(row['Ordered At'])
-                    if not order_datetime:
-                        orders_skipped += 1
-                        logger.info("skipping row %s because it doesn't have an order date", index)
-                        continue
-                    
-                    # Filter by date range if provided
-                    if start_date and end_date:
-                        from datetime import datetime, timedelta
-                        start_datetime = datetime.strptime(start_date, "%Y-%m-%d")
-                        end_datetime = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)
-                        
-                        # Skip orders outside the selected date range
-                        if order_datetime < start_datetime or order_datetime >= end_datetime:
-                            orders_skipped += 1
-                            logger.info("skipping row %s because it's outside the date range", index)
-                            continue
-                    
-                    # Check if order already exists
-                    existing_order = db.query(Order).filter(
-                        Order.location == location_id,
-                        Order.subtotal == OrderService.parse_money_string(row['Subtotal']),
-                        Order.customer == str(row['Customer']) if not pd.isna(row['Customer']) else '',
-                        Order.ordered_at == OrderService.parse_datetime(row['Ordered At'])
-                    ).first()
-                    
-                    if existing_order:
-                        orders_skipped += 1
-                        logger.info("skipping row %s because it already exists", index)
-                        continue
-                    
-                    # Create new order
-                    order = Order(
-                        order_number=str(row['Order #']),
-                        ordered_at=order_datetime,
-                        status=str(row['Status']) if not pd.isna(row['Status']) else '',
-                        customer=str(row['Customer']) if not pd.isna(row['Customer']) else '',
-                        fulfillment=str(row['Fulfillment']) if not pd.isna(row['Fulfillment']) else '',
-
-                        items=str(row['Items']) if not pd.isna(row['Items']) else '',
-                        promotions=str(row['Promotions']) if not pd.isna(row['Promotions']) else '',
-                        completion_time=str(row['Completion Time']) if not pd.isna(row['Completion Time']) else '',
-                        notes=str(row['Notes']) if not pd.isna(row['Notes']) else '',
-                        scheduled=str(row['Scheduled']) if not pd.isna(row['Scheduled']) else '',
-                        channel=str(row['Channel']) if not pd.isna(row['Channel']) else '',
-                        provider=str(row['Provider']) if not pd.isna(row['Provider']) else '',
-                        subtotal=OrderService.parse_money_string(row['Subtotal']),
-                        custom_surcharge=OrderService.parse_money_string(row['Custom Surcharge']),
-                        custom_discounts=OrderService.parse_money_string(row['Custom Discounts']),
-                        up_charge=OrderService.parse_money_string(row['Up Charge']),
-                        delivery_charge=OrderService.parse_money_string(row['Delivery Charge']),
-                        third_party_delivery_charge=OrderService.parse_money_string(row['3P Delivery Charge']),
-                        snackpass_fee=OrderService.parse_money_string(row['Snackpass Fee']),
-                        processing_fee=OrderService.parse_money_string(row['Processing Fee']),
-                        estimated_third_party_fees=OrderService.parse_money_string(row['Estimated Third Party Fees']),
-                        cust_to_store_fees=OrderService.parse_money_string(row['Cust. To Store Fees']),
-                        tax=OrderService.parse_money_string(row['Tax']),
-                        estimated_third_party_taxes=OrderService.parse_money_string(row['Estimated Third-Party Taxes']),
-                        tips=OrderService.parse_money_string(row['Tips']),
-                        total=OrderService.parse_money_string(row['Total']),
-                        net_sales=OrderService.parse_money_string(row['Net Sales']),
-                        gross_sales=OrderService.parse_money_string(row['Gross Sales']),
-                        estimated_third_party_payout=OrderService.parse_money_string(row['Estimated Third-Party Payout']),
-                        payment_method=str(row['Payment Method']) if not pd.isna(row['Payment Method']) else '',
-                        cash=OrderService.parse_money_string(row['Cash']),
-                        gift_card_redemption=OrderService.parse_money_string(row['Gift Card Redemp.']),
-                        store_credit_redemption=OrderService.parse_money_string(row['Store Credit Redemp.']),
-                        refunded_by=str(row['Refunded By']) if not pd.isna(row['Refunded By']) else '',
-                        refunded_amount=OrderService.parse_money_string(row['Refunded Amount']),
-                        up_charged_by=str(row['Up-Charged By']) if not pd.isna(row['Up-Charged By']) else '',
-                        cash_accepted_by=str(row['Cash Accepted By']) if not pd.isna(row['Cash Accepted By']) else '',
-                        created_by=str(row['Created By']) if not pd.isna(row['Created By']) else '',
-                        employee=str(row['Employee']) if not pd.isna(row['Employee']) else '',
-                        location=location_id
+            for df in OrderService.iter_csv_chunks(csv_content):
+                # Check if required columns exist
+                missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+                if missing_columns:
+                    raise ValueError(f"Missing required columns: {missing_columns}")
+                
+                # Vectorized transform into a clean, typed frame
+                transformed = OrderService.transform_orders_frame(df, location_id, start_date, end_date, timezone)
+                orders_frame = transformed["orders"]
+                
+                if use_staging:
+                    staged_rows += OrderService.stage_orders(orders_frame, staging_db)
+                    staging_db.commit()
+                    orders_skipped += transformed["orders_skipped"]
+                else:
+                    # Insert; rows whose dedup key already exists are skipped by the database
+                    created = OrderService.bulk_insert_orders(orders_frame, db)
+                    orders_created += created
+                    orders_skipped += transformed["orders_skipped"] + len(orders_frame) - created
+                total_rows += transformed["total_rows"]
+                errors.extend(transformed["errors"])
+                
+                if transformed["dated_rows"]:
+                    chunk_min = transformed["ordered_at_min"].to_pydatetime()
+                    chunk_max = transformed["ordered_at_max"].to_pydatetime()
+                    min_csv_date = chunk_min if min_csv_date is None else min(min_csv_date, chunk_min)
+                    max_csv_date = chunk_max if max_csv_date is None else max(max_csv_date, chunk_max)
+                
+                # Span of the rows kept for import (inside the period, if one is given)
+                if not orders_frame.empty:
+                    chunk_min = orders_frame['local_date'].min()
+                    chunk_max = orders_frame['local_date'].max()
+                    min_imported_date = chunk_min if min_imported_date is None else min(min_imported_date, chunk_min)
+                    max_imported_date = chunk_max if max_imported_date is None else max(max_imported_date, chunk_max)
+                
+                if progress_callback:
+                    progress_callback({
+                        "rows_processed": total_rows,
+                        "orders_created": orders_created,
+                        "orders_skipped": orders_skipped,
+                        "error_count": len(errors)
+                    })
+            
+            if use_staging:
+                swap = OrderService.swap_in_staged_orders(
+                    location_id,
+                    datetime.strptime(start_date, "%Y-%m-%d"),
+                    datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1),
+                    staging_db
+                )
+                orders_created = swap["inserted"]
+                orders_skipped += staged_rows - swap["inserted"]
+                OrderService.drop_orders_staging(staging_db)
+                logger.info(f"Swapped in {swap['inserted']} staged orders, replacing {swap['deleted']}")
+            else:
+                # Rebuild the sales rollup for every day the import could have changed (staged imports do it at swap)
+                spans = []
+                if min_csv_date is not None:
+                    spans.append((min_csv_date, max_csv_date + timedelta(seconds=1)))
+                if overwrite_existing and start_date and end_date:
+                    spans.append((start_datetime, end_datetime))
+                if spans:
+                    refresh_sales_hourly_for_datetimes(
+                        db, location_id, min(start for start, _ in spans), max(end for _, end in spans)
                     )
-                    
-                    db.add(order)
-                    orders_created += 1
-                    
-                except Exception as e:
-                    error_msg = f"Error processing row {index + 1}: {str(e)}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
-                    orders_skipped += 1
-                    logger.info("error processing row %s: %s", index, error_msg)
-                    continue
+                bump_order_data_version(db, location_id)
             
             # Commit all changes
             db.commit()
@@ -323,30 +856,131 @@ class OrderService:
                 "orders_created": orders_created,
                 "orders_skipped": orders_skipped,
                 "errors": errors,
-                "total_rows_processed": len(df)
+                "total_rows_processed": total_rows,
+                "csv_min_date": min_csv_date.date().isoformat() if min_csv_date else None,
+                "csv_max_date": max_csv_date.date().isoformat() if max_csv_date else None,
+                "imported_min_date": min_imported_date.isoformat() if min_imported_date else None,
+                "imported_max_date": max_imported_date.isoformat() if max_imported_date else None
             }
             
         except Exception as e:
             db.rollback()
+            if staging_db is not None:
+                try:
+                    OrderService.drop_orders_staging(staging_db)
+                except Exception as drop_error:
+                    logger.warning(f"Could not drop orders staging table: {drop_error}")
             logger.error(f"Error processing CSV: {str(e)}")
             raise ValueError(f"Error processing CSV file: {str(e)}")
+        
+        finally:
+            if staging_db is not None:
+                connection = staging_db.get_bind()
+                staging_db.close()
+                connection.close()
     
     @staticmethod
     def get_orders_by_location(location_id: int, db: Session, limit: int = 100) -> List[Order]:
-        """Get orders for a specific location"""
-        return db.query(Order).filter(Order.location == location_id).limit(limit).all()
+        """Get the most recent orders for a specific location"""
+        return db.query(Order).filter(Order.location == location_id).order_by(
+            Order.ordered_at.desc(), Order.id.desc()
+        ).limit(limit).all()
+    
+    @staticmethod
+    def encode_order_cursor(order: Order) -> str:
+        """Opaque keyset cursor for the position just after `order` in (ordered_at, id) order"""
+        position = json.dumps([order.ordered_at.isoformat(), order.id])
+        return base64.urlsafe_b64encode(position.encode()).decode().rstrip("=")
+    
+    @staticmethod
+    def decode_order_cursor(cursor: str) -> Tuple[datetime, int]:
+        """(ordered_at, id) from encode_order_cursor; ValueError if the cursor is malformed"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            ordered_at, order_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return datetime.fromisoformat(ordered_at), int(order_id)
+        except Exception:
+            raise ValueError("Invalid cursor")
+    
+    @staticmethod
+    def orders_listing_query(
+        location_id: int,
+        start_datetime: datetime = None,
+        end_datetime: datetime = None,
+        status: str = None,
+        after: Tuple[datetime, int] = None,
+        descending: bool = True
+    ):
+        """
+        SELECT of a location's orders in keyset order (ordered_at, id), optionally within
+        [start_datetime, end_datetime), with one status, and strictly after the cursor position `after`.
+        The cursor also bounds ordered_at on its own, so the index range and partition pruning apply.
+        """
+        query = select(Order).where(Order.location == location_id)
+        if start_datetime:
+            query = query.where(Order.ordered_at >= start_datetime)
+        if end_datetime:
+            query = query.where(Order.ordered_at < end_datetime)
+        if status:
+            query = query.where(Order.status == status)
+        if after:
+            position = tuple_(Order.ordered_at, Order.id)
+            if descending:
+                query = query.where(Order.ordered_at <= after[0], position < tuple_(*after))
+            else:
+                query = query.where(Order.ordered_at >= after[0], position > tuple_(*after))
+        if descending:
+            return query.order_by(Order.ordered_at.desc(), Order.id.desc())
+        return query.order_by(Order.ordered_at, Order.id)
+    
+    @staticmethod
+    def get_orders_page(
+        location_id: int,
+        db: Session,
+        limit: int = 100,
+        cursor: str = None,
+        descending: bool = True,
+        **filters
+    ) -> Dict[str, Any]:
+        """
+        One page of orders_listing_query, starting after `cursor`.
+        Returns {"orders": [Order], "next_cursor": str or None (no more pages)}
+        """
+        after = OrderService.decode_order_cursor(cursor) if cursor else None
+        query = OrderService.orders_listing_query(location_id, after=after, descending=descending, **filters)
+        orders = db.execute(query.limit(limit + 1)).scalars().all()
+        next_cursor = OrderService.encode_order_cursor(orders[limit - 1]) if len(orders) > limit else None
+        return {"orders": orders[:limit], "next_cursor": next_cursor}
+    
+    @staticmethod
+    def iter_order_batches(
+        location_id: int,
+        db: Session,
+        cursor: str = None,
+        descending: bool = True,
+        batch_size: int = ORDER_STREAM_BATCH_SIZE,
+        **filters
+    ) -> Iterator[List[Order]]:
+        """
+        Every order of orders_listing_query after `cursor`, batch_size at a time, through a server-side
+        cursor (yield_per), so a full-range pull holds one batch in memory
+        """
+        after = OrderService.decode_order_cursor(cursor) if cursor else None
+        query = OrderService.orders_listing_query(location_id, after=after, descending=descending, **filters)
+        result = db.execute(query.execution_options(yield_per=batch_size))
+        for batch in result.scalars().partitions():
+            yield batch
     
     @staticmethod
     def get_orders_summary(location_id: int, db: Session) -> Dict[str, Any]:
-        """Get summary statistics for orders at a location"""
-        total_orders = db.query(Order).filter(Order.location == location_id).count()
-        total_sales = db.query(Order).filter(Order.location == location_id).with_entities(
-            func.sum(Order.total)
-        ).scalar() or 0.0
+        """Get summary statistics for orders at a location (count and sum in one query)"""
+        total_orders, total_sales = db.query(func.count(Order.id), func.sum(Order.total)).filter(
+            Order.location == location_id
+        ).one()
         
         return {
             "total_orders": total_orders,
-            "total_sales": float(total_sales)
+            "total_sales": float(total_sales or 0.0)
         }
 
     @staticmethod
@@ -356,62 +990,22 @@ class OrderService:
         end_date: str = None, 
         db: Session = None
     ) -> Dict[str, Any]:
-        """Get summary statistics for orders at a location within a date range"""
-        from datetime import datetime, timedelta
-        
-        query = db.query(Order).filter(Order.location == location_id)
-        
-        # Apply date filters if provided
-        if start_date:
-            start_datetime = datetime.strptime(start_date, "%Y-%m-%d")
-            query = query.filter(Order.ordered_at >= start_datetime)
-        
-        if end_date:
-            # Add one day to include the entire end date
-            end_datetime = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)
-            query = query.filter(Order.ordered_at < end_datetime)
-        
-        # Get total orders count
-        total_orders = query.count()
-        
-        # Get aggregated sales data
-        result = query.with_entities(
-            func.sum(Order.total).label('total_sales'),
-            func.sum(Order.subtotal).label('total_subtotal'),
-            func.sum(Order.gross_sales).label('total_gross_sales'),
-            func.sum(Order.net_sales).label('total_net_sales'),
-            func.sum(Order.tax).label('total_tax'),
-            func.sum(Order.estimated_third_party_taxes).label('total_estimated_third_party_taxes'),
-            func.sum(Order.tips).label('total_tips'),
-            func.sum(Order.delivery_charge).label('total_delivery_charge'),
-            func.sum(Order.custom_discounts).label('total_discounts'),
-            func.sum(Order.refunded_amount).label('total_refunds'),
-            func.sum(Order.cash).label('total_cash'),
-            func.sum(Order.gift_card_redemption).label('total_gift_card_redemption'),
-            func.sum(Order.store_credit_redemption).label('total_store_credit_redemption'),
-            func.sum(Order.processing_fee).label('total_processing_fees'),
-            func.sum(Order.snackpass_fee).label('total_snackpass_fees')
-        ).first()
+        """
+        Get summary statistics for orders at a location within a date range
+        Read from the sales_hourly rollup (at most 24 rows per day) rather than the orders themselves,
+        and cached in process until the location's orders next change (see order_cache_service)
+        """
+        from datetime import datetime
         
-
+        start = datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else None
+        end = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else None
+        summary = cached_order_summary(
+            db, location_id, start, end,
+            lambda: get_sales_summary(db, location_id, start_date=start, end_date=end)
+        )
         
         return {
-            "total_orders": total_orders,
-            "total_sales": float(result.total_sales or 0.0),
-            "total_subtotal": float(result.total_subtotal or 0.0),
-            "total_gross_sales": float(result.total_gross_sales or 0.0),
-            "total_net_sales": float(result.total_net_sales or 0.0),
-            "total_tax": float(result.total_tax or 0.0),
-            "total_estimated_third_party_taxes": float(result.total_estimated_third_party_taxes or 0.0),
-            "total_tips": float(result.total_tips or 0.0),
-            "total_delivery_charge": float(result.total_delivery_charge or 0.0),
-            "total_discounts": float(result.total_discounts or 0.0),
-            "total_refunds": float(result.total_refunds or 0.0),
-            "total_cash": float(result.total_cash or 0.0),
-            "total_gift_card_redemption": float(result.total_gift_card_redemption or 0.0),
-            "total_store_credit_redemption": float(result.total_store_credit_redemption or 0.0),
-            "total_processing_fees": float(result.total_processing_fees or 0.0),
-            "total_snackpass_fees": float(result.total_snackpass_fees or 0.0),
+            **summary,
             "start_date": start_date,
             "end_date": end_date
         }
@@ -423,7 +1017,11 @@ class OrderService:
         end_date: str,
         db: Session
     ) -> Dict[str, Any]:
-        """Delete orders for a specific location within a date range"""
+        """
+        Delete orders for a specific location within a date range
+        Months the range covers completely are emptied by truncating their partition (which is kept, so the
+        parent orders table is not locked); the rest row by row
+        """
         from datetime import datetime, timedelta
         
         try:
@@ -431,18 +1029,12 @@ class OrderService:
             start_datetime = datetime.strptime(start_date, "%Y-%m-%d")
             end_datetime = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)
             
-            # Query orders to be deleted
-            orders_to_delete = db.query(Order).filter(
-                Order.location == location_id,
-                Order.ordered_at >= start_datetime,
-                Order.ordered_at < end_datetime
-            )
-            
-            # Count orders before deletion
-            orders_count = orders_to_delete.count()
-            
-            # Delete the orders
-            deleted_count = orders_to_delete.delete()
+            # Delete the orders, and forget manifest entries for files covering the range
+            deleted_count = delete_orders_in_range(db, location_id, start_datetime, end_datetime)
+            delete_order_items_in_range(db, location_id, start_datetime, end_datetime)
+            refresh_sales_hourly_for_datetimes(db, location_id, start_datetime, end_datetime)
+            bump_order_data_version(db, location_id)
+            forget_uploads_in_range(db, location_id, start_datetime.date(), end_datetime.date() - timedelta(days=1))
             
             # Commit the changes
             db.commit()
@@ -452,7 +1044,7 @@ class OrderService:
             return {
                 "success": True,
                 "deleted_count": deleted_count,
-                "orders_count": orders_count,
+                "orders_count": deleted_count,
                 "location_id": location_id,
                 "start_date": start_date,
                 "end_date": end_date
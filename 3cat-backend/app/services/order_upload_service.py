@@ -0,0 +1,175 @@
+# services/order_upload_service.py
+import hashlib
+from datetime import date
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import logger
+from app.models.order_upload import OrderUpload
+
+# Bytes per read when hashing a file on disk
+HASH_CHUNK_BYTES = 1024 * 1024
+
+# Row-level errors kept in the manifest's stored result
+MANIFEST_MAX_ERRORS = 100
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 hex digest of a file, read in fixed-size chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def serialize_upload(upload: OrderUpload) -> Dict[str, Any]:
+    """JSON-friendly view of a manifest row"""
+    return {
+        "id": upload.id,
+        "location_id": upload.location_id,
+        "content_sha256": upload.content_sha256,
+        "filename": upload.filename,
+        "file_size": upload.file_size,
+        "rows": upload.rows,
+        "orders_created": upload.orders_created,
+        "orders_skipped": upload.orders_skipped,
+        "imported_min_date": upload.imported_min_date.isoformat() if upload.imported_min_date else None,
+        "imported_max_date": upload.imported_max_date.isoformat() if upload.imported_max_date else None,
+        "period_start_date": upload.period_start_date,
+        "period_end_date": upload.period_end_date,
+        "blob_container": upload.blob_container,
+        "blob_path": upload.blob_path,
+        "created_at": upload.created_at.isoformat() if upload.created_at else None,
+    }
+
+
+def upload_period(period_start_date: Optional[str], period_end_date: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """The (start, end) period an import filters rows to; (None, None) when it imports the whole file"""
+    if period_start_date and period_end_date:
+        return period_start_date, period_end_date
+    return None, None
+
+
+def find_upload(
+    db: Session,
+    location_id: int,
+    content_sha256: str,
+    period_start_date: Optional[str] = None,
+    period_end_date: Optional[str] = None,
+) -> Optional[OrderUpload]:
+    """
+    Manifest row for an identical file already imported for this location over a period that covers the
+    requested one, if any: a whole-file import covers any period, a period import covers the periods
+    inside it (a whole-file request is only covered by a whole-file import)
+    """
+    start, end = upload_period(period_start_date, period_end_date)
+    query = db.query(OrderUpload).filter(
+        OrderUpload.location_id == location_id,
+        OrderUpload.content_sha256 == content_sha256
+    )
+    if start:
+        query = query.filter(or_(
+            OrderUpload.period_start_date.is_(None),
+            and_(OrderUpload.period_start_date <= start, OrderUpload.period_end_date >= end)
+        ))
+    else:
+        query = query.filter(OrderUpload.period_start_date.is_(None))
+    return query.first()
+
+
+def duplicate_upload_response(upload: OrderUpload) -> Dict[str, Any]:
+    """Response returned instead of re-importing a file that is already in the manifest"""
+    return {
+        "success": True,
+        "duplicate_upload": True,
+        "upload": serialize_upload(upload),
+        "order_processing": upload.result,
+        "message": f"Identical file already imported on {upload.created_at:%Y-%m-%d %H:%M} (no changes made)"
+                   if upload.created_at else "Identical file already imported (no changes made)",
+    }
+
+
+def record_upload(
+    db: Session,
+    location_id: int,
+    content_sha256: str,
+    processing_result: Dict[str, Any],
+    filename: Optional[str] = None,
+    file_size: Optional[int] = None,
+    period_start_date: Optional[str] = None,
+    period_end_date: Optional[str] = None,
+    blob_container: Optional[str] = None,
+    blob_path: Optional[str] = None,
+) -> Optional[OrderUpload]:
+    """
+    Add a successful import to the manifest (replacing an older row for the same file and period), with
+    the date span it actually imported (processing_result imported_min_date / imported_max_date).
+    A concurrent identical upload that recorded first wins; returns None in that case.
+    """
+    period_start_date, period_end_date = upload_period(period_start_date, period_end_date)
+    imported_min_date = processing_result.get("imported_min_date")
+    imported_max_date = processing_result.get("imported_max_date")
+    same_period = (
+        and_(OrderUpload.period_start_date == period_start_date, OrderUpload.period_end_date == period_end_date)
+        if period_start_date else OrderUpload.period_start_date.is_(None)
+    )
+    try:
+        db.query(OrderUpload).filter(
+            OrderUpload.location_id == location_id,
+            OrderUpload.content_sha256 == content_sha256,
+            same_period
+        ).delete(synchronize_session=False)
+        upload = OrderUpload(
+            location_id=location_id,
+            content_sha256=content_sha256,
+            filename=filename,
+            file_size=file_size,
+            rows=processing_result.get("total_rows_processed", 0),
+            orders_created=processing_result.get("orders_created", 0),
+            orders_skipped=processing_result.get("orders_skipped", 0),
+            imported_min_date=date.fromisoformat(imported_min_date) if imported_min_date else None,
+            imported_max_date=date.fromisoformat(imported_max_date) if imported_max_date else None,
+            period_start_date=period_start_date,
+            period_end_date=period_end_date,
+            blob_container=blob_container,
+            blob_path=blob_path,
+            result={**processing_result, "errors": processing_result.get("errors", [])[:MANIFEST_MAX_ERRORS]},
+        )
+        db.add(upload)
+        db.commit()
+        return upload
+    except IntegrityError:
+        db.rollback()
+        logger.warning(f"Upload {content_sha256[:12]} for location {location_id} was recorded concurrently")
+        return None
+
+
+def forget_uploads_in_range(db: Session, location_id: int, start: date, end: date) -> int:
+    """
+    Drop manifest rows whose imported date span overlaps [start, end] (inclusive dates), so files whose
+    orders were deleted can be imported again. Runs in the caller's transaction; returns rows removed.
+    """
+    return db.query(OrderUpload).filter(
+        OrderUpload.location_id == location_id,
+        OrderUpload.imported_min_date <= end,
+        OrderUpload.imported_max_date >= start
+    ).delete(synchronize_session=False)
+
+
+def list_uploads(
+    db: Session,
+    location_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> List[Dict[str, Any]]:
+    """Manifest rows for a location, optionally only those overlapping [start_date, end_date], by imported date span"""
+    query = db.query(OrderUpload).filter(OrderUpload.location_id == location_id)
+    if start_date:
+        query = query.filter(OrderUpload.imported_max_date >= start_date)
+    if end_date:
+        query = query.filter(OrderUpload.imported_min_date <= end_date)
+    uploads = query.order_by(OrderUpload.imported_min_date, OrderUpload.id).all()
+    return [serialize_upload(u) for u in uploads]
@@ -0,0 +1,130 @@
+# services/sales_forecast_service.py
+from datetime import date, timedelta
+from typing import Dict, Any
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.sales_hourly import SalesHourly
+
+# Trailing weeks used by default, and how much each older week counts relative to the next newer one
+FORECAST_DEFAULT_WEEKS = 8
+FORECAST_WEEK_DECAY = 0.85
+
+# Fewest weeks with sales needed to fit a trend, and how far the trend may move the forecast
+FORECAST_MIN_TREND_WEEKS = 3
+FORECAST_TREND_LIMITS = (0.75, 1.25)
+
+# Band half-width in weighted standard deviations (~80% interval)
+FORECAST_BAND_Z = 1.28
+
+
+def get_hourly_net_sales_matrix(db: Session, location_id: int, start_date: date, weeks: int) -> np.ndarray:
+    """
+    Net sales for the `weeks` weeks starting at start_date as a (week, day of week, hour) array, from one
+    aggregate query over sales_hourly. Day 0 is start_date's weekday; hours without sales are 0.
+    """
+    end_date = start_date + timedelta(days=7 * weeks)
+    rows = (
+        db.query(SalesHourly.local_date, SalesHourly.hour, func.sum(SalesHourly.net_sales))
+        .filter(SalesHourly.location == location_id)
+        .filter(SalesHourly.local_date >= start_date, SalesHourly.local_date < end_date)
+        .group_by(SalesHourly.local_date, SalesHourly.hour)
+        .all()
+    )
+    matrix = np.zeros((weeks, 7, 24))
+    if rows:
+        days = np.array([(row[0] - start_date).days for row in rows])
+        hours = np.array([row[1] for row in rows])
+        sales = np.array([float(row[2] or 0.0) for row in rows])
+        np.add.at(matrix, (days // 7, days % 7, hours), sales)
+    return matrix
+
+
+def forecast_from_history(history: np.ndarray) -> Dict[str, Any]:
+    """
+    Forecast the week after a (week, day, hour) history, oldest week first, in one vectorized pass:
+    - each (day, hour) is a weighted average of the same cell in past weeks, newer weeks weighted more
+      (FORECAST_WEEK_DECAY per week of age); weeks without any sales (before opening, missing uploads) are ignored
+    - a linear trend over the weekly totals scales the whole week, within FORECAST_TREND_LIMITS
+    - the band is FORECAST_BAND_Z weighted standard deviations of each cell, scaled like the forecast
+    Returns arrays of shape (day, hour) for forecast/lower/upper/std, plus trend_factor and weeks_used.
+    """
+    weeks = history.shape[0]
+    weekly_totals = history.sum(axis=(1, 2))
+    valid = weekly_totals > 0
+    weights = np.where(valid, FORECAST_WEEK_DECAY ** np.arange(weeks - 1, -1, -1), 0.0)
+
+    if not valid.any():
+        zeros = np.zeros(history.shape[1:])
+        return {"forecast": zeros, "lower": zeros, "upper": zeros, "std": zeros, "trend_factor": 1.0, "weeks_used": 0}
+
+    weights = weights / weights.sum()
+    mean = np.tensordot(weights, history, axes=1)
+    std = np.sqrt(np.tensordot(weights, (history - mean) ** 2, axes=1))
+
+    trend_factor = 1.0
+    if valid.sum() >= FORECAST_MIN_TREND_WEEKS:
+        slope, intercept = np.polyfit(np.arange(weeks)[valid], weekly_totals[valid], 1)
+        baseline = float(weights @ weekly_totals)
+        projected = intercept + slope * weeks
+        trend_factor = float(np.clip(projected / baseline, *FORECAST_TREND_LIMITS))
+
+    forecast = mean * trend_factor
+    std = std * trend_factor
+    return {
+        "forecast": forecast,
+        "lower": np.maximum(forecast - FORECAST_BAND_Z * std, 0.0),
+        "upper": forecast + FORECAST_BAND_Z * std,
+        "std": std,
+        "trend_factor": trend_factor,
+        "weeks_used": int(valid.sum()),
+    }
+
+
+def forecast_hourly_net_sales(
+    db: Session,
+    location_id: int,
+    week_start: date,
+    weeks: int = FORECAST_DEFAULT_WEEKS,
+) -> Dict[str, Any]:
+    """
+    Hourly net sales forecast for the 7 days from week_start, from the `weeks` weeks before it.
+    Hours no past week had sales in are left out. Day totals get a band from the hourly variances
+    (treating hours as independent).
+    """
+    history = get_hourly_net_sales_matrix(db, location_id, week_start - timedelta(days=7 * weeks), weeks)
+    result = forecast_from_history(history)
+    open_hours = history.any(axis=0)
+    day_std = np.sqrt((result["std"] ** 2).sum(axis=1))
+
+    days = []
+    for day in range(7):
+        local_date = week_start + timedelta(days=day)
+        total = float(result["forecast"][day].sum())
+        days.append({
+            "date": local_date.isoformat(),
+            "day": local_date.strftime("%A"),
+            "forecast": round(total, 2),
+            "lower": round(max(total - FORECAST_BAND_Z * float(day_std[day]), 0.0), 2),
+            "upper": round(total + FORECAST_BAND_Z * float(day_std[day]), 2),
+            "hours": [
+                {
+                    "hour": hour,
+                    "forecast": round(float(result["forecast"][day, hour]), 2),
+                    "lower": round(float(result["lower"][day, hour]), 2),
+                    "upper": round(float(result["upper"][day, hour]), 2),
+                }
+                for hour in np.flatnonzero(open_hours[day]).tolist()
+            ],
+        })
+
+    return {
+        "location_id": location_id,
+        "week_start": week_start.isoformat(),
+        "history_weeks": weeks,
+        "weeks_used": result["weeks_used"],
+        "trend_factor": round(result["trend_factor"], 4),
+        "total_forecast": round(float(result["forecast"].sum()), 2),
+        "days": days,
+    }
@@ -0,0 +1,169 @@
+# services/sales_rollup_service.py
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional
+from sqlalchemy import and_, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.config import logger
+from app.models.order import Order
+from app.models.sales_hourly import SalesHourly
+from app.services.order_cache_service import bump_order_data_version, lock_order_data_version
+
+# Order money columns summed into sales_hourly (same names on both tables)
+ROLLUP_SUM_COLUMNS = [
+    "total", "subtotal", "gross_sales", "net_sales", "tax", "estimated_third_party_taxes", "tips",
+    "delivery_charge", "custom_discounts", "refunded_amount", "cash", "gift_card_redemption",
+    "store_credit_redemption", "processing_fee", "snackpass_fee",
+]
+
+# get_sales_summary key -> sales_hourly column (the /orders/summary response shape)
+SUMMARY_FIELDS = {
+    "total_sales": "total",
+    "total_subtotal": "subtotal",
+    "total_gross_sales": "gross_sales",
+    "total_net_sales": "net_sales",
+    "total_tax": "tax",
+    "total_estimated_third_party_taxes": "estimated_third_party_taxes",
+    "total_tips": "tips",
+    "total_delivery_charge": "delivery_charge",
+    "total_discounts": "custom_discounts",
+    "total_refunds": "refunded_amount",
+    "total_cash": "cash",
+    "total_gift_card_redemption": "gift_card_redemption",
+    "total_store_credit_redemption": "store_credit_redemption",
+    "total_processing_fees": "processing_fee",
+    "total_snackpass_fees": "snackpass_fee",
+}
+
+# Days rebuilt per transaction by backfill_sales_hourly
+BACKFILL_BATCH_DAYS = 31
+
+
+def refresh_sales_hourly(db: Session, location_id: int, start_date: date, end_date: date) -> int:
+    """
+    Rebuild a location's sales_hourly rows for local dates [start_date, end_date) from orders, in the
+    caller's transaction (so the rollup commits or rolls back with the order changes that triggered it).
+    The location's order_data_versions row is locked first, so concurrent rebuilds of overlapping days
+    run one after the other instead of both inserting the same (location, date, hour) rows.
+    Returns the number of rollup rows written.
+    """
+    lock_order_data_version(db, location_id)
+    db.query(SalesHourly).filter(
+        SalesHourly.location == location_id,
+        SalesHourly.local_date >= start_date,
+        SalesHourly.local_date < end_date
+    ).delete(synchronize_session=False)
+
+    # Group on the stored local_date / local_hour columns; the (equivalent) ordered_at bounds prune partitions
+    source = (
+        select(
+            Order.location,
+            Order.local_date,
+            Order.local_hour,
+            func.count(),
+            *[func.coalesce(func.sum(getattr(Order, column)), 0.0) for column in ROLLUP_SUM_COLUMNS],
+        )
+        .where(Order.location == location_id)
+        .where(Order.local_date >= start_date, Order.local_date < end_date)
+        .where(Order.ordered_at >= datetime.combine(start_date, datetime.min.time()))
+        .where(Order.ordered_at < datetime.combine(end_date, datetime.min.time()))
+        .group_by(Order.location, Order.local_date, Order.local_hour)
+    )
+    result = db.execute(
+        insert(SalesHourly).from_select(
+            ["location", "local_date", "hour", "order_count", *ROLLUP_SUM_COLUMNS], source
+        )
+    )
+    return result.rowcount
+
+
+def refresh_sales_hourly_for_datetimes(
+    db: Session,
+    location_id: int,
+    start_datetime: Optional[datetime],
+    end_datetime: Optional[datetime],
+) -> int:
+    """refresh_sales_hourly over the whole days touched by [start_datetime, end_datetime); no-op without a range"""
+    if start_datetime is None or end_datetime is None or end_datetime <= start_datetime:
+        return 0
+    end_date = (end_datetime - timedelta(microseconds=1)).date() + timedelta(days=1)
+    return refresh_sales_hourly(db, location_id, start_datetime.date(), end_date)
+
+
+def backfill_sales_hourly(
+    db: Session,
+    location_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Dict[str, Any]:
+    """
+    Rebuild sales_hourly from orders for one or every location, over [start_date, end_date] or the
+    location's whole order history, BACKFILL_BATCH_DAYS per transaction
+    """
+    query = db.query(Order.location, func.min(Order.ordered_at), func.max(Order.ordered_at))
+    if location_id is not None:
+        query = query.filter(Order.location == location_id)
+    spans = query.group_by(Order.location).all()
+
+    rows_written = 0
+    for location, first_order, last_order in spans:
+        start = start_date or first_order.date()
+        end = (end_date or last_order.date()) + timedelta(days=1)
+        batch_start = start
+        while batch_start < end:
+            batch_end = min(batch_start + timedelta(days=BACKFILL_BATCH_DAYS), end)
+            rows_written += refresh_sales_hourly(db, location, batch_start, batch_end)
+            bump_order_data_version(db, location)
+            db.commit()
+            batch_start = batch_end
+        logger.info(f"Backfilled sales_hourly for location {location} from {start} to {end - timedelta(days=1)}")
+
+    return {"locations": len(spans), "rows_written": rows_written}
+
+
+def get_sales_summary(
+    db: Session,
+    location_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> Dict[str, Any]:
+    """Order count and money totals for a location over local dates [start_date, end_date] (inclusive), one query"""
+    query = db.query(
+        func.sum(SalesHourly.order_count).label("total_orders"),
+        *[func.sum(getattr(SalesHourly, column)).label(key) for key, column in SUMMARY_FIELDS.items()],
+    ).filter(SalesHourly.location == location_id)
+    if start_date:
+        query = query.filter(SalesHourly.local_date >= start_date)
+    if end_date:
+        query = query.filter(SalesHourly.local_date <= end_date)
+    result = query.one()
+
+    return {
+        "total_orders": int(result.total_orders or 0),
+        **{key: float(getattr(result, key) or 0.0) for key in SUMMARY_FIELDS},
+    }
+
+
+def get_two_week_hourly_net_sales(db: Session, location_id: int, start_date: date, end_date: date) -> List[Any]:
+    """
+    Hourly net sales for local dates [start_date, end_date) and for the same window a week earlier, in one
+    scan of the two-week span: rows of (local_date, hour, current_net_sales, prev_week_net_sales) in time
+    order, where each sales column is NULL when the row falls outside that window (conditional aggregation)
+    """
+    week = timedelta(days=7)
+    in_current = and_(SalesHourly.local_date >= start_date, SalesHourly.local_date < end_date)
+    in_prev_week = and_(SalesHourly.local_date >= start_date - week, SalesHourly.local_date < end_date - week)
+    return (
+        db.query(
+            SalesHourly.local_date,
+            SalesHourly.hour,
+            func.sum(SalesHourly.net_sales).filter(in_current).label("current_net_sales"),
+            func.sum(SalesHourly.net_sales).filter(in_prev_week).label("prev_week_net_sales"),
+        )
+        .filter(SalesHourly.location == location_id)
+        .filter(SalesHourly.local_date >= min(start_date, start_date - week))
+        .filter(SalesHourly.local_date < max(end_date, end_date - week))
+        .group_by(SalesHourly.local_date, SalesHourly.hour)
+        .order_by(SalesHourly.local_date, SalesHourly.hour)
+        .all()
+    )
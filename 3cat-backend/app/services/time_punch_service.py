@@ -1,9 +1,12 @@
 # services/time_punch_service.py
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date
 from zoneinfo import ZoneInfo
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+import asyncio
 import requests
 from typing import List, Dict, Any, Optional
+import numpy as np
+from fastapi import HTTPException
 from app.config import settings, logger
 import httpx
 
@@ -13,6 +16,23 @@ DAILY_OT_THRESHOLD = 8.0   # after 8h/day → OT
 DAILY_DBL_THRESHOLD = 12.0  # after 12h/day → Double OT
 WEEKLY_OT_THRESHOLD = 40.0  # after 40h/week → OT
 
+PACIFIC_TZ = ZoneInfo("America/Los_Angeles")
+DAYS_MAP = {0: "Monday", 1: "Tuesday", 2: "Wednesday",
+            3: "Thursday", 4: "Friday", 5: "Saturday", 6: "Sunday"}
+
+# Supported labor heatmap resolutions (minutes per bin)
+HEATMAP_BIN_MINUTES = (15, 30, 60)
+MINUTES_PER_DAY = 24 * 60
+
+# Multi-week labor range: upper bound on weeks per request and on concurrent 7shifts calls
+MAX_RANGE_WEEKS = 52
+RANGE_FETCH_CONCURRENCY = 4
+
+# Aggregated labor for weeks that have already ended, keyed by (week_start, location_id).
+# Past schedules don't change, so these are reused across requests instead of re-fetched.
+COMPLETED_WEEK_CACHE_SIZE = 256
+_completed_week_labor_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+
 # Configuration - Move this to a config file later
 BASE_URL = "https://api.7shifts.com/v2"
 COMPANY_ID = settings.SEVEN_SHIFTS_COMPANY_ID  # Add your company ID
@@ -411,321 +431,320 @@ async def get_shifts_for_week(week_start_date: datetime, location_id: Optional[i
             detail=f"Error fetching shift data: {str(e)}"
         )
 
-def process_shifts_to_hourly_labor_data_with_overtime(
+def shift_to_time_punch(shift: Dict) -> Dict:
+    """
+    Convert a raw 7shifts shift into the "time punch" shape annotate_per_shift_overtime() expects.
+    Shift times are parsed once; the Pacific start/end datetimes are kept on the punch
+    (start_pacific / end_pacific) so later passes don't need to parse them again.
+    """
+    start_str = shift["start"].replace("Z", "+00:00")
+    end_str = shift["end"].replace("Z", "+00:00")
+    start_time_pacific = datetime.fromisoformat(start_str).astimezone(PACIFIC_TZ)
+    end_time_pacific = datetime.fromisoformat(end_str).astimezone(PACIFIC_TZ)
+
+    duration_hours = round((end_time_pacific - start_time_pacific).total_seconds() / 3600.0, 2)
+    # Only unpaid breaks come off the worked hours (same as to_hours() on the break tuple)
+    unpaid_break_hours, _ = calculate_break_duration_hours(shift.get("breaks", []))
+
+    return {
+        "user_id": shift.get("user_id"),
+        "clocked_in": start_str,
+        "clocked_out": end_str,
+        "hourly_wage": shift.get("hourly_wage", 0),  # cents or dollars
+        "breaks": shift.get("breaks", []),
+        "clocked_in_pacific": start_time_pacific.strftime("%I:%M%p").lstrip("0"),
+        "clocked_out_pacific": end_time_pacific.strftime("%I:%M%p").lstrip("0"),
+        "clocked_in_date_pacific": start_time_pacific.strftime("%-m/%-d/%Y"),
+        "shift_duration_minutes": duration_hours,  # (naming kept from get_all_time_punches)
+        "break_duration_minutes": unpaid_break_hours,
+        "net_worked_hours": round(max(0.0, duration_hours - unpaid_break_hours), 2),
+        "start_pacific": start_time_pacific,
+        "end_pacific": end_time_pacific,
+    }
+
+def iter_hour_overlaps(start: datetime, end: datetime):
+    """(day name, hour, hours worked in that hour) for each wall-clock hour [start, end) touches"""
+    current_time = start
+    while current_time < end:
+        hour_start = current_time.replace(minute=0, second=0, microsecond=0)
+        hour_end = hour_start + timedelta(hours=1)
+        overlap_duration = (min(end, hour_end) - current_time).total_seconds() / 3600
+        if overlap_duration > 0:
+            yield DAYS_MAP[current_time.weekday()], current_time.hour, overlap_duration
+        # bump to next wall clock hour
+        current_time = hour_end
+
+def aggregate_shifts_labor(
     shifts: List[Dict],
     business_hour_start: int = 7,   # 7 AM
-    business_hour_end: int = 24,    # 9 PM
+    business_hour_end: int = 24,    # overtime grid end
+    hourly_start: int = 7,          # 7 AM
+    hourly_end: int = 21,           # 9 PM
 ) -> Dict:
     """
-    Build hourly labor cost buckets with OT and double-OT using pre-annotated shift OT hours.
-    Expects each shift dict to have: start, end (ISO8601, usually with 'Z'), hourly_wage (cents or dollars),
-    and annotate_per_shift_overtime() to add: regular_hours, overtime_hours, double_ot_hours, net_worked_hours.
+    Single aggregation pass over a week of 7shifts shifts.
+    Each shift is parsed once and overtime is annotated once; walks over each shift's wall-clock
+    hours then fill every view the labor dashboard needs:
+      - daily:           {day: {"cost", "hours"}}
+      - hourly:          {day: {hour: cost}}  (simple cost, hourly_start..hourly_end)
+      - hourly_overtime: {day: {hour: {"regular_cost", "overtime_cost", "double_ot_cost", "total_cost"}}}
+                         (business_hour_start..business_hour_end)
+      - hourly_hours:    {day: {hour: scheduled labor hours}} (business_hour_start..business_hour_end)
+    The simple views are summed in shift order and skip the cost of shifts without a wage; the
+    overtime view is summed in annotated order and costs them at 0 (as the process_* helpers always did).
     """
-
-    days_map = {0: "Monday", 1: "Tuesday", 2: "Wednesday",
-                3: "Thursday", 4: "Friday", 5: "Saturday", 6: "Sunday"}
-
-    # Initialize hourly structure
-    hourly_labor_data: Dict[str, Dict[int, Dict[str, float]]] = {}
-
-    for day in days_map.values():
-        hourly_labor_data[day] = {}
-        for hour in range(business_hour_start, business_hour_end + 1):
-            hourly_labor_data[day][hour] = {
+    hourly_labor_data: Dict[str, Dict[int, float]] = {}
+    hourly_overtime_data: Dict[str, Dict[int, Dict[str, float]]] = {}
+    hourly_hours_data: Dict[str, Dict[int, float]] = {}
+    daily_hours: Dict[str, float] = {}
+
+    for day in DAYS_MAP.values():
+        hourly_labor_data[day] = {hour: 0.0 for hour in range(hourly_start, hourly_end + 1)}
+        hourly_overtime_data[day] = {
+            hour: {
                 "regular_cost": 0.0,
                 "overtime_cost": 0.0,
                 "double_ot_cost": 0.0,
                 "total_cost": 0.0,
             }
+            for hour in range(business_hour_start, business_hour_end + 1)
+        }
+        hourly_hours_data[day] = {hour: 0.0 for hour in range(business_hour_start, business_hour_end + 1)}
+        daily_hours[day] = 0.0
 
-    pacific_tz = ZoneInfo("America/Los_Angeles")
-
-    # 1) Convert raw shifts to "time punches" your annotator expects
+    # 1) Parse every shift exactly once
     time_punches = []
     for shift in shifts:
-        logger.info("shift", shift)
         try:
-            raw_duration = 0.0
-            raw_break_dur = 0.0
-            # Parse times (accept trailing 'Z')
-            start_str = shift["start"].replace("Z", "+00:00")
-            end_str = shift["end"].replace("Z", "+00:00")
-            start_time_utc = datetime.fromisoformat(start_str)
-            end_time_utc = datetime.fromisoformat(end_str)
-
-            # Build punch skeleton
-            time_punch = {
-                "user_id": shift.get("user_id"),
-                "clocked_in": start_str,   # keep ISO string for downstream
-                "clocked_out": end_str,
-                "hourly_wage": shift.get("hourly_wage", 0),  # cents or dollars
-                "breaks": shift.get("breaks", []),
-            }
-
-            # Optional helpers (assuming you have these)
-            if "convert_to_pacific_time_display" in globals():
-                time_punch["clocked_in_pacific"] = convert_to_pacific_time_display(shift["start"])
-                time_punch["clocked_out_pacific"] = convert_to_pacific_time_display(shift["end"])
-            if "extract_pacific_date" in globals():
-                time_punch["clocked_in_date_pacific"] = extract_pacific_date(shift["start"])
-            logger.info("time_punch", time_punch)
-            # Durations (names say minutes but look like hours in your code—keeping your vars)
-            if "calculate_shift_duration_hours" in globals():
-                raw_duration = calculate_shift_duration_hours(shift["start"], shift["end"])
-
-            else:
-                duration = (end_time_utc - start_time_utc).total_seconds() / 3600.0
-
-            if "calculate_break_duration_hours" in globals():
-                raw_break_dur = calculate_break_duration_hours(shift.get("breaks", []))
+            time_punches.append(shift_to_time_punch(shift))
+        except Exception as e:
+            logger.warning(f"Error converting shift {shift.get('id')} to time punch: {str(e)}")
+            continue
 
-            else:
-                break_dur = 0.0
-            
-            duration_hours = to_hours(raw_duration)
-            logger.info("duration raw=%r -> %s h", raw_duration, duration_hours)
-            break_hours = to_hours(raw_break_dur)
+    # Kept in shift order: annotate_per_shift_overtime sorts the list in place (by employee and clock-in)
+    punches_in_shift_order = list(time_punches)
 
-            time_punch["shift_duration_minutes"] = duration_hours  # (naming kept from your code)
-            time_punch["break_duration_minutes"] = break_hours
-            time_punch["net_worked_hours"] = round(max(0.0, duration_hours - break_hours), 2)
+    # 2) Reg/OT/DOT split per shift
+    annotated_punches = annotate_per_shift_overtime(time_punches)
 
-            time_punches.append(time_punch)
+    # 3) Simple views, summed in shift order
+    for punch in punches_in_shift_order:
+        start_time_pacific = punch["start_pacific"]
+        end_time_pacific = punch["end_pacific"]
 
-            logger.info("duration raw=%r -> %s h, breaks raw=%r -> %s h",
-            raw_duration, duration_hours, raw_break_dur, break_hours)
+        # Daily hours are scheduled duration, attributed to the start day
+        daily_hours[DAYS_MAP[start_time_pacific.weekday()]] += (
+            (end_time_pacific - start_time_pacific).total_seconds() / 3600
+        )
 
-        except Exception as e:
-            logger.warning(f"Error converting shift {shift.get('id')} to time punch: {str(e)}")
-            continue
+        # 7shifts wages are in cents; a shift without a wage (None) is left out of the cost grid
+        wage_raw = punch.get("hourly_wage", 0)
+        hourly_wage_simple = wage_raw / 100 if wage_raw is not None else None
 
-    # 2) Use your existing overtime annotator
-    annotated_punches = annotate_per_shift_overtime(time_punches)
+        for day_name, hour, overlap_duration in iter_hour_overlaps(start_time_pacific, end_time_pacific):
+            if hourly_wage_simple is not None and hourly_start <= hour <= hourly_end:
+                hourly_labor_data[day_name][hour] += overlap_duration * hourly_wage_simple
+            if business_hour_start <= hour <= business_hour_end:
+                hourly_hours_data[day_name][hour] += overlap_duration
 
-    # 3) Distribute annotated cost across hours, sequentially (regular -> OT -> double OT)
+    # 4) Overtime view, in annotated order
     for punch in annotated_punches:
         try:
-            # Parse again (this time from the punch, which still might have 'Z')
-            start_time_utc = datetime.fromisoformat(punch["clocked_in"].replace("Z", "+00:00"))
-            end_time_utc = datetime.fromisoformat(punch["clocked_out"].replace("Z", "+00:00"))
-
-            start_time_pacific = start_time_utc.astimezone(pacific_tz)
-            end_time_pacific = end_time_utc.astimezone(pacific_tz)
-
-            # Wage normalization: try to detect cents vs. dollars
-            wage_raw = punch.get("hourly_wage", 0)
-            if wage_raw is None:
-                wage_raw = 0
-            # Heuristic: if >= 100, likely cents (e.g., 1850 == $18.50)
+            # Wage normalization: heuristic, if >= 100 likely cents (e.g., 1850 == $18.50); None costs 0
+            wage_raw = punch.get("hourly_wage") or 0
             hourly_wage_dollars = wage_raw / 100.0 if wage_raw >= 100 else float(wage_raw)
-
             overtime_rate = hourly_wage_dollars * 1.5
             double_ot_rate = hourly_wage_dollars * 2.0
 
-            # OT annotation fields (be robust to naming)
             regular_hours = float(punch.get("regular_hours") or 0.0)
             overtime_hours = float(punch.get("overtime_hours") or 0.0)
             double_ot_hours = float(punch.get("double_ot_hours") or 0.0)
             total_worked_hours = float(punch.get("net_worked_hours") or (regular_hours + overtime_hours + double_ot_hours))
 
             hours_allocated = 0.0
-            current_time = start_time_pacific
-
-            while current_time < end_time_pacific and hours_allocated < total_worked_hours:
-                day_name = days_map[current_time.weekday()]
-                hour = current_time.hour
-
-                # Only bucket into business hours
-                if business_hour_start <= hour <= business_hour_end:
-                    hour_start = current_time.replace(minute=0, second=0, microsecond=0)
-                    hour_end = hour_start + timedelta(hours=1)
-
-                    overlap_start = max(current_time, hour_start)
-                    overlap_end = min(end_time_pacific, hour_end)
-
-                    if overlap_end > overlap_start:
-                        overlap_duration = (overlap_end - overlap_start).total_seconds() / 3600.0
-                        # Don't exceed annotated worked hours
-                        overlap_duration = min(overlap_duration, total_worked_hours - hours_allocated)
-
-                        if overlap_duration > 0:
-                            hour_regular_cost = 0.0
-                            hour_overtime_cost = 0.0
-                            hour_double_ot_cost = 0.0
-
-                            remaining = overlap_duration
-
-                            # Regular portion
-                            if hours_allocated < regular_hours and remaining > 0:
-                                reg_portion = min(remaining, regular_hours - hours_allocated)
-                                hour_regular_cost += reg_portion * hourly_wage_dollars
-                                hours_allocated += reg_portion
-                                remaining -= reg_portion
-
-                            # Overtime portion
-                            if hours_allocated < (regular_hours + overtime_hours) and remaining > 0:
-                                ot_cap = (regular_hours + overtime_hours) - hours_allocated
-                                ot_portion = min(remaining, ot_cap)
-                                hour_overtime_cost += ot_portion * overtime_rate
-                                hours_allocated += ot_portion
-                                remaining -= ot_portion
-
-                            # Double OT portion
-                            if remaining > 0:
-                                hour_double_ot_cost += remaining * double_ot_rate
-                                hours_allocated += remaining
-                                remaining = 0.0
-
-                            hour_total_cost = hour_regular_cost + hour_overtime_cost + hour_double_ot_cost
-
-                            bkt = hourly_labor_data[day_name][hour]
-                            bkt["regular_cost"] += hour_regular_cost
-                            bkt["overtime_cost"] += hour_overtime_cost
-                            bkt["double_ot_cost"] += hour_double_ot_cost
-                            bkt["total_cost"] += hour_total_cost
-
-                # bump to next wall clock hour
-                current_time = current_time.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+
+            for day_name, hour, overlap_duration in iter_hour_overlaps(punch["start_pacific"], punch["end_pacific"]):
+                # Cost is allocated sequentially (regular -> OT -> double OT),
+                # never beyond the annotated worked hours
+                if business_hour_start <= hour <= business_hour_end and hours_allocated < total_worked_hours:
+                    remaining = min(overlap_duration, total_worked_hours - hours_allocated)
+                    hour_regular_cost = 0.0
+                    hour_overtime_cost = 0.0
+                    hour_double_ot_cost = 0.0
+
+                    # Regular portion
+                    if hours_allocated < regular_hours and remaining > 0:
+                        reg_portion = min(remaining, regular_hours - hours_allocated)
+                        hour_regular_cost += reg_portion * hourly_wage_dollars
+                        hours_allocated += reg_portion
+                        remaining -= reg_portion
+
+                    # Overtime portion
+                    if hours_allocated < (regular_hours + overtime_hours) and remaining > 0:
+                        ot_portion = min(remaining, (regular_hours + overtime_hours) - hours_allocated)
+                        hour_overtime_cost += ot_portion * overtime_rate
+                        hours_allocated += ot_portion
+                        remaining -= ot_portion
+
+                    # Double OT portion
+                    if remaining > 0:
+                        hour_double_ot_cost += remaining * double_ot_rate
+                        hours_allocated += remaining
+
+                    bkt = hourly_overtime_data[day_name][hour]
+                    bkt["regular_cost"] += hour_regular_cost
+                    bkt["overtime_cost"] += hour_overtime_cost
+                    bkt["double_ot_cost"] += hour_double_ot_cost
+                    bkt["total_cost"] += hour_regular_cost + hour_overtime_cost + hour_double_ot_cost
 
         except Exception as e:
             logger.warning(f"Error processing overtime for punch {punch.get('user_id')}: {str(e)}")
             continue
 
-    # 4) Round for display
-    for day in hourly_labor_data:
+    # 5) Round for display; daily cost is the sum of the rounded hourly grid
+    daily_labor_data = {}
+    for day in DAYS_MAP.values():
         for hour in hourly_labor_data[day]:
+            hourly_labor_data[day][hour] = round(hourly_labor_data[day][hour], 2)
+        for hour in hourly_overtime_data[day]:
             for k in ("regular_cost", "overtime_cost", "double_ot_cost", "total_cost"):
-                hourly_labor_data[day][hour][k] = round(hourly_labor_data[day][hour][k], 2)
+                hourly_overtime_data[day][hour][k] = round(hourly_overtime_data[day][hour][k], 2)
+            hourly_hours_data[day][hour] = round(hourly_hours_data[day][hour], 2)
+        daily_labor_data[day] = {
+            "cost": round(sum(hourly_labor_data[day].values()), 2),
+            "hours": round(daily_hours[day], 1),
+        }
+
+    return {
+        "daily": daily_labor_data,
+        "hourly": hourly_labor_data,
+        "hourly_overtime": hourly_overtime_data,
+        "hourly_hours": hourly_hours_data,
+    }
 
-    return hourly_labor_data
+def process_shifts_to_hourly_labor_data_with_overtime(
+    shifts: List[Dict],
+    business_hour_start: int = 7,   # 7 AM
+    business_hour_end: int = 24,    # 9 PM
+) -> Dict:
+    """
+    Build hourly labor cost buckets with OT and double-OT using pre-annotated shift OT hours.
+    Expects each shift dict to have: start, end (ISO8601, usually with 'Z'), hourly_wage (cents or dollars).
+    """
+    return aggregate_shifts_labor(
+        shifts,
+        business_hour_start=business_hour_start,
+        business_hour_end=business_hour_end,
+    )["hourly_overtime"]
 
 def process_shifts_to_hourly_labor_data(shifts: List[Dict]) -> Dict:
     """
     Process raw 7shifts shift data into hourly labor cost structure expected by dashboard
     Distributes labor costs across hours based on actual shift times (without overtime breakdown)
     """
-    days_map = {
-        0: "Monday", 1: "Tuesday", 2: "Wednesday", 
-        3: "Thursday", 4: "Friday", 5: "Saturday", 6: "Sunday"
-    }
-    
-    # Initialize hourly structure (7 AM to 9 PM = hours 7-21)
-    hourly_labor_data = {}
-    for day in days_map.values():
-        hourly_labor_data[day] = {}
-        for hour in range(7, 22):  # 7 AM to 9 PM
-            hourly_labor_data[day][hour] = 0.0
-    
-    pacific_tz = ZoneInfo("America/Los_Angeles")
-    
-    for shift in shifts:
-        try:
-            # Parse shift times (they come in UTC from 7shifts)
-            start_time_utc = datetime.fromisoformat(shift["start"].replace("Z", "+00:00"))
-            end_time_utc = datetime.fromisoformat(shift["end"].replace("Z", "+00:00"))
-            
-            # Convert to Pacific time
-            start_time_pacific = start_time_utc.astimezone(pacific_tz)
-            end_time_pacific = end_time_utc.astimezone(pacific_tz)
-            
-            # Get hourly wage in dollars
-            hourly_wage_dollars = shift.get("hourly_wage", 0) / 100
-            
-            # Handle shifts that span multiple days
-            current_time = start_time_pacific
-            
-            while current_time < end_time_pacific:
-                # Get the day and hour for current time
-                day_of_week = current_time.weekday()
-                day_name = days_map[day_of_week]
-                hour = current_time.hour
-                
-                # Only process business hours (7 AM to 9 PM)
-                if 7 <= hour <= 21:
-                    # Calculate how much of this hour is worked
-                    hour_start = current_time.replace(minute=0, second=0, microsecond=0)
-                    hour_end = hour_start + timedelta(hours=1)
-                    
-                    # Find the overlap between shift time and this hour
-                    overlap_start = max(current_time, hour_start)
-                    overlap_end = min(end_time_pacific, hour_end)
-                    
-                    if overlap_end > overlap_start:
-                        # Calculate fraction of hour worked
-                        overlap_duration = (overlap_end - overlap_start).total_seconds() / 3600
-                        hour_labor_cost = overlap_duration * hourly_wage_dollars
-                        
-                        # Add to hourly labor data
-                        hourly_labor_data[day_name][hour] += hour_labor_cost
-                
-                # Move to next hour
-                current_time = current_time.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
-                
-        except Exception as e:
-            logger.warning(f"Error processing shift {shift.get('id')}: {str(e)}")
-            continue
-    
-    # Round all values to 2 decimal places
-    for day in hourly_labor_data:
-        for hour in hourly_labor_data[day]:
-            hourly_labor_data[day][hour] = round(hourly_labor_data[day][hour], 2)
-    
-    return hourly_labor_data
+    return aggregate_shifts_labor(shifts)["hourly"]
 
 def process_shifts_to_labor_data(shifts: List[Dict]) -> Dict:
     """
     Process raw 7shifts shift data into daily labor cost structure
-    This now uses the hourly data and sums it up by day
+    Cost is the sum of the hourly grid; hours are the scheduled shift durations
     """
-    # Get hourly labor data
-    hourly_data = process_shifts_to_hourly_labor_data(shifts)
-    
-    # Sum up to daily totals
-    daily_labor_data = {}
-    for day, hours in hourly_data.items():
-        total_cost = sum(hours.values())
-        # Calculate total hours by dividing total cost by average hourly wage
-        # For now, we'll estimate hours based on cost (this is approximate)
-        daily_labor_data[day] = {
-            "cost": round(total_cost, 2),
-            "hours": 0  # We'll calculate this separately if needed
-        }
-    
-    # Calculate actual hours from original shifts for accuracy
-    days_map = {
-        0: "Monday", 1: "Tuesday", 2: "Wednesday", 
-        3: "Thursday", 4: "Friday", 5: "Saturday", 6: "Sunday"
-    }
-    pacific_tz = ZoneInfo("America/Los_Angeles")
-    
-    # Reset hours to 0
-    for day in daily_labor_data:
-        daily_labor_data[day]["hours"] = 0.0
-    
-    # Calculate actual hours
+    return aggregate_shifts_labor(shifts)["daily"]
+
+def build_labor_heatmap(
+    shifts: List[Dict],
+    week_start_date: datetime,
+    bin_minutes: int = 15,
+    business_hour_start: int = 7,
+    business_hour_end: int = 24,
+) -> Dict:
+    """
+    Build a week x time-bin labor heatmap (headcount, labor hours and cost per bin).
+    Each shift adds +1 / +wage at its start minute and -1 / -wage at its end minute of a
+    per-minute difference array for the week; one prefix sum gives staff on the floor and
+    cost per minute, which are then reshaped into bins. Cost is O(shifts + minutes in week)
+    regardless of bin size, instead of walking every bin for every shift.
+    """
+    if bin_minutes not in HEATMAP_BIN_MINUTES:
+        raise ValueError(f"bin_minutes must be one of {HEATMAP_BIN_MINUTES}")
+    if not 0 <= business_hour_start < business_hour_end <= 24:
+        raise ValueError("Business hours must satisfy 0 <= start < end <= 24")
+
+    # Work on Pacific wall-clock minutes from the start of the week
+    if week_start_date.tzinfo is not None:
+        week_start_date = week_start_date.astimezone(PACIFIC_TZ)
+    week_start_local = week_start_date.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+    week_minutes = 7 * MINUTES_PER_DAY
+
+    starts, ends, wages = [], [], []
     for shift in shifts:
         try:
-            start_time_utc = datetime.fromisoformat(shift["start"].replace("Z", "+00:00"))
-            end_time_utc = datetime.fromisoformat(shift["end"].replace("Z", "+00:00"))
-            
-            start_time_pacific = start_time_utc.astimezone(pacific_tz)
-            end_time_pacific = end_time_utc.astimezone(pacific_tz)
-            
-            duration = (end_time_pacific - start_time_pacific).total_seconds() / 3600
-            day_of_week = start_time_pacific.weekday()
-            day_name = days_map[day_of_week]
-            
-            daily_labor_data[day_name]["hours"] += duration
-            
+            start_local = datetime.fromisoformat(shift["start"].replace("Z", "+00:00")).astimezone(PACIFIC_TZ).replace(tzinfo=None)
+            end_local = datetime.fromisoformat(shift["end"].replace("Z", "+00:00")).astimezone(PACIFIC_TZ).replace(tzinfo=None)
         except Exception as e:
-            logger.warning(f"Error calculating hours for shift {shift.get('id')}: {str(e)}")
+            logger.warning(f"Error parsing shift {shift.get('id')} for heatmap: {str(e)}")
             continue
-    
-    # Round hours
-    for day in daily_labor_data:
-        daily_labor_data[day]["hours"] = round(daily_labor_data[day]["hours"], 1)
-    
-    return daily_labor_data
+
+        start_minute = max(0, int((start_local - week_start_local).total_seconds() // 60))
+        end_minute = min(week_minutes, int((end_local - week_start_local).total_seconds() // 60))
+        if end_minute <= start_minute:
+            continue
+
+        starts.append(start_minute)
+        ends.append(end_minute)
+        # 7shifts wages are in cents
+        wages.append((shift.get("hourly_wage") or 0) / 100 / 60)
+
+    staff_delta = np.zeros(week_minutes + 1)
+    cost_delta = np.zeros(week_minutes + 1)
+    if starts:
+        starts_arr = np.asarray(starts)
+        ends_arr = np.asarray(ends)
+        wages_arr = np.asarray(wages)
+        np.add.at(staff_delta, starts_arr, 1)
+        np.add.at(staff_delta, ends_arr, -1)
+        np.add.at(cost_delta, starts_arr, wages_arr)
+        np.add.at(cost_delta, ends_arr, -wages_arr)
+
+    # Prefix sums -> value per minute, then keep only the business-hours window of each day
+    staff_per_minute = np.cumsum(staff_delta)[:week_minutes].reshape(7, MINUTES_PER_DAY)
+    cost_per_minute = np.cumsum(cost_delta)[:week_minutes].reshape(7, MINUTES_PER_DAY)
+    window = slice(business_hour_start * 60, business_hour_end * 60)
+    bins_per_day = (business_hour_end - business_hour_start) * 60 // bin_minutes
+
+    staff_bins = staff_per_minute[:, window].reshape(7, bins_per_day, bin_minutes)
+    cost_bins = cost_per_minute[:, window].reshape(7, bins_per_day, bin_minutes)
+
+    headcount = staff_bins.mean(axis=2)
+    peak_headcount = staff_bins.max(axis=2)
+    labor_hours = staff_bins.sum(axis=2) / 60
+    cost = cost_bins.sum(axis=2)
+
+    bin_labels = [
+        f"{minute // 60:02d}:{minute % 60:02d}"
+        for minute in range(business_hour_start * 60, business_hour_end * 60, bin_minutes)
+    ]
+
+    days = {}
+    for day_index, day_name in DAYS_MAP.items():
+        days[day_name] = {
+            "headcount": np.round(headcount[day_index], 2).tolist(),
+            "peak_headcount": peak_headcount[day_index].astype(int).tolist(),
+            "labor_hours": np.round(labor_hours[day_index], 2).tolist(),
+            "cost": np.round(cost[day_index], 2).tolist(),
+            "total_cost": round(float(cost[day_index].sum()), 2),
+            "total_hours": round(float(labor_hours[day_index].sum()), 2),
+        }
+
+    return {
+        "bin_minutes": bin_minutes,
+        "business_hour_start": business_hour_start,
+        "business_hour_end": business_hour_end,
+        "bins": bin_labels,
+        "days": days,
+        "total_cost": round(float(cost.sum()), 2),
+        "total_hours": round(float(labor_hours.sum()), 2),
+    }
 
 async def get_labor_data_for_week(week_start_date: datetime, location_id: Optional[int] = None) -> Dict:
     """
@@ -749,3 +768,93 @@ async def get_hourly_labor_data_with_overtime_for_week(week_start_date: datetime
     """
     shifts = await get_shifts_for_week(week_start_date, location_id)
     return process_shifts_to_hourly_labor_data_with_overtime(shifts)
+
+async def get_labor_summary_for_week(week_start_date: datetime, location_id: Optional[int] = None) -> Dict:
+    """
+    Get daily, hourly and hourly-with-overtime labor data for a week
+    from a single 7shifts fetch and a single aggregation pass
+    """
+    shifts = await get_shifts_for_week(week_start_date, location_id)
+    return aggregate_shifts_labor(shifts)
+
+async def get_labor_heatmap_for_week(
+    week_start_date: datetime,
+    location_id: Optional[int] = None,
+    bin_minutes: int = 15,
+    business_hour_start: int = 7,
+    business_hour_end: int = 24,
+) -> Dict:
+    """
+    Get a labor heatmap (headcount and cost per time bin) for a week from 7shifts scheduled shifts
+    """
+    shifts = await get_shifts_for_week(week_start_date, location_id)
+    return build_labor_heatmap(shifts, week_start_date, bin_minutes, business_hour_start, business_hour_end)
+
+def get_week_starts_for_range(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    weeks: Optional[int] = None,
+) -> List[date]:
+    """
+    Resolve a labor range request into a list of Monday week starts.
+    - start_date + end_date: every week touching the range
+    - weeks (+ optional end_date): the N weeks ending with the week of end_date (default: this week)
+    """
+    if end_date is None:
+        end_date = datetime.now(PACIFIC_TZ).date()
+    last_week_start = end_date - timedelta(days=end_date.weekday())
+
+    if start_date is not None:
+        if start_date > end_date:
+            raise ValueError("start_date must be on or before end_date")
+        first_week_start = start_date - timedelta(days=start_date.weekday())
+        weeks = (last_week_start - first_week_start).days // 7 + 1
+    elif weeks is None:
+        raise ValueError("Provide start_date/end_date or weeks")
+
+    if weeks < 1 or weeks > MAX_RANGE_WEEKS:
+        raise ValueError(f"Range must cover between 1 and {MAX_RANGE_WEEKS} weeks")
+
+    return [last_week_start - timedelta(weeks=offset) for offset in range(weeks - 1, -1, -1)]
+
+async def get_labor_summaries_for_weeks(week_starts: List[date], location_id: Optional[int] = None) -> Dict:
+    """
+    Get aggregated labor (see aggregate_shifts_labor) for several weeks.
+    Completed weeks are served from the in-process cache; the rest are fetched
+    from 7shifts concurrently (bounded by RANGE_FETCH_CONCURRENCY).
+    Returns {"summaries": [summary per week, in order], "cached_weeks": int}
+    """
+    today = datetime.now(PACIFIC_TZ).date()
+    summaries: Dict[date, Dict] = {}
+    to_fetch = []
+
+    for week_start in week_starts:
+        cache_key = (week_start, location_id)
+        if cache_key in _completed_week_labor_cache:
+            _completed_week_labor_cache.move_to_end(cache_key)
+            summaries[week_start] = _completed_week_labor_cache[cache_key]
+        else:
+            to_fetch.append(week_start)
+
+    cached_weeks = len(summaries)
+    semaphore = asyncio.Semaphore(RANGE_FETCH_CONCURRENCY)
+
+    async def fetch_week(week_start: date) -> Dict:
+        async with semaphore:
+            shifts = await get_shifts_for_week(datetime.combine(week_start, datetime.min.time()), location_id)
+        return aggregate_shifts_labor(shifts)
+
+    fetched = await asyncio.gather(*(fetch_week(week_start) for week_start in to_fetch))
+
+    for week_start, summary in zip(to_fetch, fetched):
+        summaries[week_start] = summary
+        # Only cache weeks that are fully in the past
+        if week_start + timedelta(days=7) <= today:
+            _completed_week_labor_cache[(week_start, location_id)] = summary
+            while len(_completed_week_labor_cache) > COMPLETED_WEEK_CACHE_SIZE:
+                _completed_week_labor_cache.popitem(last=False)
+
+    return {
+        "summaries": [summaries[week_start] for week_start in week_starts],
+        "cached_weeks": cached_weeks,
+    }
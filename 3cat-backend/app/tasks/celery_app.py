@@ -7,10 +7,15 @@ redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
 celery_app = Celery('tasks', broker=redis_url)
 
 import app.tasks.scheduled_tasks
+import app.tasks.import_tasks
 
 celery_app.conf.beat_schedule = {
     'process-pending-compensation-daily': {
         'task': 'app.tasks.scheduled_tasks.process_pending_compensation_changes_task',
         'schedule': crontab(hour=0, minute=5),
     },
+    'refresh-labor-cube-hourly': {
+        'task': 'app.tasks.scheduled_tasks.refresh_labor_cube_task',
+        'schedule': crontab(minute=10),
+    },
 }
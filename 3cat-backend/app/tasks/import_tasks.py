@@ -0,0 +1,43 @@
+from datetime import date
+
+from app.database import SessionLocal
+from app.config import logger
+from app.services.order_import_service import run_import_job
+from app.services.order_item_service import backfill_order_items
+from app.services.sales_rollup_service import backfill_sales_hourly
+from app.tasks.celery_app import celery_app
+
+
+@celery_app.task
+def import_orders_csv_task(job_id: int):
+    """Run a queued Snackpass CSV import job created by POST /orders/import-jobs"""
+    try:
+        with SessionLocal() as db, SessionLocal() as status_db:
+            return run_import_job(job_id, db, status_db)
+    except Exception as e:
+        logger.error(f"Error running order import job {job_id}: {str(e)}")
+
+
+@celery_app.task
+def backfill_order_items_task():
+    """Parse order_items for orders imported before item parsing existed"""
+    try:
+        with SessionLocal() as db:
+            return backfill_order_items(db)
+    except Exception as e:
+        logger.error(f"Error backfilling order items: {str(e)}")
+
+
+@celery_app.task
+def backfill_sales_hourly_task(location_id: int = None, start_date: str = None, end_date: str = None):
+    """Rebuild the sales_hourly rollup from orders (one location / date range, or everything)"""
+    try:
+        with SessionLocal() as db:
+            return backfill_sales_hourly(
+                db,
+                location_id=location_id,
+                start_date=date.fromisoformat(start_date) if start_date else None,
+                end_date=date.fromisoformat(end_date) if end_date else None,
+            )
+    except Exception as e:
+        logger.error(f"Error backfilling sales rollup: {str(e)}")
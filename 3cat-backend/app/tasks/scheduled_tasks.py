@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime
 from sqlalchemy.orm import Session
 
@@ -9,6 +10,7 @@ from app.models.job_level import JobLevel
 from app.models.job_title import JobTitle
 from app.models.location import Location
 from app.config import logger
+from app.services.labor_cube_service import refresh_labor_cube, CUBE_REFRESH_WEEKS
 # BambooHR integration removed - direct to 7shifts
 from app.tasks.celery_app import celery_app  # Add this import
 
@@ -20,6 +22,18 @@ def process_pending_compensation_changes_task():
     process_pending_compensation_changes()
     
 
+@celery_app.task
+def refresh_labor_cube_task(weeks: int = CUBE_REFRESH_WEEKS):
+    """Rebuild the labor_hourly cube from 7shifts for the current and previous week (pass weeks=N to backfill)"""
+    try:
+        with SessionLocal() as db:
+            result = asyncio.run(refresh_labor_cube(db, weeks=weeks))
+        logger.info(f"Labor cube refresh complete: {result['weeks_refreshed']} location-weeks, {len(result['errors'])} errors")
+        return result
+    except Exception as e:
+        logger.error(f"Error refreshing labor cube: {str(e)}")
+    
+
 def process_pending_compensation_changes():
     """Apply pending compensation changes whose effective date has arrived"""
     today = datetime.now().date()
@@ -1,6 +1,6 @@
 # app/services/location_mapping.py
 
-from app.models.location import Location
+from app.models.location import Location, DEFAULT_LOCATION_TIMEZONE
 from sqlalchemy.orm import Session
 
 def get_sevenshift_location_id(location_code: str, db: Session) -> str:
@@ -23,4 +23,18 @@ def get_sevenshift_location_id(location_code: str, db: Session) -> str:
 
     if location and location.sevenshift_location_id:
         return location.sevenshift_location_id
-    return None
\ No newline at end of file
+    return None
+
+def get_location_timezone(location_id: int, db: Session) -> str:
+    """
+    Retrieve the IANA time zone a location's order timestamps are in.
+
+    Args:
+        location_id: ID of the location
+        db: SQLAlchemy session
+
+    Returns:
+        Time zone name, DEFAULT_LOCATION_TIMEZONE if the location is unknown
+    """
+    timezone = db.query(Location.timezone).filter(Location.location_id == location_id).scalar()
+    return timezone or DEFAULT_LOCATION_TIMEZONE
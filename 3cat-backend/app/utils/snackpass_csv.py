@@ -0,0 +1,226 @@
+# app/utils/snackpass_csv.py
+"""
+Synthetic Snackpass order exports, for benchmarking and regression-testing the CSV import
+(OrderService.process_csv_and_insert_orders). Rows are written straight to the output, so
+million-row files don't need to fit in memory.
+"""
+import csv
+import random
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, TextIO, Union
+
+# Column order of a Snackpass "Orders" export
+SNACKPASS_COLUMNS = [
+    'Order #', 'Ordered At', 'Status', 'Customer', 'Fulfillment', 'Items', 'Promotions',
+    'Completion Time', 'Notes', 'Scheduled', 'Channel', 'Provider',
+    'Subtotal', 'Custom Surcharge', 'Custom Discounts', 'Up Charge', 'Delivery Charge',
+    '3P Delivery Charge', 'Snackpass Fee', 'Processing Fee', 'Estimated Third Party Fees',
+    'Cust. To Store Fees', 'Tax', 'Estimated Third-Party Taxes', 'Tips', 'Total', 'Net Sales',
+    'Gross Sales', 'Estimated Third-Party Payout', 'Payment Method', 'Cash', 'Gift Card Redemp.',
+    'Store Credit Redemp.', 'Refunded By', 'Refunded Amount', 'Up-Charged By', 'Cash Accepted By',
+    'Created By', 'Employee',
+]
+
+MENU = [
+    ("Brown Sugar Boba", 6.50), ("Thai Tea", 5.50), ("Taro Milk Tea", 5.75), ("Matcha Latte", 6.00),
+    ("Jasmine Green Tea", 4.75), ("Mango Slush", 6.25), ("Popcorn Chicken", 7.95), ("Egg Puffs", 8.50),
+]
+MODIFIERS = ["Large", "Regular", "Less Ice", "No Ice", "50% Sugar", "Extra Boba", "Oat Milk"]
+PROMOTIONS = [("BOGO Boba", -6.50), ("Happy Hour", -2.00), ("Rewards", -5.00)]
+CUSTOMERS = ["Ann L.", "Bob K.", "Carmen R.", "Dev P.", "Eli S.", ""]
+STATUSES = ["Completed"] * 18 + ["Refunded", "Canceled"]
+FULFILLMENTS = ["Pickup", "Pickup", "Dine-In", "Delivery"]
+CHANNELS = [("Kiosk", "Snackpass"), ("App", "Snackpass"), ("Online", "Snackpass"), ("DoorDash", "DoorDash")]
+PAYMENT_METHODS = ["Card", "Card", "Apple Pay", "Cash", "Gift Card"]
+EMPLOYEES = ["", "", "Jamie", "Riley", "Sam"]
+
+# Opening hours of the synthetic store and a rough hourly traffic curve (lunch and dinner peaks)
+HOUR_WEIGHTS = {
+    10: 2, 11: 5, 12: 9, 13: 8, 14: 5, 15: 5, 16: 6, 17: 8, 18: 10, 19: 9, 20: 7, 21: 5, 22: 3,
+}
+
+# Recently written rows kept around to draw duplicates from
+DUPLICATE_POOL_SIZE = 1000
+
+
+def format_money(amount: float) -> str:
+    """Snackpass money string: "$1,234.50", "-$3.00" """
+    return f"-${-amount:,.2f}" if amount < 0 else f"${amount:,.2f}"
+
+
+def format_ordered_at(moment: datetime) -> str:
+    """Snackpass "Ordered At" string: "9:40 PM 7/22/2025" (no zero padding)"""
+    hour = moment.hour % 12 or 12
+    return f"{hour}:{moment:%M} {moment:%p} {moment.month}/{moment.day}/{moment.year}"
+
+
+def _random_order(rng: random.Random, order_number: int, moment: datetime) -> List[str]:
+    """One export row; money columns add up the way Snackpass reports them"""
+    lines = []
+    subtotal = 0.0
+    for _ in range(rng.choice([1, 1, 1, 2, 2, 3, 4])):
+        name, unit_price = rng.choice(MENU)
+        quantity = rng.choice([1, 1, 1, 2, 3])
+        price = round(unit_price * quantity, 2)
+        subtotal += price
+        text = f"{quantity}x {name}" if quantity > 1 else name
+        if rng.random() < 0.5:
+            text += f" ({', '.join(rng.sample(MODIFIERS, rng.randint(1, 2)))})"
+        lines.append(f"{text} {format_money(price)}")
+    # Catering-sized orders exercise thousands separators
+    if rng.random() < 0.01:
+        price = 1000 + round(rng.uniform(0, 500), 2)
+        subtotal += price
+        lines.append(f"Catering Tray {format_money(price)}")
+
+    promotion_text = ""
+    discount = 0.0
+    if rng.random() < 0.15:
+        promotion, discount = rng.choice(PROMOTIONS)
+        promotion_text = f"{promotion} {format_money(discount)}"
+
+    status = rng.choice(STATUSES)
+    channel, provider = rng.choice(CHANNELS)
+    payment_method = rng.choice(PAYMENT_METHODS)
+    tax = round((subtotal + discount) * 0.0875, 2)
+    tips = round(rng.choice([0, 0, 0.5, 1, 2, subtotal * 0.15]), 2)
+    processing_fee = round(subtotal * 0.029 + 0.30, 2)
+    snackpass_fee = round(subtotal * 0.05, 2) if provider == "Snackpass" else 0.0
+    third_party_fees = round(subtotal * 0.2, 2) if provider != "Snackpass" else 0.0
+    delivery_charge = 3.99 if rng.random() < 0.1 else 0.0
+    gross_sales = round(subtotal, 2)
+    net_sales = round(subtotal + discount, 2)
+    total = round(net_sales + tax + tips + delivery_charge, 2)
+    refunded = total if status == "Refunded" else 0.0
+
+    money = {
+        'Subtotal': gross_sales,
+        'Custom Surcharge': 0.0,
+        'Custom Discounts': discount,
+        'Up Charge': 0.0,
+        'Delivery Charge': delivery_charge,
+        '3P Delivery Charge': 0.0,
+        'Snackpass Fee': snackpass_fee,
+        'Processing Fee': processing_fee,
+        'Estimated Third Party Fees': third_party_fees,
+        'Cust. To Store Fees': 0.0,
+        'Tax': tax,
+        'Estimated Third-Party Taxes': 0.0,
+        'Tips': tips,
+        'Total': total,
+        'Net Sales': net_sales,
+        'Gross Sales': gross_sales,
+        'Estimated Third-Party Payout': round(total - third_party_fees, 2) if third_party_fees else 0.0,
+        'Cash': total if payment_method == "Cash" else 0.0,
+        'Gift Card Redemp.': total if payment_method == "Gift Card" else 0.0,
+        'Store Credit Redemp.': 0.0,
+        'Refunded Amount': refunded,
+    }
+    text = {
+        'Order #': str(order_number),
+        'Ordered At': format_ordered_at(moment),
+        'Status': status,
+        'Customer': rng.choice(CUSTOMERS),
+        'Fulfillment': rng.choice(FULFILLMENTS),
+        'Items': ", ".join(lines),
+        'Promotions': promotion_text,
+        'Completion Time': f"{rng.randint(2, 25)} min",
+        'Notes': "" if rng.random() < 0.9 else "Extra napkins, please",
+        'Scheduled': "No" if rng.random() < 0.95 else "Yes",
+        'Channel': channel,
+        'Provider': provider,
+        'Payment Method': payment_method,
+        'Refunded By': rng.choice(EMPLOYEES[2:]) if refunded else "",
+        'Up-Charged By': "",
+        'Cash Accepted By': rng.choice(EMPLOYEES[2:]) if payment_method == "Cash" else "",
+        'Created By': "",
+        'Employee': rng.choice(EMPLOYEES),
+    }
+    # Snackpass leaves zero amounts blank about as often as it prints "$0.00"
+    return [
+        text[column] if column in text
+        else ("" if money[column] == 0 and rng.random() < 0.5 else format_money(money[column]))
+        for column in SNACKPASS_COLUMNS
+    ]
+
+
+def write_snackpass_csv(
+    out: Union[str, TextIO],
+    rows: int,
+    start: datetime = datetime(2025, 7, 1),
+    days: int = 31,
+    duplicate_ratio: float = 0.0,
+    blank_row_ratio: float = 0.005,
+    invalid_date_ratio: float = 0.001,
+    repeat_header: bool = True,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Write `rows` data rows of a synthetic Snackpass export to a path or text file.
+    - duplicate_ratio: share of rows that repeat an earlier row exactly (skipped on import by dedup_key)
+    - blank_row_ratio: share of empty rows, as exports sometimes contain
+    - invalid_date_ratio: share of rows with an unparseable "Ordered At" (reported as row errors)
+    - repeat_header: emit the header row a second time partway through, as concatenated exports do
+    Order times are spread over [start, start + days) following HOUR_WEIGHTS.
+    Returns what was written, so callers can check import counts.
+    """
+    if isinstance(out, str):
+        with open(out, "w", newline="", encoding="utf-8") as f:
+            return write_snackpass_csv(
+                f, rows, start=start, days=days, duplicate_ratio=duplicate_ratio,
+                blank_row_ratio=blank_row_ratio, invalid_date_ratio=invalid_date_ratio,
+                repeat_header=repeat_header, seed=seed,
+            )
+
+    rng = random.Random(seed)
+    writer = csv.writer(out)
+    writer.writerow(SNACKPASS_COLUMNS)
+
+    hours = list(HOUR_WEIGHTS)
+    hour_weights = list(HOUR_WEIGHTS.values())
+    recent: deque = deque(maxlen=DUPLICATE_POOL_SIZE)
+    header_at = rows // 2 if repeat_header else None
+    stats = {
+        "rows": rows, "orders": 0, "duplicates": 0, "blank_rows": 0, "invalid_dates": 0,
+        "repeated_headers": 0, "min_date": None, "max_date": None,
+    }
+    min_moment: Optional[datetime] = None
+    max_moment: Optional[datetime] = None
+    order_number = 100000
+
+    for index in range(rows):
+        if index == header_at:
+            writer.writerow(SNACKPASS_COLUMNS)
+            stats["repeated_headers"] += 1
+
+        roll = rng.random()
+        if roll < blank_row_ratio:
+            writer.writerow([""] * len(SNACKPASS_COLUMNS))
+            stats["blank_rows"] += 1
+            continue
+        if recent and roll < blank_row_ratio + duplicate_ratio:
+            writer.writerow(rng.choice(recent))
+            stats["duplicates"] += 1
+            continue
+
+        moment = (
+            start
+            + timedelta(days=rng.randrange(days), hours=rng.choices(hours, hour_weights)[0])
+            + timedelta(minutes=rng.randrange(60))
+        )
+        order_number += 1
+        row = _random_order(rng, order_number, moment)
+        if rng.random() < invalid_date_ratio:
+            row[1] = "not a date"
+            stats["invalid_dates"] += 1
+        else:
+            min_moment = moment if min_moment is None or moment < min_moment else min_moment
+            max_moment = moment if max_moment is None or moment > max_moment else max_moment
+        writer.writerow(row)
+        recent.append(row)
+        stats["orders"] += 1
+
+    stats["min_date"] = min_moment.date().isoformat() if min_moment else None
+    stats["max_date"] = max_moment.date().isoformat() if max_moment else None
+    return stats
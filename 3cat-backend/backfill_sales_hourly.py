@@ -0,0 +1,33 @@
+"""
+Rebuild the sales_hourly rollup from orders.
+
+    python backfill_sales_hourly.py                       # every location, full history
+    python backfill_sales_hourly.py --location-id 12 --start-date 2025-07-01 --end-date 2025-07-31
+"""
+import argparse
+from datetime import date
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.database import SessionLocal
+from app.services.sales_rollup_service import backfill_sales_hourly
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--location-id", type=int, default=None)
+    parser.add_argument("--start-date", type=date.fromisoformat, default=None, help="YYYY-MM-DD")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None, help="YYYY-MM-DD (inclusive)")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        result = backfill_sales_hourly(
+            db, location_id=args.location_id, start_date=args.start_date, end_date=args.end_date
+        )
+    print(f"Rebuilt {result['rows_written']} sales_hourly rows for {result['locations']} locations")
+
+
+if __name__ == "__main__":
+    main()
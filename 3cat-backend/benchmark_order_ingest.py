@@ -0,0 +1,133 @@
+"""
+Benchmark the Snackpass order CSV import against a local Postgres.
+
+Generates synthetic exports (app/utils/snackpass_csv.py) at each size and times:
+  validate  - OrderService.validate_csv_dates over the file
+  ingest    - OrderService.process_csv_and_insert_orders into an empty period
+  preflight - OrderService.check_period_conflict against the period just loaded
+  reingest  - the same file again (every order skipped as a duplicate)
+Each stage runs in a fresh process so its peak RSS is its own.
+
+    DATABASE_URL=postgresql://... python benchmark_order_ingest.py --rows 10000 100000 1000000
+
+The benchmark location's orders are deleted before and after each size.
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+
+STAGES = ["validate", "ingest", "preflight", "reingest"]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_stage(stage, database_url, csv_path, location_id, start_date, end_date, results):
+    """Run one stage in this (child) process and put its timing, peak RSS and outcome on `results`"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from app.services.order_service import OrderService
+
+    engine = create_engine(database_url)
+    baseline_mb = peak_rss_mb()
+    try:
+        with Session(bind=engine) as db:
+            started = time.perf_counter()
+            if stage == "validate":
+                result = OrderService.validate_csv_dates(csv_path, start_date, end_date)
+                outcome = f"valid={result['valid']} {result.get('csv_min_date')}..{result.get('csv_max_date')}"
+            elif stage == "preflight":
+                result = OrderService.check_period_conflict(location_id, db, start_date, end_date, False, False)
+                outcome = "conflict" if result else "clear"
+            else:
+                result = OrderService.process_csv_and_insert_orders(
+                    csv_path, location_id, db, start_date=start_date, end_date=end_date
+                )
+                outcome = (f"created={result['orders_created']} skipped={result['orders_skipped']} "
+                           f"errors={len(result['errors'])}")
+            elapsed = time.perf_counter() - started
+    except Exception as e:
+        results.put({"error": f"{type(e).__name__}: {e}"})
+        return
+    finally:
+        engine.dispose()
+    results.put({"seconds": elapsed, "peak_rss_mb": peak_rss_mb(), "baseline_rss_mb": baseline_mb, "outcome": outcome})
+
+
+def clear_location(database_url, location_id, start_date, end_date):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from app.services.order_service import OrderService
+
+    engine = create_engine(database_url)
+    with Session(bind=engine) as db:
+        OrderService.delete_orders_by_date_range(location_id, start_date, end_date, db)
+    engine.dispose()
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--location-id", type=int, default=990001, help="location the benchmark loads into")
+    parser.add_argument("--days", type=int, default=31, help="days spanned by each generated file")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if not args.database_url:
+        raise ValueError("DATABASE_URL is not set; pass --database-url")
+
+    from app.utils.snackpass_csv import write_snackpass_csv
+
+    start = datetime(2025, 7, 1)
+    start_date = start.strftime("%Y-%m-%d")
+    end_date = (start + timedelta(days=args.days - 1)).strftime("%Y-%m-%d")
+    context = multiprocessing.get_context("spawn")
+
+    print(f"{'rows':>9} {'stage':<10} {'seconds':>9} {'rows/sec':>10} {'peak MB':>9} {'base MB':>8}  outcome")
+    for rows in args.rows:
+        fd, csv_path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        try:
+            written = write_snackpass_csv(
+                csv_path, rows, start=start, days=args.days, duplicate_ratio=args.duplicate_ratio, seed=args.seed
+            )
+            size_mb = os.path.getsize(csv_path) / (1024 * 1024)
+            print(f"{rows:>9} {'generate':<10} {'':>9} {'':>10} {'':>9} {'':>8}  {size_mb:.1f} MB, "
+                  f"{written['orders']} orders, {written['duplicates']} duplicates, "
+                  f"{written['blank_rows']} blank, {written['invalid_dates']} bad dates")
+
+            clear_location(args.database_url, args.location_id, start_date, end_date)
+            for stage in STAGES:
+                results = context.Queue()
+                process = context.Process(
+                    target=run_stage,
+                    args=(stage, args.database_url, csv_path, args.location_id, start_date, end_date, results),
+                )
+                process.start()
+                result = results.get()
+                process.join()
+                if "error" in result:
+                    print(f"{rows:>9} {stage:<10} failed: {result['error']}")
+                    continue
+                print(f"{rows:>9} {stage:<10} {result['seconds']:>9.2f} {rows / result['seconds']:>10,.0f} "
+                      f"{result['peak_rss_mb']:>9.0f} {result['baseline_rss_mb']:>8.0f}  {result['outcome']}")
+        finally:
+            clear_location(args.database_url, args.location_id, start_date, end_date)
+            os.remove(csv_path)
+
+
+if __name__ == "__main__":
+    main()
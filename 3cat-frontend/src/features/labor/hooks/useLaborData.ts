@@ -178,11 +178,10 @@ export const useLaborDashboardData = (
 
 export function useWeeklyNetSalesHourly(
   weekStart: string,
-  locationId?: number,
-  tz = "America/Los_Angeles"
+  locationId?: number
 ) {
   return useQuery({
-    queryKey: ["weeklyNetSalesHourly", weekStart, locationId, tz],
+    queryKey: ["weeklyNetSalesHourly", weekStart, locationId],
     enabled: Boolean(weekStart && locationId),
     queryFn: async () => {
       const { data } = await axios.get(`${API_BASE_URL}/orders/sales/hourly-weekly`, {
@@ -190,7 +189,6 @@ export function useWeeklyNetSalesHourly(
           location_id: locationId, 
           start_date: weekStart, 
           end_date: format(addDays(new Date(weekStart), 7), "yyyy-MM-dd"), 
-          tz 
         },
       });
 